@@ -0,0 +1,307 @@
+# Benchmarks for the save path and widget construction.
+#
+# Runs headless and prints the results as json, so runs from two versions
+# can be compared:
+#
+#     QT_QPA_PLATFORM=offscreen python benchmarks.py --output new.json
+#     python benchmarks.py --compare old.json new.json
+#
+# Every benchmark runs on synthetic documents, with the catalogue sizes given
+# by --sizes. Times are in seconds for a single run.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from os import path
+
+import PySide6
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+from pymitter import EventEmitter
+
+import widgetHelpers
+from comboBoxWidget import ComboBoxWidget
+from fileManager import FileManager, catalogue_layout
+from gameSystems import catalogue_keys, game_system_for
+from jsonSerializer import JsonSerializer, JSON_BACKEND, ORJSON_BACKEND, backend_available
+from listObjectEditorWidget import ListObjectEditorWidget
+from listObjectModelEditorWidget import ListObjectModelEditorWidget
+from playerDetailsWidget import PlayerDetailsWidget
+from scoreboard import Scoreboard, build_field_test, build_side_layout
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_REPEAT = 5
+ARMIES = ["Orks", "Eldar", "Necrons", "Tau", ""]
+
+# Same fields the catalogue tabs edit
+CATALOGUE_EDITOR_LAYOUT = [
+    {'type': 'text', 'label': 'Army Type', 'jsonLocation': 'armyType'},
+    {'type': 'text', 'label': 'Description', 'jsonLocation': 'description'},
+]
+
+
+# Catalogue of size items, spread over the armies
+def make_catalogue(prefix: str, size: int):
+    return [{"name": "------"}] + [
+        {"name": prefix + " " + str(i), "armyType": ARMIES[i % len(ARMIES)],
+         "description": "Description of " + prefix + " " + str(i)}
+        for i in range(size)
+    ]
+
+
+def make_document(data_type: str, size: int):
+    json_data = {
+        "dataType": data_type,
+        "roundNum": 1,
+        "roundOrder": "TOP",
+        "left": {"playerName": "Left Player", "armyName": "Orks"},
+        "right": {"playerName": "Right Player", "armyName": "Eldar"},
+    }
+    factions = [{"name": army} for army in ARMIES if army]
+    if data_type == "40k":
+        json_data["40kFactions"] = factions
+        json_data["40kPrimaryObjectives"] = make_catalogue("Primary", size)
+        json_data["40kSecondaryObjectives"] = make_catalogue("Secondary", size)
+    else:
+        json_data["sigmarFactions"] = factions
+        json_data["sigmarBattleTraits"] = make_catalogue("Battle Trait", size)
+        json_data["sigmarGrandStrategies"] = make_catalogue("Grand Strategy", size)
+    return json_data
+
+
+# A player's main column and first round the way the player widget lays
+# them out, with the army filters filled in
+def player_layout(game_system, json_data: dict):
+    layout = game_system.player_layout("left", "Left") + game_system.round_layout("left", "Left", 0)
+    return build_side_layout(layout, json_data, "left")
+
+
+class BenchmarkRunner:
+    def __init__(self, repeat: int = DEFAULT_REPEAT):
+        self.repeat = repeat
+        self.results = []
+
+    # Times run() repeat times. setup() is called before each run and what
+    # it returns is handed to run(), it isn't part of the time.
+    def measure(self, name: str, params: dict, run, setup=None):
+        times = []
+        for i in range(self.repeat):
+            state = setup() if setup is not None else None
+            start = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - start)
+            QApplication.processEvents()
+        result = {
+            "name": name,
+            "params": params,
+            "repeat": self.repeat,
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.mean(times),
+        }
+        self.results.append(result)
+        return result
+
+
+def write_document(directory: str, data_type: str, size: int):
+    file_path = path.join(directory, data_type + "-" + str(size) + ".json")
+    with open(file_path, "w") as write_file:
+        json.dump(make_document(data_type, size), write_file, sort_keys=True, indent=4)
+    return file_path
+
+
+# A file manager for a document, with the catalogues in their own files as
+# the app keeps them
+def open_document(file_path: str):
+    return FileManager(file_path, catalogue_layout(catalogue_keys()))
+
+
+def bench_file_manager(runner: BenchmarkRunner, size: int, directory: str):
+    for data_type in ["40k", "sigmar"]:
+        file_manager = open_document(write_document(directory, data_type, size))
+        params = {"dataType": data_type, "catalogueSize": size}
+
+        runner.measure("FileManager.read_file", params, lambda state: file_manager.read_file())
+
+        # Everything is dirty, as after loading a file from before the split
+        runner.measure("FileManager.write_file", params, lambda state: file_manager.write_file(force=True),
+                       setup=file_manager.mark_dirty)
+
+        # The common case, one score changed
+        runner.measure("FileManager.write_file scoreboard", params,
+                       lambda state: file_manager.write_file(force=True),
+                       setup=lambda: file_manager.set("left.playerName", "Left Player"))
+
+
+def bench_serializer(runner: BenchmarkRunner, size: int, directory: str):
+    json_data = make_document("40k", size)
+    for backend in [JSON_BACKEND, ORJSON_BACKEND]:
+        if not backend_available(backend):
+            continue
+        for pretty in [True, False]:
+            serializer = JsonSerializer(backend, pretty)
+            params = {"backend": backend, "pretty": pretty, "catalogueSize": size}
+            runner.measure("JsonSerializer.dumps", params, lambda state: serializer.dumps(json_data))
+        text = JsonSerializer(backend).dumps(json_data)
+        runner.measure("JsonSerializer.loads", {"backend": backend, "catalogueSize": size},
+                       lambda state: serializer.loads(text))
+
+
+def bench_layouts(runner: BenchmarkRunner, size: int, directory: str):
+    for data_type in ["40k", "sigmar"]:
+        game_system = game_system_for(data_type)
+        params = {"dataType": data_type, "catalogueSize": size}
+
+        def create_widgets(json_data):
+            widget = QWidget()
+            layout = QVBoxLayout(widget)
+            widgetHelpers.create_json_widgets(layout, json_data, player_layout(game_system, json_data))
+            return widget
+
+        runner.measure("create_json_widgets", params, create_widgets,
+                       setup=lambda: make_document(data_type, size))
+
+        # One side's player and round layouts, as a scoreboard builds them
+        def build_layouts(state):
+            return [game_system.player_layout("left", "Left")] + \
+                [game_system.round_layout("left", "Left", i) for i in range(game_system.roundCount)]
+        runner.measure("GameSystem layouts", params, build_layouts)
+
+        file_path = write_document(directory, data_type, size)
+        runner.measure("PlayerDetailsWidget", params,
+                       lambda file_manager: PlayerDetailsWidget(Scoreboard(file_manager, game_system),
+                                                                EventEmitter()),
+                       setup=lambda: open_document(file_path))
+
+
+def bench_combo_box(runner: BenchmarkRunner, size: int, directory: str):
+    json_data = make_document("40k", size)
+    params = {"catalogueSize": size}
+    combo = ComboBoxWidget("Secondary", json_data, "left.secondary", json_data, "40kSecondaryObjectives",
+                           build_field_test("armyType", json_data, "left.armyName"))
+    runner.measure("ComboBoxWidget.reset_items", params, lambda state: combo.reset_items())
+
+    def change_army():
+        json_data["left"]["armyName"] = "Tau" if json_data["left"]["armyName"] == "Orks" else "Orks"
+    runner.measure("ComboBoxWidget.reset_items army changed", params, lambda state: combo.reset_items(),
+                   setup=change_army)
+
+
+# The scoreboard without widgets, as scripts drive it
+def bench_scoreboard(runner: BenchmarkRunner, size: int, directory: str):
+    for data_type in ["40k", "sigmar"]:
+        game_system = game_system_for(data_type)
+        scoreboard = Scoreboard(open_document(write_document(directory, data_type, size)), game_system)
+        params = {"dataType": data_type, "catalogueSize": size}
+        score_location = game_system.rounds_location("left") + "[0]." + game_system.roundScoreFields[0]
+
+        runner.measure("Scoreboard.add", params, lambda state: scoreboard.add(score_location, 1))
+        runner.measure("Scoreboard.reset", params, lambda state: scoreboard.reset(),
+                       setup=lambda: scoreboard.add(score_location, 5))
+        scoreboard.stop()
+
+
+def bench_list_editors(runner: BenchmarkRunner, size: int, directory: str):
+    params = {"catalogueSize": size}
+    for name, widget_class in [("ListObjectEditorWidget", ListObjectEditorWidget),
+                               ("ListObjectModelEditorWidget", ListObjectModelEditorWidget)]:
+        runner.measure(name, params,
+                       lambda json_data: widget_class("Secondaries", json_data, "40kSecondaryObjectives",
+                                                      CATALOGUE_EDITOR_LAYOUT),
+                       setup=lambda: make_document("40k", size))
+
+
+BENCHMARKS = {
+    "fileManager": bench_file_manager,
+    "serializer": bench_serializer,
+    "layouts": bench_layouts,
+    "comboBox": bench_combo_box,
+    "scoreboard": bench_scoreboard,
+    "listEditors": bench_list_editors,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=path.dirname(path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+# Runs the chosen benchmarks at each size and returns the report
+def run_benchmarks(sizes: list = None, repeat: int = DEFAULT_REPEAT, names: list = None):
+    sizes = sizes or DEFAULT_SIZES
+    names = names or list(BENCHMARKS.keys())
+    app = QApplication.instance()
+    if isinstance(app, type(None)):
+        app = QApplication([])
+
+    runner = BenchmarkRunner(repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for name in names:
+                BENCHMARKS[name](runner, size, directory)
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pyside": PySide6.__version__,
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "results": runner.results,
+    }
+
+
+def result_key(result: dict):
+    return result["name"] + " " + json.dumps(result["params"], sort_keys=True)
+
+
+# Lines comparing the medians of two reports, new time over old time
+def compare_reports(old_report: dict, new_report: dict):
+    old_results = {result_key(result): result for result in old_report["results"]}
+    lines = []
+    for result in new_report["results"]:
+        key = result_key(result)
+        if key not in old_results:
+            lines.append("{:<80} {:>10.6f}          new".format(key, result["median"]))
+            continue
+        old_median = old_results[key]["median"]
+        if old_median > 0:
+            ratio = result["median"] / old_median
+        else:
+            ratio = 1.0 if result["median"] == 0 else float("inf")
+        lines.append("{:<80} {:>10.6f} {:>10.6f} {:>6.2f}x".format(key, old_median, result["median"], ratio))
+    return lines
+
+
+def main(argv: list):
+    parser = argparse.ArgumentParser(description="Score Control benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="catalogue sizes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs of each benchmark")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS.keys()), help="benchmarks to run")
+    parser.add_argument("--output", help="write the json report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two json reports")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as old_file, open(args.compare[1]) as new_file:
+            print("\n".join(compare_reports(json.load(old_file), json.load(new_file))))
+        return
+
+    report = json.dumps(run_benchmarks(args.sizes, args.repeat, args.only), indent=4)
+    if args.output:
+        with open(args.output, "w") as write_file:
+            write_file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    main(sys.argv[1:])
@@ -0,0 +1,162 @@
+# Index over a catalogue list (factions, secondary objectives and so on) by
+# field value, so combo boxes only look at the items that match their filter
+# rather than walking the whole catalogue.
+#
+# Indexes are shared, catalogue_index returns the same index for the same
+# list. Code changing a catalogue should tell its index with add, remove and
+# update. find_catalogue_index gives the index only if one was built. An
+# index is only kept while something holds on to it, such as the filter
+# models querying it, so a catalogue that was closed or replaced goes with
+# its index.
+
+import weakref
+
+_MISSING = object()
+_UNHASHABLE = object()
+
+
+# Filter on one field of a catalogue item that an index can answer directly.
+# values_func returns the accepted values. Items without the field pass when
+# include_missing is set. depends_on lists the json locations values_func
+# reads, so widgets know which changes call for filtering again.
+class FieldFilter:
+    def __init__(self, field: str, values_func, include_missing: bool = False, depends_on: list = None):
+        self.field = field
+        self.values_func = values_func
+        self.include_missing = include_missing
+        self.depends_on = list(depends_on or [])
+
+    def values(self):
+        return self.values_func()
+
+    def __call__(self, item: dict):
+        if self.field not in item:
+            return self.include_missing
+        return item[self.field] in self.values()
+
+
+class CatalogueIndex:
+    def __init__(self, items: list):
+        self.items = items
+        self.order = {}
+        self.next_order = 0
+        self.buckets = {}
+        self.keys = {}
+        self.rebuild()
+
+    def rebuild(self):
+        self.order = {}
+        self.next_order = 0
+        self.buckets = {}
+        self.keys = {}
+        for item in self.items:
+            self.order[id(item)] = self.next_order
+            self.next_order += 1
+
+    # The list was changed behind our back if the counts don't line up
+    def check_current(self):
+        if len(self.items) != len(self.order):
+            self.rebuild()
+
+    @staticmethod
+    def bucket_key(item: dict, field: str):
+        value = item.get(field, _MISSING)
+        try:
+            hash(value)
+        except TypeError:
+            return _UNHASHABLE
+        return value
+
+    def field_buckets(self, field: str):
+        if field not in self.buckets:
+            buckets = {}
+            for item in self.items:
+                key = self.bucket_key(item, field)
+                buckets.setdefault(key, []).append(item)
+                self.keys.setdefault(id(item), {})[field] = key
+            self.buckets[field] = buckets
+        return self.buckets[field]
+
+    def add(self, item: dict):
+        self.order[id(item)] = self.next_order
+        self.next_order += 1
+        for field, buckets in self.buckets.items():
+            key = self.bucket_key(item, field)
+            buckets.setdefault(key, []).append(item)
+            self.keys.setdefault(id(item), {})[field] = key
+
+    def remove(self, item: dict):
+        if id(item) not in self.order:
+            return
+        del self.order[id(item)]
+        item_keys = self.keys.pop(id(item), {})
+        for field, key in item_keys.items():
+            bucket = self.buckets[field].get(key, [])
+            for i, bucket_item in enumerate(bucket):
+                if bucket_item is item:
+                    del bucket[i]
+                    break
+
+    # An item's fields were edited, move it to its new buckets
+    def update(self, item: dict):
+        if id(item) not in self.order:
+            return
+        item_keys = self.keys.setdefault(id(item), {})
+        for field, buckets in self.buckets.items():
+            key = self.bucket_key(item, field)
+            old_key = item_keys.get(field)
+            if key == old_key and type(key) is type(old_key):
+                continue
+            bucket = buckets.get(old_key, [])
+            for i, bucket_item in enumerate(bucket):
+                if bucket_item is item:
+                    del bucket[i]
+                    break
+            buckets.setdefault(key, []).append(item)
+            item_keys[field] = key
+
+    # Items passing the filter, in catalogue order
+    def query(self, field_filter: FieldFilter):
+        self.check_current()
+        buckets = self.field_buckets(field_filter.field)
+
+        matches = []
+        keys = []
+        for value in field_filter.values():
+            try:
+                hash(value)
+            except TypeError:
+                continue
+            if value not in keys:
+                keys.append(value)
+        if field_filter.include_missing:
+            keys.append(_MISSING)
+        for key in keys:
+            matches.extend(buckets.get(key, []))
+
+        # Values we couldn't hash are checked by hand
+        matches.extend(item for item in buckets.get(_UNHASHABLE, []) if field_filter(item))
+
+        matches.sort(key=lambda item: self.order[id(item)])
+        return matches
+
+
+# Lists can't be weakly referenced, so indexes are found by the id of their
+# list. A live index holds its list so the id can't be reused while the index
+# is in here.
+_indexes = weakref.WeakValueDictionary()
+
+
+def catalogue_index(items: list):
+    index = _indexes.get(id(items))
+    if index is None or index.items is not items:
+        index = CatalogueIndex(items)
+        _indexes[id(items)] = index
+    return index
+
+
+def find_catalogue_index(items: list):
+    index = _indexes.get(id(items))
+    if index is None or index.items is not items:
+        return None
+    return index
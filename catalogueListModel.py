@@ -0,0 +1,259 @@
+import bisect
+import weakref
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Slot
+
+from catalogueIndex import FieldFilter, catalogue_index, find_catalogue_index
+from fileManager import FileManager
+
+
+# Qt list model over a list of objects in the json data, such as a catalogue
+# of factions or secondary objectives. Rows show the object names.
+#
+# Changes to the list should go through append_object/remove_row and edits to
+# an object through object_changed, so views and the catalogue's index get
+# told about just that row rather than rebuilding.
+class CatalogueListModel(QAbstractListModel):
+    def __init__(self, json_data: dict, data_location: str, parent=None):
+        super().__init__(parent)
+        self.json_data = json_data
+        self.data_location = data_location
+
+        # If the data doesn't exist in the dictionary, create it
+        assert isinstance(self.json_data, dict)
+        if self.data_location not in self.json_data:
+            self.json_data[self.data_location] = []
+        assert isinstance(self.json_data[self.data_location], list)
+
+    def items(self):
+        return self.json_data[self.data_location]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.items())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.items()):
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self.items()[index.row()].get('name', '')
+        return None
+
+    def object_at(self, row: int):
+        if row < 0 or row >= len(self.items()):
+            return None
+        return self.items()[row]
+
+    def row_of(self, object_data):
+        for row, item in enumerate(self.items()):
+            if item is object_data:
+                return row
+        return -1
+
+    def append_object(self, object_data):
+        row = len(self.items())
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.items().append(object_data)
+        # Filters following us look the new row up in the index
+        item_index = find_catalogue_index(self.items())
+        if not isinstance(item_index, type(None)):
+            item_index.add(object_data)
+        self.endInsertRows()
+        return row
+
+    def remove_row(self, row: int):
+        if row < 0 or row >= len(self.items()):
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        object_data = self.items().pop(row)
+        self.endRemoveRows()
+
+        item_index = find_catalogue_index(self.items())
+        if not isinstance(item_index, type(None)):
+            item_index.remove(object_data)
+        return object_data
+
+    def object_changed(self, object_data):
+        item_index = find_catalogue_index(self.items())
+        if not isinstance(item_index, type(None)):
+            item_index.update(object_data)
+
+        row = self.row_of(object_data)
+        if row >= 0:
+            model_index = self.index(row)
+            self.dataChanged.emit(model_index, model_index)
+
+    # The list was changed without us, such as by another tool editing the
+    # file, so views start over
+    def reload(self):
+        self.beginResetModel()
+        item_index = find_catalogue_index(self.items())
+        if not isinstance(item_index, type(None)):
+            item_index.rebuild()
+        self.endResetModel()
+
+
+# Rows of a catalogue passing a combo box's filter, such as the secondary
+# objectives for a player's army, in catalogue order.
+#
+# Filtering again goes through the catalogue's index like the combos always
+# have, so only matching items are looked at. After that rows added to,
+# removed from or edited in the catalogue model are checked one at a time
+# rather than filtering the whole catalogue again.
+class CatalogueFilterModel(QAbstractListModel):
+    def __init__(self, source_model: CatalogueListModel = None, filter_func=None, parent=None):
+        super().__init__(parent)
+        self.source_model = None
+        self.filter_func = filter_func
+        self.filtered = []
+        self.item_index = None
+        self.set_source_model(source_model)
+
+    def set_source_model(self, source_model: CatalogueListModel):
+        if self.source_model is source_model:
+            return
+        if self.source_model is not None:
+            self.source_model.rowsInserted.disconnect(self.source_rows_inserted)
+            self.source_model.rowsAboutToBeRemoved.disconnect(self.source_rows_removed)
+            self.source_model.dataChanged.disconnect(self.source_data_changed)
+            self.source_model.modelReset.disconnect(self.invalidate_filter)
+        self.source_model = source_model
+        self.item_index = None
+        if self.source_model is not None:
+            self.source_model.rowsInserted.connect(self.source_rows_inserted)
+            self.source_model.rowsAboutToBeRemoved.connect(self.source_rows_removed)
+            self.source_model.dataChanged.connect(self.source_data_changed)
+            self.source_model.modelReset.connect(self.invalidate_filter)
+        self.invalidate_filter()
+
+    def set_filter_function(self, filter_func):
+        self.filter_func = filter_func
+        self.invalidate_filter()
+
+    # Filter every row again, for when what the filter depends on changed
+    def invalidate_filter(self):
+        self.beginResetModel()
+        self.filtered = []
+        if self.source_model is not None:
+            items = self.source_model.items()
+            if isinstance(self.filter_func, FieldFilter):
+                self.filtered = self.source_index().query(self.filter_func)
+            elif isinstance(self.filter_func, type(None)):
+                self.filtered = list(items)
+            else:
+                self.filtered = [item for item in items if self.filter_func(item)]
+        self.endResetModel()
+
+    # The source catalogue's index, held on to so it is kept while we use it
+    def source_index(self):
+        self.item_index = catalogue_index(self.source_model.items())
+        return self.item_index
+
+    def accepts(self, item: dict):
+        return isinstance(self.filter_func, type(None)) or bool(self.filter_func(item))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.filtered)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.filtered):
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self.filtered[index.row()].get('name', '')
+        return None
+
+    def object_at(self, row: int):
+        if row < 0 or row >= len(self.filtered):
+            return None
+        return self.filtered[row]
+
+    def row_of(self, object_data):
+        for row, item in enumerate(self.filtered):
+            if item is object_data:
+                return row
+        return -1
+
+    def insert_object(self, object_data):
+        # The index knows the catalogue order of every item
+        item_index = self.source_index()
+        item_index.check_current()
+        order = item_index.order
+        # bisect only takes a key from Python 3.10
+        row = bisect.bisect_right([order[id(item)] for item in self.filtered], order[id(object_data)])
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.filtered.insert(row, object_data)
+        self.endInsertRows()
+
+    def remove_row(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.filtered[row]
+        self.endRemoveRows()
+
+    @Slot(QModelIndex, int, int)
+    def source_rows_inserted(self, parent, first: int, last: int):
+        for row in range(first, last + 1):
+            object_data = self.source_model.object_at(row)
+            if self.accepts(object_data):
+                self.insert_object(object_data)
+
+    @Slot(QModelIndex, int, int)
+    def source_rows_removed(self, parent, first: int, last: int):
+        for row in range(first, last + 1):
+            filtered_row = self.row_of(self.source_model.object_at(row))
+            if filtered_row >= 0:
+                self.remove_row(filtered_row)
+
+    # An edit can move an item in or out of the filter
+    @Slot(QModelIndex, QModelIndex)
+    def source_data_changed(self, top_left, bottom_right, roles=None):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            object_data = self.source_model.object_at(row)
+            filtered_row = self.row_of(object_data)
+            if not self.accepts(object_data):
+                if filtered_row >= 0:
+                    self.remove_row(filtered_row)
+            elif filtered_row < 0:
+                self.insert_object(object_data)
+            else:
+                model_index = self.index(filtered_row)
+                self.dataChanged.emit(model_index, model_index)
+
+
+# Found by the id of their list like catalogue indexes, and only kept while
+# a widget shows them
+_models = weakref.WeakValueDictionary()
+
+
+# The model shared by everything showing the list at data_location, made
+# the first time it is asked for. Tables sharing a catalogue share its model.
+def catalogue_model(json_data: dict, data_location: str):
+    if data_location not in json_data:
+        json_data[data_location] = []
+    items = json_data[data_location]
+    model = _models.get(id(items))
+    if model is None or model.items() is not items:
+        model = CatalogueListModel(json_data, data_location)
+        _models[id(items)] = model
+    return model
+
+
+def find_catalogue_model(json_data: dict, data_location: str):
+    items = json_data.get(data_location)
+    model = _models.get(id(items))
+    if model is None or model.items() is not items:
+        return None
+    return model
+
+
+# Tell the shared models of json_data that changes were made to their
+# lists without them, json_locations are the changed locations
+def catalogues_changed(json_data: dict, json_locations: list):
+    for data_location in list(json_data.keys()):
+        model = find_catalogue_model(json_data, data_location)
+        if model is None:
+            continue
+        if any(FileManager.overlaps(json_location, data_location) for json_location in json_locations):
+            model.reload()
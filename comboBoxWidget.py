@@ -1,30 +1,54 @@
 import sys
-import pydash
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QLabel, QApplication
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, Signal
 
+from catalogueIndex import FieldFilter
+from catalogueListModel import CatalogueFilterModel, catalogue_model
+from jsonEvents import change_event
+from jsonPath import compile_json_path
 
+
+# Combo box picking an item of a catalogue by name and writing it into the
+# json.
+#
+# The items come from the catalogue's shared model (see catalogue_model)
+# through a filter of our own, so combos don't keep copies of the names and
+# edits to the catalogue show up in every combo as they are made.
 class ComboBoxWidget(QWidget):
     comboBox = None
     item_json_data = None
     item_json_location = None
     out_json_data = None
     out_json_location = None
-    num_items = 0
     filter_func = None
+    filter_model = None
+    resetting = False
     reset_value = None
+    file_manager = None
+    event_emitter = None
+    subscriptions = []
+
+    # Emitted after the widget writes a new selection into the json
+    valueChanged = Signal()
 
     def __init__(self, label: str, out_json_data: dict, out_json_location: str, item_json_data: dict,
-                 item_json_location: str, filter_func=None, type_filter=None, reset_value=None):
+                 item_json_location: str, filter_func=None, type_filter=None, reset_value=None, file_manager=None):
         QWidget.__init__(self)
 
+        self.file_manager = file_manager
+        self.event_emitter = None
+        self.subscriptions = []
+        self.resetting = False
+
         self.item_json_data = item_json_data
         self.item_json_location = item_json_location
         self.out_json_data = out_json_data
         self.out_json_location = out_json_location
+        self.out_json_path = compile_json_path(out_json_location)
         self.filter_func = filter_func
-        self.current_item = pydash.get(self.out_json_data, self.out_json_location)
+        self.filter_model = CatalogueFilterModel(filter_func=filter_func, parent=self)
+        self.current_item = self.out_json_path.get(self.out_json_data)
         self.type_filter = type_filter
         if isinstance(self.type_filter, str):
             self.set_type_filter(self.type_filter)
@@ -42,8 +66,15 @@ class ComboBoxWidget(QWidget):
         layout.addWidget(self.label)
 
         # Combo box
+        # Filtered before the combo box is given the model, so it only has
+        # to take in the rows once
+        self.filter_items()
         self.comboBox = QComboBox()
-        self.reset_items()
+        self.comboBox.setModel(self.filter_model)
+        self.select_current()
+        self.filter_model.rowsInserted.connect(self.items_changed)
+        self.filter_model.rowsRemoved.connect(self.items_changed)
+        self.filter_model.modelReset.connect(self.items_changed)
         self.comboBox.activated.connect(self.selection_changed)
         layout.addWidget(self.comboBox)
 
@@ -53,52 +84,107 @@ class ComboBoxWidget(QWidget):
     @Slot()
     def selection_changed(self):
         self.current_item = self.comboBox.currentText()
-        pydash.set_(self.out_json_data, self.out_json_location, self.comboBox.currentText())
+        if self.file_manager is None:
+            self.out_json_path.set(self.out_json_data, self.current_item)
+        else:
+            self.file_manager.set(self.out_json_location, self.current_item)
+        self.valueChanged.emit()
 
     def set_data(self, out_json_data):
         self.out_json_data = out_json_data
-        self.current_item = pydash.get(self.out_json_data, self.out_json_location)
+        self.current_item = self.out_json_path.get(self.out_json_data)
         self.reset_items()
 
+    # Show the selection in the json again after something else changed it,
+    # the items are only rebuilt when it isn't one of them
+    def refresh(self):
+        self.current_item = self.out_json_path.get(self.out_json_data)
+        index = -1
+        if isinstance(self.current_item, str):
+            index = self.comboBox.findText(self.current_item)
+        if index >= 0:
+            self.comboBox.setCurrentIndex(index)
+        else:
+            self.reset_items()
+
+    # Edit another location with the same widget, the items and filter stay
+    def rebind(self, json_location: str, label: str = None):
+        self.out_json_location = json_location
+        self.out_json_path = compile_json_path(json_location)
+        if label is not None:
+            self.label.setText(label)
+        self.refresh()
+
     def set_type_filter(self, type_filter):
-        self.set_filter_function(lambda i: 'type' in i and i['type'] == type_filter)
+        self.set_filter_function(FieldFilter('type', lambda: [type_filter]))
 
     def set_filter_function(self, filter_func):
         self.filter_func = filter_func
+        self.filter_model.filter_func = filter_func
+        if self.event_emitter is not None:
+            self.subscribe(self.event_emitter)
         self.reset_items()
 
+    # Filter the items again, and pick the first if the selection is gone
     def reset_items(self):
         if isinstance(self.comboBox, type(None)):
             return
-        self.comboBox.clear()
-        self.num_items = 0
-        self.add_items()
+        if self.filter_items():
+            self.select_current()
+
+    def filter_items(self):
+        if isinstance(self.item_json_data, type(None)) or isinstance(self.item_json_location, type(None)):
+            self.setEnabled(False)
+            return False
+
+        # The catalogue's list may have been replaced since we last looked
+        model = catalogue_model(self.item_json_data, self.item_json_location)
+        self.resetting = True
+        if self.filter_model.source_model is not model:
+            self.filter_model.set_source_model(model)
+        else:
+            self.filter_model.invalidate_filter()
+        self.resetting = False
+        return True
+
+    # Listen on the emitter for changes to the json locations our filter
+    # depends on, such as the army name for a list of secondary objectives
+    def subscribe(self, ee):
+        self.unsubscribe()
+        self.event_emitter = ee
+        for json_location in getattr(self.filter_func, 'depends_on', []):
+            event = change_event(json_location)
+            ee.on(event, self.dependency_changed)
+            self.subscriptions.append((ee, event))
+
+    def unsubscribe(self):
+        for ee, event in self.subscriptions:
+            ee.off(event, self.dependency_changed)
+        self.event_emitter = None
+        self.subscriptions = []
+
+    def dependency_changed(self, json_location, old_value, new_value):
+        self.reset_items()
 
     def set_item_data(self, item_data):
         self.item_json_data = item_data
         self.reset_items()
 
-    def add_items(self):
-        if isinstance(self.item_json_data, type(None)) or isinstance(self.item_json_location, type(None)):
-            self.setEnabled(False)
-            return
+    # Show the selected item, or the first one when it isn't there
+    def select_current(self):
+        index = -1
+        if isinstance(self.current_item, str):
+            index = self.comboBox.findText(self.current_item)
+        if index < 0 and self.comboBox.count() > 0:
+            index = 0
+        self.comboBox.setCurrentIndex(index)
+        self.current_item = self.comboBox.currentText()
 
-        current_item_found = False
-        for item in self.item_json_data[self.item_json_location]:
-            # Filter out items that our filter dislikes
-            if not isinstance(self.filter_func, type(None)):
-                if not self.filter_func(item):
-                    continue
-
-            # Add Item to the combo box and see if it is the current selection
-            self.comboBox.insertItem(self.num_items, item['name'])
-            if self.current_item == item['name']:
-                self.comboBox.setCurrentIndex(self.num_items)
-                current_item_found = True
-            self.num_items += 1
-
-        if not current_item_found:
-            self.current_item = self.comboBox.currentText()
+    # The catalogue changed, or an edit moved an item in or out of our filter
+    @Slot()
+    def items_changed(self):
+        if not self.resetting:
+            self.select_current()
 
     def reset_data(self):
         if not isinstance(self.reset_value, type(None)):
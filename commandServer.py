@@ -0,0 +1,107 @@
+from PySide6.QtCore import QObject, Slot
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# Name of the local socket (a named pipe on Windows) of the running app
+COMMAND_SERVER_NAME = "score-control"
+
+# Milliseconds a second launch waits on the running app
+COMMAND_TIMEOUT = 2000
+
+# Largest batch we will wait on before giving up on a client
+MAX_BATCH_SIZE = 65536
+
+
+# Takes batches of commands for the running app over a local socket, so
+# stream deck buttons and scripts can drive it without touching the json
+# files (see scoreCommands for the commands).
+#
+# A batch is lines of commands ended by an empty line, or by the client
+# disconnecting. handler is called with the lines and its reply, "ok" or
+# "error: <why>", is sent back followed by a new line. A client can send
+# several batches.
+class CommandServer(QObject):
+    def __init__(self, handler, name: str = COMMAND_SERVER_NAME, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.name = name
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.new_connection)
+        self.buffers = {}
+
+    # Start listening, returns False if the name is taken by a running app
+    def start(self):
+        if self.server.isListening():
+            return True
+        if self.server.listen(self.name):
+            return True
+        # Left behind by an app that didn't close cleanly
+        if send_commands([], self.name, 0) is not None:
+            return False
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def stop(self):
+        self.server.close()
+        for socket in list(self.buffers.keys()):
+            socket.disconnected.disconnect(self.socket_closed)
+            socket.abort()
+            socket.deleteLater()
+        self.buffers = {}
+
+    @Slot()
+    def new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(self.socket_ready)
+            socket.disconnected.connect(self.socket_closed)
+
+    @Slot()
+    def socket_ready(self):
+        socket = self.sender()
+        if socket not in self.buffers:
+            return
+        data = self.buffers[socket] + bytes(socket.readAll().data())
+        data = data.replace(b"\r\n", b"\n")
+        while b"\n\n" in data:
+            batch, data = data.split(b"\n\n", 1)
+            socket.write((self.run_batch(batch) + "\n").encode("utf-8"))
+        if len(data) > MAX_BATCH_SIZE:
+            del self.buffers[socket]
+            socket.disconnectFromServer()
+            return
+        self.buffers[socket] = data
+
+    @Slot()
+    def socket_closed(self):
+        socket = self.sender()
+        batch = self.buffers.pop(socket, b"")
+        if batch.strip():
+            self.run_batch(batch)
+        socket.deleteLater()
+
+    def run_batch(self, batch: bytes):
+        lines = [line for line in batch.decode("utf-8", "replace").split("\n") if line.strip()]
+        if not lines:
+            return "ok"
+        return self.handler(lines)
+
+
+# Sends a batch of commands to the running app and waits for its reply.
+# Returns None when the app isn't running. Doesn't need a QApplication.
+def send_commands(lines: list, name: str = COMMAND_SERVER_NAME, timeout: int = COMMAND_TIMEOUT):
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    if not socket.waitForConnected(max(timeout, 100)):
+        return None
+    if not lines:
+        socket.abort()
+        return ""
+
+    socket.write(("\n".join(lines) + "\n\n").encode("utf-8"))
+    socket.waitForBytesWritten(timeout)
+    reply = b""
+    while not reply.endswith(b"\n") and socket.waitForReadyRead(timeout):
+        reply += bytes(socket.readAll().data())
+    socket.disconnectFromServer()
+    return reply.decode("utf-8").strip()
@@ -1,24 +1,171 @@
+import contextlib
 import copy
+import functools
 import json
+import os
+import sys
 from os import path
 
+from jsonPatch import changes_to_patch, json_diff
+from jsonPath import compile_json_path, json_location_holds
+from jsonSerializer import JsonSerializer
+from patchJournal import PatchJournal
+import writeBehindWriter
+from writeBehindWriter import WriteBehindWriter
+
+
+# Catalogue lists are large and rarely change, so they can be kept out of the
+# scoreboard file OBS is reading and saved on a slower cadence
+CATALOGUE_SAVE_INTERVAL = 5.0
+
+# Document layout with each catalogue in its own file next to the scoreboard
+# Example:
+# [
+#     {
+#         'name': <file suffix, scoreboard.<name>.json>,
+#         'keys': [<top level keys stored in this file>],
+#         'saveInterval': <seconds to collect changes before writing>, -- Optional
+#         'journal': <True to journal changes, see PatchJournal>, -- Optional
+#     }
+# ]
+#
+# catalogue_layout gives one for the top level keys of catalogues, see
+# gameSystems.catalogue_keys.
+def catalogue_layout(keys: list):
+    return [{"name": key, "keys": [key], "saveInterval": CATALOGUE_SAVE_INTERVAL} for key in keys]
+
+
+# What a location edited in place had on disk, we can't know
+UNKNOWN_VALUE = object()
+
+
+# What a file on disk was when we last read or wrote it, None when there is
+# no file. A write replaces the file, so another tool writing it changes the
+# inode even within the same tick of the clock.
+def file_stamp(file_path: str):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+# One file on disk holding some of the top level keys of the json data.
+# keys of None means every key not claimed by another document.
+# journal is the document's PatchJournal when changes are journaled.
+# diskStamp is the file_stamp of the file as we last saw it. unsaved maps the
+# locations changed here since the file was last written to the value they
+# had on disk, UNKNOWN_VALUE for ones edited in place.
+class JsonDocument:
+    def __init__(self, name: str, file_path: str, keys: list = None, save_interval: float = 0.0, journal=None):
+        self.name = name
+        self.filePath = file_path
+        self.keys = keys
+        self.saveInterval = save_interval
+        self.journal = journal
+        self.producer = None
+        self.write = None
+        self.diskStamp = None
+        self.unsaved = {}
+
+    def owns(self, key: str):
+        return self.keys is None or key in self.keys
+
 
 # Manages files by opening a json file and keeping in memory.
 # Other modules use a reference to the json data that is
-# returned by this module. When asked to save, this will check
-# if the json data is dirty before dumping it out.
+# returned by this module. Writes should go through set() or be
+# followed by mark_dirty() so that a save only has to check a flag
+# rather than compare the whole document.
+#
+# The json data can be split over several files with a layout (see
+# catalogue_layout). The main file keeps everything else and the data is
+# still presented as a single dict. Each file has its own dirty flag and
+# save interval.
+#
+# Listeners added with add_listener are called with a list of changes after
+# every set(). Each change is a tuple of (json_location, old_value, new_value).
+# A listener may set() values itself, such as totals following a score. While
+# listeners are being called notifying counts how deep that goes, it is 1 for
+# a change made directly. A listener that raises is passed to sys.excepthook
+# and the rest are still called, the change stays made and saved either way
+# so the data, the files and the other listeners agree.
+#
+# Changes made inside a transaction() are applied straight away but are only
+# recorded for saving and passed to listeners when it ends, all together, so
+# something like a reset is one save and one update for overlays.
+#
+# Saving goes through a write-behind writer. Changes made within write_window
+# seconds (or a document's save interval if longer) of the first unsaved
+# change are written together, and files are replaced atomically so readers
+# never see a partial file.
+#
+# With journal set, changes to the main file made through set() are added to
+# a journal next to it (scoreboard.journal.jsonl) rather than rewriting the
+# file, which is only rewritten when the journal is compacted. See
+# PatchJournal.
+#
+# serializer reads and writes the files, by default a pretty JsonSerializer
+# using the fastest json library installed.
+#
+# Files can be changed by other tools while they are open, such as a bot
+# keeping score. merge_document brings such a change in, passing the
+# locations that differ to listeners with reloading set (see FileWatcher).
+# A location changed both here and in the file since the last save is a
+# conflict, ours is kept and the file as it was is copied to
+# <file>.conflict.json. Before a file is written it is checked for changes
+# that haven't been merged yet, so they are never written over.
+#
+# Several file managers can share one writer, so one SaveScheduler saves all
+# of them. shared_keys maps top level keys to another file manager that owns
+# them, such as catalogues shared by every table at an event. Their values
+# are the owner's and their split out files aren't read. set() and
+# mark_dirty() on them go to the owner.
 class FileManager:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, layout: list = None, write_window: float = 0.0, journal: bool = False,
+                 serializer: JsonSerializer = None, writer: WriteBehindWriter = None, shared_keys: dict = None):
         self._filePath = None
+        self._layout = layout if layout is not None else []
+        self._journal = journal
+        self.serializer = serializer if serializer is not None else JsonSerializer()
         self.jsonData = None
-        self.jsonOld = None
+        self.documents = []
+        self.writer = writer if writer is not None else WriteBehindWriter(write_window)
+        self.sharedKeys = shared_keys if shared_keys is not None else {}
+        self.listeners = []
+        self.notifying = 0
+        self.reloading = False
+        self.transactionDepth = 0
+        self.transactionChanges = []
 
         self.set_file_path(file_path)
 
     def set_file_path(self, file_path: str):
+        # Anything waiting belongs to the old file
+        self.writer.flush(force=True)
+
         self._filePath = file_path
+        base = path.splitext(file_path)[0]
+        self.documents = [JsonDocument("", file_path, journal=self.make_journal(base, self._journal))]
+        for doc in self._layout:
+            doc_base = base + "." + doc["name"]
+            self.documents.append(JsonDocument(doc["name"], doc_base + ".json", doc["keys"],
+                                               doc.get("saveInterval", 0.0),
+                                               self.make_journal(doc_base, doc.get("journal", False))))
+        for doc in self.documents:
+            doc.producer = functools.partial(self.serialize_document, doc)
+            doc.write = functools.partial(self.write_document, doc)
         self.read_file()
 
+    @staticmethod
+    def make_journal(base: str, journal: bool):
+        if not journal:
+            return None
+        return PatchJournal(base + ".journal.jsonl", base + ".history.jsonl")
+
+    def get_file_path(self):
+        return self._filePath
+
     def read_file(self):
         if not path.isfile(self._filePath):
             return
@@ -26,22 +173,343 @@ class FileManager:
         # load the json
         with open(self._filePath, 'r') as read_file:
             try:
-                self.jsonData = json.load(read_file)
+                self.jsonData = self.serializer.loads(read_file.read())
             except json.decoder.JSONDecodeError:
                 return
 
-        self.jsonOld = copy.deepcopy(self.jsonData)
+        for doc in self.documents:
+            self.writer.discard(doc.filePath)
+            doc.diskStamp = file_stamp(doc.filePath)
+            doc.unsaved = {}
+            if doc.journal is not None:
+                self.writer.discard(doc.journal.filePath)
+                doc.journal.discard_pending()
+
+        # Pull in the split out files. Keys still sitting in the main file
+        # (a file from before it was split) get moved out on the next save
+        main_doc = self.documents[0]
+        for doc in self.documents[1:]:
+            if self.is_shared(doc):
+                # Not read, but still moved out of the main file
+                if any(key in self.jsonData for key in doc.keys):
+                    self.mark_document(main_doc)
+                    self.mark_document(doc)
+                continue
+            if path.isfile(doc.filePath):
+                with open(doc.filePath, 'r') as read_file:
+                    try:
+                        doc_data = self.serializer.loads(read_file.read())
+                    except json.decoder.JSONDecodeError:
+                        doc_data = {}
+                for key in doc.keys:
+                    if key in self.jsonData:
+                        self.mark_document(main_doc)
+                    if key in doc_data:
+                        self.jsonData[key] = doc_data[key]
+            elif any(key in self.jsonData for key in doc.keys):
+                self.mark_document(main_doc)
+                self.mark_document(doc)
+
+        # Changes since the last snapshot, the next save compacts them
+        for doc in self.documents:
+            if doc.journal is not None and doc.journal.replay(self.jsonData) > 0:
+                self.mark_document(doc)
+
+        self.link_shared_keys()
+
+    # Point the shared keys at the owner's values
+    def link_shared_keys(self):
+        if not self.is_valid():
+            return
+        for key, owner in self.sharedKeys.items():
+            value = owner.get(key)
+            if value is None:
+                self.jsonData.pop(key, None)
+            else:
+                self.jsonData[key] = value
+
+    def is_shared(self, doc: JsonDocument):
+        return doc.keys is not None and all(key in self.sharedKeys for key in doc.keys)
+
+    def shared_owner(self, json_location: str):
+        return self.sharedKeys.get(compile_json_path(json_location).root_key)
+
+    def document_for(self, json_location: str):
+        key = compile_json_path(json_location).root_key
+        for doc in self.documents[1:]:
+            if doc.owns(key):
+                return doc
+        return self.documents[0]
+
+    # Set a value in the json data and flag the document for saving
+    def set(self, json_location: str, value):
+        if not self.is_valid():
+            return
+        owner = self.shared_owner(json_location)
+        if owner is not None:
+            owner.set(json_location, value)
+            return
+
+        json_path = compile_json_path(json_location)
+        old_value = json_path.get(self.jsonData)
+        json_path.set(self.jsonData, value)
+        changes = [(json_location, old_value, value)]
+        if self.transactionDepth > 0:
+            self.transactionChanges.extend(changes)
+            return
+        self.record_changes(self.document_for(json_location), changes)
+        self.notify_listeners(changes)
+
+    # Groups set() calls into one change. Yields a list that is filled with
+    # the changes made once the outermost transaction ends, each location
+    # once with its first old value and last new value, leaving out the ones
+    # that ended up the same. If the block raises, the old values are put
+    # back and nothing is saved or passed on.
+    @contextlib.contextmanager
+    def transaction(self):
+        committed = []
+        self.transactionDepth += 1
+        try:
+            yield committed
+        except BaseException:
+            self.transactionDepth -= 1
+            if self.transactionDepth == 0:
+                self.roll_back()
+            raise
+        self.transactionDepth -= 1
+        if self.transactionDepth == 0:
+            committed.extend(self.commit())
+
+    def roll_back(self):
+        changes = self.transactionChanges
+        self.transactionChanges = []
+        for json_location, old_value, new_value in reversed(changes):
+            compile_json_path(json_location).set(self.jsonData, old_value)
 
-    # If the file is dirty, we write it out
-    def write_file(self):
+    def commit(self):
+        merged = {}
+        for json_location, old_value, new_value in self.transactionChanges:
+            if json_location in merged:
+                old_value = merged[json_location][1]
+            merged[json_location] = (json_location, old_value, new_value)
+        self.transactionChanges = []
+        changes = [change for change in merged.values() if change[1] != change[2]]
+        if not changes:
+            return changes
+
+        doc_changes = {}
+        for change in changes:
+            doc_changes.setdefault(self.document_for(change[0]), []).append(change)
+        for doc, changes_in_doc in doc_changes.items():
+            self.record_changes(doc, changes_in_doc)
+        self.notify_listeners(changes)
+        return changes
+
+    def get(self, json_location: str, default=None):
+        if not self.is_valid():
+            return default
+        return compile_json_path(json_location).get(self.jsonData, default)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify_listeners(self, changes: list):
+        self.notifying += 1
+        try:
+            for listener in list(self.listeners):
+                try:
+                    listener(changes)
+                except Exception:
+                    sys.excepthook(*sys.exc_info())
+        finally:
+            self.notifying -= 1
+
+    # For code that edits the json data in place (lists of objects and such).
+    # Without a location every document is flagged.
+    def mark_dirty(self, json_location: str = None):
+        if not self.is_valid():
+            return
+
+        if json_location is None:
+            for doc in self.documents:
+                doc.unsaved[""] = UNKNOWN_VALUE
+                self.mark_document(doc)
+        elif self.shared_owner(json_location) is not None:
+            self.shared_owner(json_location).mark_dirty(json_location)
+        else:
+            doc = self.document_for(json_location)
+            doc.unsaved[json_location] = UNKNOWN_VALUE
+            self.mark_document(doc)
+
+    def mark_document(self, doc: JsonDocument):
+        self.writer.submit(doc.filePath, doc.producer, max(doc.saveInterval, self.writer.window), write=doc.write)
+
+    # Changes made to a document. Journaled documents add them to their
+    # journal, the rest are rewritten.
+    def record_changes(self, doc: JsonDocument, changes: list):
+        for json_location, old_value, new_value in changes:
+            doc.unsaved.setdefault(json_location, old_value)
+        if doc.journal is None:
+            self.mark_document(doc)
+            return
+
+        doc.journal.record(changes_to_patch(self.jsonData, changes))
+        self.writer.submit(doc.journal.filePath, doc.journal.pending_text, max(doc.saveInterval, self.writer.window),
+                           write=doc.journal.write_pending)
+        if doc.journal.needs_compaction():
+            self.mark_document(doc)
+
+    # Rewrite the snapshot of every journaled document that has changes in
+    # its journal, such as before closing
+    def compact_journals(self):
+        if not self.is_valid():
+            return
+        for doc in self.documents:
+            if doc.journal is not None and doc.journal.has_entries():
+                self.mark_document(doc)
+
+    # Writes a document's file, first bringing in anything another tool
+    # wrote to it since we last looked. A journaled document's snapshot holds
+    # everything in the journal once it is written.
+    def write_document(self, doc: JsonDocument, file_path: str, text: str):
+        if self.changed_on_disk(doc):
+            self.merge_document(doc, *self.read_document(doc))
+            text = self.serialize_document(doc)
+        writeBehindWriter.atomic_write(file_path, text)
+        doc.diskStamp = file_stamp(file_path)
+        doc.unsaved = {}
+        if doc.journal is not None:
+            doc.journal.rotate()
+
+    def changed_on_disk(self, doc: JsonDocument):
+        return file_stamp(doc.filePath) != doc.diskStamp
+
+    # Our documents whose files were changed by something else
+    def changed_documents(self):
+        if not self.is_valid():
+            return []
+        return [doc for doc in self.documents if not self.is_shared(doc) and self.changed_on_disk(doc)]
+
+    # Reads a document's file as it is now, without touching anything else so
+    # it can be done on another thread. Returns (stamp, text, data), data is
+    # None when the file can't be read, such as while it is being written.
+    def read_document(self, doc: JsonDocument):
+        stamp = file_stamp(doc.filePath)
+        if stamp is None:
+            return stamp, "", None
+        try:
+            with open(doc.filePath, 'r', encoding='utf-8') as read_file:
+                text = read_file.read()
+        except (OSError, ValueError):
+            return stamp, "", None
+        try:
+            data = self.serializer.loads(text)
+        except ValueError:
+            return stamp, text, None
+        if file_stamp(doc.filePath) != stamp or not isinstance(data, dict):
+            return stamp, text, None
+        return stamp, text, data
+
+    # Brings in a document's file as read by read_document. Each location
+    # that differs is set, changed in place when it is a list or dict, and
+    # passed to listeners in one go with reloading set. Locations changed
+    # here and not saved yet keep our value. Where the file changed them too
+    # that is a conflict and the file is copied next to it. Returns the
+    # conflicting locations.
+    def merge_document(self, doc: JsonDocument, stamp, text: str, data: dict):
+        if doc not in self.documents or not self.is_valid() or stamp != file_stamp(doc.filePath):
+            # Gone or changed again since it was read
+            return []
+        doc.diskStamp = stamp
+        if data is None:
+            # Not json, keep a copy before we write over it
+            if text:
+                writeBehindWriter.atomic_write(self.conflict_path(doc), text)
+            self.mark_document(doc)
+            return []
+
+        if doc.journal is not None:
+            doc.journal.replay(data)
+        current = {key: value for key, value in self.document_data(doc).items() if key not in self.sharedKeys}
+        data = {key: value for key, value in data.items() if key in current or self.document_owns(doc, key)}
+        conflicts = []
+        changes = []
+        for change in json_diff(current, data):
+            ours = [location for location in doc.unsaved if self.overlaps(change[0], location)]
+            if not ours:
+                changes.append(self.apply_external(change, data))
+            elif any(doc.unsaved[location] is UNKNOWN_VALUE or
+                     compile_json_path(location).get(data) != doc.unsaved[location] for location in ours):
+                conflicts.append(change[0])
+        if conflicts:
+            writeBehindWriter.atomic_write(self.conflict_path(doc), text)
+            self.mark_document(doc)
+        if changes:
+            self.reloading = True
+            try:
+                self.notify_listeners(changes)
+            finally:
+                self.reloading = False
+        return conflicts
+
+    def document_owns(self, doc: JsonDocument, key: str):
+        return key not in self.sharedKeys and self.document_for(key) is doc
+
+    def apply_external(self, change, data: dict):
+        json_location, old_value, new_value = change
+        json_path = compile_json_path(json_location)
+        if len(json_path.tokens) == 1 and json_path.root_key not in data:
+            self.jsonData.pop(json_path.root_key, None)
+        elif type(old_value) is type(new_value) and isinstance(old_value, (dict, list)):
+            # Whatever holds on to the list or dict keeps seeing it
+            old_value = copy.copy(old_value)
+            json_path.get(self.jsonData).clear()
+            if isinstance(new_value, dict):
+                json_path.get(self.jsonData).update(new_value)
+            else:
+                json_path.get(self.jsonData).extend(new_value)
+        else:
+            json_path.set(self.jsonData, new_value)
+        return json_location, old_value, new_value
+
+    # One location is the other or holds it, "" holds everything
+    @staticmethod
+    def overlaps(json_location: str, other: str):
+        return json_location_holds(json_location, other) or json_location_holds(other, json_location)
+
+    @staticmethod
+    def conflict_path(doc: JsonDocument):
+        return path.splitext(doc.filePath)[0] + ".conflict.json"
+
+    # Dirty means a write is waiting for the document, or any of ours
+    def is_dirty(self, doc: JsonDocument = None):
+        if doc is None:
+            return any(self.is_dirty(doc) for doc in self.documents)
+        if doc.journal is not None and self.writer.is_pending(doc.journal.filePath):
+            return True
+        return self.writer.is_pending(doc.filePath)
+
+    # Write out the dirty files whose window has passed. force will write
+    # every dirty file, for when we are closing.
+    def write_file(self, force: bool = False):
         if not self.is_valid():
             return
 
-        if self.jsonOld != self.jsonData:
-            self.jsonOld = copy.deepcopy(self.jsonData)
+        self.writer.flush(force=force)
+
+    def serialize_document(self, doc: JsonDocument):
+        return self.serializer.dumps(self.document_data(doc))
 
-            with open(self._filePath, 'w') as read_file:
-                read_file.write(json.dumps(self.jsonData, sort_keys=True, indent=4))
+    # The part of the json data that belongs in a document's file
+    def document_data(self, doc: JsonDocument):
+        if doc is self.documents[0]:
+            return {key: value for key, value in self.jsonData.items()
+                    if not any(other.owns(key) for other in self.documents[1:])}
+        return {key: self.jsonData[key] for key in doc.keys if key in self.jsonData}
 
     def get_json_data(self):
         if self.is_valid():
@@ -0,0 +1,107 @@
+from os import path
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+# Milliseconds to let another tool finish writing before reading what it wrote
+RELOAD_DELAY = 100
+
+
+class _ReadSignals(QObject):
+    done = Signal(object, object)
+
+
+# Reads a document's file on the thread pool
+class _ReadJob(QRunnable):
+    def __init__(self, file_manager, doc, signals: _ReadSignals):
+        super().__init__()
+        self.fileManager = file_manager
+        self.doc = doc
+        self.signals = signals
+
+    def run(self):
+        self.signals.done.emit(self.doc, self.fileManager.read_document(self.doc))
+
+
+# Brings in changes other tools make to a file manager's files while they
+# are open, such as a bot keeping score.
+#
+# The files and their folders are watched, as a file replaced by renaming
+# over it is no longer the file being watched. A change waits RELOAD_DELAY
+# for more, then every file whose stamp isn't ours is read and parsed on the
+# thread pool. Back on this thread FileManager.merge_document sets only what
+# differs, so the widgets bound to those locations, the text files and the
+# overlays update and nothing else. Our own saves are recognised by their
+# stamp and ignored.
+#
+# conflicted is emitted with the file and the locations changed both here
+# and in the file, where ours were kept.
+class FileWatcher(QObject):
+    conflicted = Signal(str, list)
+
+    def __init__(self, file_manager, delay: int = RELOAD_DELAY, parent=None):
+        super().__init__(parent)
+        self.fileManager = file_manager
+        self.reading = set()
+        self.pool = QThreadPool.globalInstance()
+        self.signals = _ReadSignals(self)
+        self.signals.done.connect(self.document_read)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.check)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.path_changed)
+        self.watcher.directoryChanged.connect(self.path_changed)
+        self.watch()
+
+    # Follow the file manager's files, again after it opens another file
+    def watch(self):
+        if self.watcher.files() or self.watcher.directories():
+            self.watcher.removePaths(self.watcher.files() + self.watcher.directories())
+        self.watch_files()
+
+    # Files replaced by renaming over them, our own saves too, have to be
+    # watched again
+    def watch_files(self):
+        if not self.fileManager.is_valid():
+            return
+        paths = set()
+        for doc in self.fileManager.documents:
+            if self.fileManager.is_shared(doc):
+                continue
+            paths.add(path.dirname(path.abspath(doc.filePath)))
+            if path.isfile(doc.filePath):
+                paths.add(doc.filePath)
+        paths -= set(self.watcher.files() + self.watcher.directories())
+        if paths:
+            self.watcher.addPaths(sorted(paths))
+
+    def stop(self):
+        self.timer.stop()
+        self.signals.done.disconnect(self.document_read)
+        if self.watcher.files() or self.watcher.directories():
+            self.watcher.removePaths(self.watcher.files() + self.watcher.directories())
+
+    @Slot(str)
+    def path_changed(self, changed_path: str):
+        self.timer.start()
+
+    @Slot()
+    def check(self):
+        self.watch_files()
+        for doc in self.fileManager.changed_documents():
+            if doc in self.reading:
+                continue
+            self.reading.add(doc)
+            self.pool.start(_ReadJob(self.fileManager, doc, self.signals))
+
+    @Slot(object, object)
+    def document_read(self, doc, result):
+        self.reading.discard(doc)
+        conflicts = self.fileManager.merge_document(doc, *result)
+        if conflicts:
+            self.conflicted.emit(doc.filePath, conflicts)
+        if doc in self.fileManager.documents and self.fileManager.changed_on_disk(doc):
+            self.timer.start()
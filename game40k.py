@@ -0,0 +1,62 @@
+# Warhammer 40K
+#
+# Describes the 40k scoreboard, catalogues and text files for gameSystems
+
+from gameSystems import GameSystem
+
+# Layouts for various WidgetDataLoaders
+primary_objectives_layout = [
+    {"type": "text", "label": "Description", "jsonLocation": "description"},
+]
+secondary_objectives_layout = [
+    {"type": "text", "label": "Description", "jsonLocation": "description"},
+    {"type": "combo", "label": "Army Type", "jsonLocation": "armyType",
+     "itemsLocation": "40kFactions"},
+]
+faction_layout = [
+    {"type": "text", "label": "Description", "jsonLocation": "description"},
+]
+
+player_layout = [
+    {"type": "text", "label": "{Side} Player", "jsonLocation": "{side}.playerName"},
+    {"type": "combo", "label": "{Side} Army", "jsonLocation": "{side}.armyName",
+     "itemsLocation": "40kFactions"},
+    {"type": "integer", "label": "{Side} Command Points", "jsonLocation": "{side}.commandPoints", "resetValue": 0},
+    {"type": "combo", "label": "Secondary 1",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].secondaryName0",
+     "itemsLocation": "40kSecondaryObjectives", "resetValue": "------", "armyFilter": "armyType"},
+    {"type": "combo", "label": "Secondary 2",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].secondaryName1",
+     "itemsLocation": "40kSecondaryObjectives", "resetValue": "------", "armyFilter": "armyType"},
+    {"type": "combo", "label": "Secondary 3",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].secondaryName2",
+     "itemsLocation": "40kSecondaryObjectives", "resetValue": "------", "armyFilter": "armyType"},
+]
+
+round_layout = [
+    {"type": "integer", "label": "Round {roundNum} Primary",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].primaryScore", "resetValue": 0},
+    {"type": "integer", "label": "Round {roundNum} Secondary 1",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].secondaryScore0", "resetValue": 0},
+    {"type": "integer", "label": "Round {roundNum} Secondary 2",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].secondaryScore1", "resetValue": 0},
+    {"type": "integer", "label": "Round {roundNum} Secondary 3",
+     "jsonLocation": "{side}.40kRoundScores[{roundIndex}].secondaryScore2", "resetValue": 0},
+]
+
+game_system = GameSystem(
+    data_type="40k",
+    name="Warhammer 40K",
+    catalogues=[
+        {"title": "40K Primary Objectives Editor", "tabTitle": "40K Primary Objectives",
+         "jsonLocation": "40kPrimaryObjectives", "layout": primary_objectives_layout},
+        {"title": "40K Secondary Objectives Editor", "tabTitle": "40K Secondary Objectives",
+         "jsonLocation": "40kSecondaryObjectives", "layout": secondary_objectives_layout},
+        {"title": "40K Factions Editor", "tabTitle": "40K Factions Editor",
+         "jsonLocation": "40kFactions", "layout": faction_layout},
+    ],
+    player_layout=player_layout,
+    round_layout=round_layout,
+    rounds_key="40kRoundScores",
+    round_score_fields=["primaryScore", "secondaryScore0", "secondaryScore1", "secondaryScore2"],
+)
@@ -0,0 +1,62 @@
+# Age of Sigmar
+#
+# Describes the AoS scoreboard, catalogues and text files for gameSystems
+
+from gameSystems import GameSystem
+
+# Layouts for various WidgetDataLoaders
+faction_layout = []
+grand_strategy_layout = [
+    {"type": "text", "label": "Description", "jsonLocation": "description"},
+    {"type": "integer", "label": "Point Value", "jsonLocation": "pointValue"},
+    {"type": "combo", "label": "Army Type", "jsonLocation": "armyType",
+     "itemsLocation": "sigmarFactions"},
+]
+battle_trait_layout = [
+    {"type": "text", "label": "Battle Trait Description", "jsonLocation": "description"},
+    {"type": "integer", "label": "Point Value", "jsonLocation": "pointValue"},
+    {"type": "combo", "label": "Army Type", "jsonLocation": "armyType",
+     "itemsLocation": "sigmarFactions"},
+]
+
+player_layout = [
+    {"type": "text", "label": "{Side} Player", "jsonLocation": "{side}.playerName"},
+    {"type": "combo", "label": "{Side} Army", "jsonLocation": "{side}.armyName",
+     "itemsLocation": "sigmarFactions"},
+    {"type": "integer", "label": "{Side} Command Points", "jsonLocation": "{side}.commandPoints", "resetValue": 0},
+    {"type": "combo", "label": "{Side} Grand Strategy", "jsonLocation": "{side}.grandStrategyName",
+     "itemsLocation": "sigmarGrandStrategies", "armyFilter": "armyType"},
+    {"type": "integer", "label": "Grand Strategy Score", "jsonLocation": "{side}.grandStrategyScore",
+     "resetValue": 0},
+]
+
+round_layout = [
+    {"type": "integer", "label": "Round {roundNum} Primary",
+     "jsonLocation": "{side}.aosRoundScores[{roundIndex}].primaryScore", "resetValue": 0},
+    {"type": "integer", "label": "Round {roundNum} Secondary",
+     "jsonLocation": "{side}.aosRoundScores[{roundIndex}].secondaryScore", "resetValue": 0},
+    {"type": "combo", "label": "Round {roundNum} Secondary",
+     "jsonLocation": "{side}.aosRoundScores[{roundIndex}].secondaryName", "itemsLocation": "sigmarBattleTraits",
+     "resetValue": "------", "armyFilter": "armyType"},
+    {"type": "integer", "label": "Round {roundNum} Bonus",
+     "jsonLocation": "{side}.aosRoundScores[{roundIndex}].bonusScore", "resetValue": 0},
+]
+
+game_system = GameSystem(
+    data_type="sigmar",
+    name="Age of Sigmar",
+    catalogues=[
+        {"title": "Grand Strategies", "tabTitle": "Sigmar Grand Strategies",
+         "jsonLocation": "sigmarGrandStrategies", "layout": grand_strategy_layout},
+        {"title": "Battle Traits", "tabTitle": "Sigmar Battle Traits",
+         "jsonLocation": "sigmarBattleTraits", "layout": battle_trait_layout},
+        {"title": "Factions", "tabTitle": "Sigmar Factions Editor",
+         "jsonLocation": "sigmarFactions", "layout": faction_layout},
+    ],
+    player_layout=player_layout,
+    round_layout=round_layout,
+    rounds_key="aosRoundScores",
+    round_score_fields=["primaryScore", "secondaryScore", "bonusScore"],
+    extra_score_fields=["grandStrategyScore"],
+    player_text_exports=[("GrandStrategy", "grandStrategyName")],
+)
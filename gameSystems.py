@@ -0,0 +1,122 @@
+import importlib
+
+from jsonPath import compile_json_path
+from layoutTemplate import LayoutTemplate
+from scoreTotals import TOTAL_FIELD
+
+# Fields filled in in the layouts of a player and of a round
+PLAYER_FIELDS = ["side", "Side"]
+ROUND_FIELDS = PLAYER_FIELDS + ["roundNum", "roundIndex"]
+
+# Modules describing each game system by dataType. A module is only imported
+# when a file of its type is opened, and holds a GameSystem called game_system.
+GAME_SYSTEM_MODULES = {
+    "40k": "game40k",
+    "sigmar": "gameSigmar",
+}
+
+# The two players, as used in json locations and in labels
+SIDES = [("left", "Left"), ("right", "Right")]
+
+_loaded = {}
+
+
+# Everything that differs between game systems, as data. The scoreboard
+# widgets, catalogue editors and text files are all built from it.
+#
+# catalogues are the lists edited in their own tabs
+# Example:
+# [
+#     {
+#         'title': <editor title>,
+#         'tabTitle': <tab title>,
+#         'jsonLocation': <where the list lives>,
+#         'layout': <fields of an item, see create_json_widgets>,
+#     }
+# ]
+#
+# player_layout and round_layout are create_json_widgets layouts for one
+# player. '{side}' in a string becomes left or right and '{Side}' becomes
+# Left or Right. Round layouts also fill in '{roundNum}' and '{roundIndex}'.
+# They are compiled into LayoutTemplates once, when the game system is made.
+# A combo with 'armyFilter': <field> only shows items whose field matches
+# the player's army.
+#
+# Scores are the round_score_fields of each round in
+# <side>.<rounds_key>, plus the extra_score_fields of the player. ScoreTotals
+# keeps them added up.
+# player_text_exports adds text files, as (<file name>, <player field>).
+class GameSystem:
+    def __init__(self, data_type: str, name: str, catalogues: list, player_layout: list, round_layout: list,
+                 rounds_key: str, round_score_fields: list, extra_score_fields: list = None,
+                 player_text_exports: list = None, round_count: int = 5):
+        self.dataType = data_type
+        self.name = name
+        self.catalogues = catalogues
+        self.playerLayout = player_layout
+        self.roundLayout = round_layout
+        self.roundsKey = rounds_key
+        self.roundScoreFields = round_score_fields
+        self.extraScoreFields = extra_score_fields or []
+        self.playerTextExports = player_text_exports or []
+        self.roundCount = round_count
+        self.textExports = self.build_text_exports()
+        self.playerTemplate = LayoutTemplate(player_layout, PLAYER_FIELDS)
+        self.roundTemplate = LayoutTemplate(round_layout, ROUND_FIELDS)
+
+    # The main column layout of one player
+    def player_layout(self, side: str, label: str):
+        return self.playerTemplate.instantiate(side=side, Side=label)
+
+    # The layout of one player's round, round_index counts from 0
+    def round_layout(self, side: str, label: str, round_index: int):
+        return self.roundTemplate.instantiate(side=side, Side=label, roundNum=round_index + 1,
+                                              roundIndex=round_index)
+
+    def rounds_location(self, side: str):
+        return side + "." + self.roundsKey
+
+    # Text files for OBS
+    def build_text_exports(self):
+        exports = [
+            {"file": "RoundNumber.txt", "jsonLocation": "roundNum"},
+            {"file": "RoundOrder.txt", "jsonLocation": "roundOrder"},
+        ]
+        for side, label in SIDES:
+            player_exports = [("PlayerName", "playerName"), ("ArmyName", "armyName"),
+                              ("PlayerStatus", "playerStatus"), ("CommandPoints", "commandPoints")]
+            for file_name, field in player_exports + self.playerTextExports:
+                exports.append({"file": label + file_name + ".txt", "jsonLocation": side + "." + field})
+            # Kept up to date by ScoreTotals
+            exports.append({"file": label + "TotalScore.txt", "jsonLocation": side + "." + TOTAL_FIELD})
+        return exports
+
+
+# Lets another module add a game system, such as one for a new game
+def register_game_system(data_type: str, module_name: str):
+    GAME_SYSTEM_MODULES[data_type] = module_name
+    _loaded.pop(data_type, None)
+
+
+# The game system for a dataType, importing its module the first time.
+# None when there is no game system of that type.
+def game_system_for(data_type: str):
+    if data_type not in GAME_SYSTEM_MODULES:
+        return None
+    if data_type not in _loaded:
+        module = importlib.import_module(GAME_SYSTEM_MODULES[data_type])
+        _loaded[data_type] = module.game_system
+    return _loaded[data_type]
+
+
+# The top level keys holding the catalogues of every registered game system,
+# importing their modules. These are split out into their own files and
+# shared between tournament tables.
+def catalogue_keys():
+    keys = []
+    for data_type in GAME_SYSTEM_MODULES:
+        for catalogue in game_system_for(data_type).catalogues:
+            key = compile_json_path(catalogue["jsonLocation"]).root_key
+            if key not in keys:
+                keys.append(key)
+    return keys
@@ -1,20 +1,27 @@
 import sys
 
-import pydash
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, Signal
 from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QApplication
 
+from jsonPath import compile_json_path
+from scoreboard import INTEGER_MAX, INTEGER_MIN, write_json_value
+
 
 # Widget that will control integer values in a json blob.
 #
 # Can control the integer with a text box or buttons to increment and decrement.
 class IntegerWidget(QWidget):
-    def __init__(self, label: str, json_blob: dict, json_location: str, reset_value=None):
+    # Emitted after the widget writes a new value into the json
+    valueChanged = Signal()
+
+    def __init__(self, label: str, json_blob: dict, json_location: str, reset_value=None, file_manager=None):
         super().__init__()
         self.label = label
         self.jsonBlob = json_blob
         self.jsonLocation = json_location
+        self.jsonPath = compile_json_path(json_location)
+        self.fileManager = file_manager
         self.reset_value = reset_value
 
         layout = QHBoxLayout()
@@ -35,7 +42,7 @@ class IntegerWidget(QWidget):
         # The Text box with the integer
         self.textBox = QLineEdit("")
         self.textBox.textEdited.connect(self.text_changed)
-        validator = QIntValidator(0, 100, self)
+        validator = QIntValidator(INTEGER_MIN, INTEGER_MAX, self)
         self.textBox.setValidator(validator)
         layout.addWidget(self.textBox)
 
@@ -61,7 +68,7 @@ class IntegerWidget(QWidget):
             return
         else:
             self.setEnabled(True)
-        val = pydash.get(self.jsonBlob, self.jsonLocation)
+        val = self.jsonPath.get(self.jsonBlob)
 
         # No matter the dataType we get input, output as a string
         # We will error if it is not int or empty though
@@ -83,6 +90,19 @@ class IntegerWidget(QWidget):
         self.jsonBlob = json_data
         self.read_value()
 
+    # Show the value in the json again after something else changed it
+    def refresh(self):
+        self.read_value()
+
+    # Edit another location with the same widget, such as the next round's
+    # score
+    def rebind(self, json_location: str, label: str = None):
+        self.jsonLocation = json_location
+        self.jsonPath = compile_json_path(json_location)
+        if label is not None:
+            self.label.setText(label)
+        self.read_value()
+
     def change_value(self, add: int):
         # Convert to int. This will not catch exceptions
         # as we are relying on the TextLine validator
@@ -97,7 +117,8 @@ class IntegerWidget(QWidget):
         # as we are relying on the TextLine validator
         # truth is the text line value
         val = int(self.textBox.text())
-        pydash.set_(self.jsonBlob, self.jsonLocation, val)
+        write_json_value(self.jsonBlob, self.jsonLocation, val, self.fileManager)
+        self.valueChanged.emit()
 
     def reset_data(self):
         if self.reset_value is None:
@@ -139,7 +160,8 @@ class IntegerWidget(QWidget):
         else:
             val = 0
 
-        pydash.set_(self.jsonBlob, self.jsonLocation, val)
+        write_json_value(self.jsonBlob, self.jsonLocation, val, self.fileManager)
+        self.valueChanged.emit()
 
 
 if __name__ == "__main__":
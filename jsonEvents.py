@@ -0,0 +1,22 @@
+# Events on the global EventEmitter for changes to the json data.
+#
+# Every change that goes through the file manager is emitted as
+# change_event(<json location>) with the location, old value and new value,
+# so a widget can listen for just the paths it depends on:
+#
+#     ee.on(change_event("left.armyName"), on_army_changed)
+
+JSON_CHANGED_EVENT = "json_changed"
+
+
+def change_event(json_location: str):
+    return JSON_CHANGED_EVENT + ":" + json_location
+
+
+# File manager listener that passes changes on to the emitter. Writes that
+# leave a value as it was are not emitted.
+def emit_json_changes(ee, changes: list):
+    for json_location, old_value, new_value in changes:
+        if old_value == new_value and type(old_value) is type(new_value):
+            continue
+        ee.emit(change_event(json_location), json_location, old_value, new_value)
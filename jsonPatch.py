@@ -0,0 +1,153 @@
+import copy
+
+from jsonPath import compile_json_path, json_location
+
+
+# RFC 6901 pointer for path tokens, the tokens of
+# 'left.40kRoundScores[3].primaryScore' give '/left/40kRoundScores/3/primaryScore'
+def json_pointer(tokens):
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+# RFC 6902 patch for changes from the file manager, made after the changes
+# were applied to json_data. Each change is (json_location, old_value,
+# new_value).
+#
+# A value that was there before is replaced where it is. A new value may have
+# created the lists and dicts on its way, so the top level key it lives under
+# is added whole.
+def changes_to_patch(json_data: dict, changes: list):
+    patch = []
+    for json_location, old_value, new_value in changes:
+        json_path = compile_json_path(json_location)
+        if old_value is not None:
+            patch.append({"op": "replace", "path": json_pointer(json_path.tokens),
+                          "value": copy.deepcopy(new_value)})
+            continue
+        patch.append({"op": "add", "path": json_pointer([json_path.root_key]),
+                      "value": copy.deepcopy(json_data.get(json_path.root_key))})
+    return patch
+
+
+# Changes that turn old_data into new_data, as (json_location, old_value,
+# new_value) like the file manager's, at the deepest locations that changed.
+# A dict that gained or lost keys or a list that changed length changes as a
+# whole. A top level key that was removed has a new value of None.
+def json_diff(old_data: dict, new_data: dict):
+    changes = []
+    for key in list(old_data.keys()) + [key for key in new_data.keys() if key not in old_data]:
+        _diff_value(old_data.get(key), new_data.get(key), [key], changes)
+    return changes
+
+
+def _diff_value(old_value, new_value, tokens: list, changes: list):
+    if type(old_value) is type(new_value):
+        if isinstance(old_value, dict) and old_value.keys() == new_value.keys():
+            for key in old_value:
+                _diff_value(old_value[key], new_value[key], tokens + [key], changes)
+            return
+        if isinstance(old_value, list) and len(old_value) == len(new_value):
+            for index in range(len(old_value)):
+                _diff_value(old_value[index], new_value[index], tokens + [index], changes)
+            return
+        if old_value == new_value:
+            return
+    changes.append((json_location(tokens), old_value, new_value))
+
+
+class JsonPatchError(ValueError):
+    pass
+
+
+def parse_json_pointer(pointer: str):
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError("Bad json pointer " + repr(pointer))
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _pointer_parent(json_data, pointer: str):
+    tokens = parse_json_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Cannot change the whole document")
+    container = json_data
+    for token in tokens[:-1]:
+        container = _pointer_child(container, token, pointer)
+    return container, tokens[-1]
+
+
+def _list_index(container: list, token: str, pointer: str, allow_end: bool = False):
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit():
+        raise JsonPatchError("Bad list index in " + pointer)
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError("List index out of range in " + pointer)
+    return index
+
+
+def _pointer_child(container, token: str, pointer: str):
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError("Missing " + pointer)
+        return container[token]
+    if isinstance(container, list):
+        return container[_list_index(container, token, pointer)]
+    raise JsonPatchError("Cannot walk into " + pointer)
+
+
+def _get(json_data, pointer: str):
+    value = json_data
+    for token in parse_json_pointer(pointer):
+        value = _pointer_child(value, token, pointer)
+    return value
+
+
+def _add(json_data, pointer: str, value):
+    container, token = _pointer_parent(json_data, pointer)
+    if isinstance(container, dict):
+        container[token] = value
+    elif isinstance(container, list):
+        container.insert(_list_index(container, token, pointer, allow_end=True), value)
+    else:
+        raise JsonPatchError("Cannot add to " + pointer)
+
+
+def _remove(json_data, pointer: str):
+    container, token = _pointer_parent(json_data, pointer)
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError("Missing " + pointer)
+        return container.pop(token)
+    if isinstance(container, list):
+        return container.pop(_list_index(container, token, pointer))
+    raise JsonPatchError("Cannot remove from " + pointer)
+
+
+# Applies an RFC 6902 patch to json_data in place. Values are copied in, so
+# the patch can be applied again.
+def apply_patch(json_data: dict, patch: list):
+    for operation in patch:
+        op = operation.get("op")
+        pointer = operation.get("path")
+        if not isinstance(pointer, str):
+            raise JsonPatchError("Patch operation without a path")
+        if op == "add":
+            _add(json_data, pointer, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(json_data, pointer)
+        elif op == "replace":
+            _remove(json_data, pointer)
+            _add(json_data, pointer, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            _add(json_data, pointer, _remove(json_data, operation["from"]))
+        elif op == "copy":
+            _add(json_data, pointer, copy.deepcopy(_get(json_data, operation["from"])))
+        elif op == "test":
+            if _get(json_data, pointer) != operation["value"]:
+                raise JsonPatchError("Test failed for " + pointer)
+        else:
+            raise JsonPatchError("Unknown patch operation " + repr(op))
+    return json_data
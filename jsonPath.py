@@ -0,0 +1,135 @@
+import functools
+
+
+# Splits a path such as 'left.40kRoundScores[3].secondaryScore1' into
+# ['left', '40kRoundScores', 3, 'secondaryScore1']. Same rules as pydash,
+# '\.' escapes a dot in a key and only numbers in brackets are list indexes.
+def parse_json_path(json_location: str):
+    tokens = []
+    key = ""
+    i = 0
+    while i < len(json_location):
+        c = json_location[i]
+        if c == "\\" and i + 1 < len(json_location):
+            key += json_location[i + 1]
+            i += 2
+            continue
+        if c == ".":
+            tokens.append(key)
+            key = ""
+        elif c == "[":
+            end = json_location.find("]", i)
+            index = json_location[i + 1:end]
+            # only numbers in brackets are indexes, anything else is part of the key
+            if end < 0 or not index.lstrip("-").isdigit():
+                key += c
+                i += 1
+                continue
+            if key:
+                tokens.append(key)
+            tokens.append(int(index))
+            i = end + 1
+            # a dot straight after the brackets only separates
+            if i < len(json_location) and json_location[i] == ".":
+                i += 1
+            key = ""
+            continue
+        else:
+            key += c
+        i += 1
+    if key or not tokens:
+        tokens.append(key)
+    return tokens
+
+
+# The location for path tokens, the reverse of parse_json_path
+def json_location(tokens):
+    location = ""
+    for token in tokens:
+        if type(token) is int:
+            location += "[" + str(token) + "]"
+            continue
+        key = str(token).replace("\\", "\\\\").replace(".", "\\.").replace("[", "\\[")
+        location += ("." if location else "") + key
+    return location
+
+
+# A json location parsed once into tokens so reads and writes only walk the
+# data. Use compile_json_path to get one, they are cached by location.
+class JsonPath:
+    def __init__(self, json_location: str):
+        self.location = json_location
+        self.tokens = tuple(parse_json_path(json_location))
+        self.root_key = self.tokens[0]
+
+    def __repr__(self):
+        return "JsonPath(" + repr(self.location) + ")"
+
+    @staticmethod
+    def _child(container, token, default):
+        if isinstance(container, dict):
+            return container.get(token, default)
+        if isinstance(container, list):
+            if isinstance(token, str):
+                if not token.lstrip("-").isdigit():
+                    return default
+                token = int(token)
+            try:
+                return container[token]
+            except IndexError:
+                return default
+        return default
+
+    def get(self, json_blob, default=None):
+        value = json_blob
+        for token in self.tokens:
+            value = self._child(value, token, None)
+            if value is None:
+                return default
+        return value
+
+    # Sets the value, creating any missing lists and dicts on the way. A list
+    # is made when the next token is an index, and lists are padded with None
+    # to reach an index past their end.
+    def set(self, json_blob, value):
+        container = json_blob
+        last = len(self.tokens) - 1
+        for i, token in enumerate(self.tokens):
+            if isinstance(container, list):
+                token = self._list_index(container, token)
+            if i == last:
+                container[token] = value
+                return
+
+            child = self._child(container, token, None)
+            if not isinstance(child, (dict, list)):
+                if child is not None:
+                    raise TypeError("Cannot set " + self.location + ", " + repr(token) + " is not a list or dict")
+                child = [] if type(self.tokens[i + 1]) is int else {}
+                container[token] = child
+            container = child
+
+    @staticmethod
+    def _list_index(container: list, token):
+        if isinstance(token, str):
+            if not token.lstrip("-").isdigit():
+                raise TypeError("List index expected, got " + repr(token))
+            token = int(token)
+        if token >= len(container):
+            container.extend([None] * (token + 1 - len(container)))
+        return token
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_json_path(json_location: str):
+    return JsonPath(json_location)
+
+
+# Whether json_location is inner_location or holds it, "" holds everything.
+# Locations are compared by their tokens, so one written two ways, such as
+# with a bracket in a key escaped or not, still matches.
+def json_location_holds(json_location: str, inner_location: str):
+    if not json_location:
+        return True
+    tokens = compile_json_path(json_location).tokens
+    return compile_json_path(inner_location).tokens[:len(tokens)] == tokens
@@ -0,0 +1,91 @@
+import json
+import re
+
+# orjson is optional, it is a lot faster than the json module when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "json"
+ORJSON_BACKEND = "orjson"
+
+# Something in orjson's output that could be a float. orjson writes floats
+# differently from the json module, so these go through the json module
+_MAYBE_FLOAT = re.compile(rb"\d[.eE]")
+_NON_ASCII = re.compile("[\x7f-\U0010ffff]")
+
+
+def _escape_non_ascii(match):
+    code = ord(match.group())
+    if code < 0x10000:
+        return "\\u{0:04x}".format(code)
+    code -= 0x10000
+    return "\\u{0:04x}\\u{1:04x}".format(0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff))
+
+
+def backend_available(backend: str):
+    if backend == ORJSON_BACKEND:
+        return orjson is not None
+    return backend == JSON_BACKEND
+
+
+# Turns json data into text and back for the file manager.
+#
+# pretty output is what json.dumps(sort_keys=True, indent=4) gives, byte for
+# byte, whichever backend writes it, so files diff the same. Compact output
+# has no whitespace and is for files nobody edits by hand.
+#
+# The backend is orjson when it is installed, otherwise the json module.
+# Anything orjson can't write (numbers past 64 bits, keys that aren't
+# strings) is written by the json module. NaN and infinity aren't json and
+# orjson writes them as null.
+class JsonSerializer:
+    def __init__(self, backend: str = None, pretty: bool = True):
+        if backend is None or not backend_available(backend):
+            backend = ORJSON_BACKEND if orjson is not None else JSON_BACKEND
+        self.backend = backend
+        self.pretty = pretty
+
+    def loads(self, text):
+        if self.backend == ORJSON_BACKEND:
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                # The json module reads a few things orjson won't, like NaN
+                pass
+        return json.loads(text)
+
+    def dumps(self, value):
+        if self.backend == ORJSON_BACKEND:
+            try:
+                text = self.orjson_dumps(value)
+            except TypeError:
+                text = None
+            if text is not None:
+                return text
+        return self.json_dumps(value)
+
+    def json_dumps(self, value):
+        if self.pretty:
+            return json.dumps(value, sort_keys=True, indent=4)
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    # None when the json module has to write it to match
+    def orjson_dumps(self, value):
+        if not self.pretty:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+
+        data = orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        if _MAYBE_FLOAT.search(data):
+            return None
+
+        # Double the two space indent. Strings can't hold a new line, so
+        # every line starts with indentation only
+        lines = data.split(b"\n")
+        data = b"\n".join([b" " * (len(line) - len(line.lstrip(b" "))) + line for line in lines])
+
+        text = data.decode("utf-8")
+        if not data.isascii() or "\x7f" in text:
+            text = _NON_ASCII.sub(_escape_non_ascii, text)
+        return text
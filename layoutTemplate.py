@@ -0,0 +1,53 @@
+import re
+from types import MappingProxyType
+
+
+# A layout (see create_json_widgets) compiled once into a template for
+# making copies of it with '{<field>}' in its strings filled in, such as a
+# player's side or a round number. Only the fields named are filled in,
+# other text is left as it is.
+#
+# Each widget's values are split when the template is made into the ones
+# that never change and the strings with fields in them, which become format
+# strings with any other braces escaped. Making a copy is a dict copy and a
+# format_map per templated string rather than a deep copy and a walk of
+# every value. The template can't be changed after it is made, so
+# one is shared by everything built from it. Values that are lists or dicts
+# are shared by the copies.
+class LayoutTemplate:
+    def __init__(self, layout: list, fields: list):
+        self.fields = tuple(fields)
+        pattern = re.compile("{(" + "|".join(re.escape(field) for field in self.fields) + ")}")
+        entries = []
+        for widget_data in layout:
+            fixed = {}
+            templated = []
+            for key, value in widget_data.items():
+                # Split gives the text between fields with the field names
+                # at the odd indexes
+                parts = pattern.split(value) if type(value) is str and self.fields else [value]
+                if len(parts) == 1:
+                    fixed[key] = value
+                    continue
+                text = "".join(["{" + part + "}" if i % 2 else part.replace("{", "{{").replace("}", "}}")
+                                for i, part in enumerate(parts)])
+                templated.append((key, text))
+            entries.append((MappingProxyType(fixed), tuple(templated)))
+        self.entries = tuple(entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # A new layout with the fields filled in, every field has to be given
+    def instantiate(self, **values):
+        missing = [field for field in self.fields if field not in values]
+        if missing:
+            raise KeyError("No value for " + ", ".join(missing))
+
+        layout = []
+        for fixed, templated in self.entries:
+            widget_data = dict(fixed)
+            for key, text in templated:
+                widget_data[key] = text.format_map(values)
+            layout.append(widget_data)
+        return layout
@@ -2,6 +2,8 @@ import sys
 
 import pydash
 import widgetHelpers
+from catalogueIndex import find_catalogue_index
+from catalogueListModel import find_catalogue_model
 from PySide6.QtCore import Slot, Qt
 from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QApplication, \
     QSizePolicy, QFrame, QMessageBox, QScrollArea
@@ -17,14 +19,16 @@ class ListObjectEditorWidget(QWidget):
     edit_widgets = []
     message_box = None
     active_object = None
+    file_manager = None
 
-    def __init__(self, title: str, edit_data: dict, data_location: str, editor_layout: list):
+    def __init__(self, title: str, edit_data: dict, data_location: str, editor_layout: list, file_manager=None):
         super().__init__()
 
         self.item_lines = []
         self.edit_widgets = []
         self.message_box = None
         self.active_object = None
+        self.file_manager = file_manager
 
         # Left box with list of all objects to edit
         self.left_widget = QWidget()
@@ -83,6 +87,8 @@ class ListObjectEditorWidget(QWidget):
         }
         editor_layout.insert(0, name_widget_data)
         widgetHelpers.create_json_widgets(self.right_layout, self.data, editor_layout, self.edit_widgets)
+        for w in self.edit_widgets:
+            w.valueChanged.connect(self.object_edited)
 
         self.populate_editor_data()
 
@@ -96,6 +102,34 @@ class ListObjectEditorWidget(QWidget):
         self.data[self.data_location].append(new_object)
         self.add_data_line(new_object)
         self.set_edit_object(new_object)
+        index = find_catalogue_index(self.data[self.data_location])
+        if not isinstance(index, type(None)):
+            index.add(new_object)
+        self.reload_model()
+        self.mark_dirty()
+
+    # The edit widgets write straight into the objects in our list, so
+    # let the file manager know the document changed
+    def mark_dirty(self):
+        if not isinstance(self.file_manager, type(None)):
+            self.file_manager.mark_dirty(self.data_location)
+
+    # Combo boxes showing the catalogue through its shared model start over
+    # after we add or delete, we don't track rows
+    def reload_model(self):
+        model = find_catalogue_model(self.data, self.data_location)
+        if not isinstance(model, type(None)):
+            model.reload()
+
+    @Slot()
+    def object_edited(self):
+        index = find_catalogue_index(self.data[self.data_location])
+        if not isinstance(index, type(None)) and not isinstance(self.active_object, type(None)):
+            index.update(self.active_object)
+        model = find_catalogue_model(self.data, self.data_location)
+        if not isinstance(model, type(None)) and not isinstance(self.active_object, type(None)):
+            model.object_changed(self.active_object)
+        self.mark_dirty()
 
     def set_edit_object(self, object_data):
         self.active_object = object_data
@@ -165,7 +199,13 @@ class ListObjectEditorWidget(QWidget):
         self.left_layout.removeWidget(arg)
         self.item_lines.remove(arg)
         arg.hide()
-        pydash.remove(self.data[self.data_location], lambda x: x['name'] == arg.object_data['name'])
+        removed = pydash.remove(self.data[self.data_location], lambda x: x['name'] == arg.object_data['name'])
+        index = find_catalogue_index(self.data[self.data_location])
+        if not isinstance(index, type(None)):
+            for item in removed:
+                index.remove(item)
+        self.reload_model()
+        self.mark_dirty()
 
 
 if __name__ == "__main__":
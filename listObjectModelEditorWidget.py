@@ -0,0 +1,198 @@
+import sys
+
+import widgetHelpers
+from catalogueListModel import catalogue_model
+from PySide6.QtCore import Slot, Qt
+from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QApplication, \
+    QMessageBox, QListView, QAbstractItemView, QMenu
+
+
+# Widget that displays a list of objects to be edited, like
+# ListObjectEditorWidget but with a list view over a CatalogueListModel.
+#
+# The view only draws the rows that are on screen, so a catalogue of a few
+# hundred objects costs the same as a short one. Edit and delete are in the
+# row's context menu and the buttons under the list. The model is the
+# catalogue's shared one, so combo boxes picking from it follow our edits.
+class ListObjectModelEditorWidget(QWidget):
+    edit_widgets = []
+    message_box = None
+    active_object = None
+    file_manager = None
+
+    def __init__(self, title: str, edit_data: dict, data_location: str, editor_layout: list, file_manager=None):
+        super().__init__()
+
+        self.edit_widgets = []
+        self.message_box = None
+        self.active_object = None
+        self.file_manager = file_manager
+
+        # Initialize data
+        self.data = edit_data
+        self.data_location = data_location
+        self.model = catalogue_model(self.data, self.data_location)
+
+        # Left box with list of all objects to edit
+        self.left_widget = QWidget()
+        self.left_layout = QVBoxLayout()
+        self.left_widget.setLayout(self.left_layout)
+        self.left_widget.setMinimumSize(350, 200)
+
+        self.data_list_label = QLabel(title)
+        self.data_list_label.setAlignment(Qt.AlignHCenter)
+        self.left_layout.addWidget(self.data_list_label)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list_view.activated.connect(self.edit_index)
+        self.list_view.clicked.connect(self.edit_index)
+        self.list_view.customContextMenuRequested.connect(self.show_context_menu)
+        self.left_layout.addWidget(self.list_view)
+
+        button_layout = QHBoxLayout()
+        self.add_object_button = QPushButton("Add Item")
+        self.add_object_button.clicked.connect(self.add_object)
+        button_layout.addWidget(self.add_object_button)
+        self.delete_object_button = QPushButton("Delete")
+        self.delete_object_button.clicked.connect(self.delete_current)
+        button_layout.addWidget(self.delete_object_button)
+        self.left_layout.addLayout(button_layout)
+
+        # Right box that contains all the fields to edit in an object instance
+        self.right_widget = QWidget()
+        self.right_layout = QVBoxLayout()
+        self.right_layout.setAlignment(Qt.AlignTop)
+        self.right_widget.setLayout(self.right_layout)
+
+        self.editor_label = (QLabel("Data Editor"))
+        self.editor_label.setAlignment(Qt.AlignHCenter)
+        self.right_layout.addWidget(self.editor_label)
+
+        # Main Layout
+        self.layout = QHBoxLayout()
+        self.setLayout(self.layout)
+
+        self.layout.addWidget(self.left_widget)
+        self.layout.addWidget(self.right_widget)
+
+        # Add widgets for the edit pane
+        name_widget_data = {
+            'type': 'text',
+            'label': 'Object Name',
+            'jsonLocation': 'name'
+        }
+        editor_layout = [name_widget_data] + editor_layout
+        widgetHelpers.create_json_widgets(self.right_layout, self.data, editor_layout, self.edit_widgets)
+        for w in self.edit_widgets:
+            w.valueChanged.connect(self.object_edited)
+        self.set_edit_object(None)
+
+    # The edit widgets write straight into the objects in our list, so
+    # let the file manager know the document changed
+    def mark_dirty(self):
+        if not isinstance(self.file_manager, type(None)):
+            self.file_manager.mark_dirty(self.data_location)
+
+    def set_edit_object(self, object_data):
+        self.active_object = object_data
+        for w in self.edit_widgets:
+            w.set_data(self.active_object)
+
+    @Slot()
+    def add_object(self):
+        new_object = {'name': 'New Object'}
+        row = self.model.append_object(new_object)
+        self.list_view.setCurrentIndex(self.model.index(row))
+        self.set_edit_object(new_object)
+        self.mark_dirty()
+
+    @Slot()
+    def object_edited(self):
+        self.model.object_changed(self.active_object)
+        self.mark_dirty()
+
+    @Slot()
+    def edit_index(self, model_index):
+        self.set_edit_object(self.model.object_at(model_index.row()))
+
+    @Slot()
+    def show_context_menu(self, position):
+        model_index = self.list_view.indexAt(position)
+        if not model_index.isValid():
+            return
+
+        menu = QMenu(self)
+        edit_action = QAction("Edit", menu)
+        edit_action.triggered.connect(lambda: self.edit_index(model_index))
+        menu.addAction(edit_action)
+        delete_action = QAction("Delete", menu)
+        delete_action.triggered.connect(lambda: self.delete_row(model_index.row()))
+        menu.addAction(delete_action)
+        menu.exec(self.list_view.viewport().mapToGlobal(position))
+
+    @Slot()
+    def delete_current(self):
+        model_index = self.list_view.currentIndex()
+        if model_index.isValid():
+            self.delete_row(model_index.row())
+
+    def delete_row(self, row: int):
+        object_data = self.model.object_at(row)
+        if isinstance(object_data, type(None)):
+            return
+
+        msg_box = QMessageBox()
+        msg_box.setText("Are you sure you would like to delete " + object_data['name'] + "?")
+        msg_box.setInformativeText("This cannot be undone")
+        msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        msg_box.setDefaultButton(QMessageBox.No)
+
+        self.message_box = msg_box
+        ret = msg_box.exec()
+        self.message_box = None
+
+        if ret == QMessageBox.Yes:
+            self.confirm_delete(row)
+
+    def confirm_delete(self, row: int):
+        object_data = self.model.remove_row(row)
+        if object_data is self.active_object:
+            self.set_edit_object(None)
+        self.mark_dirty()
+
+
+if __name__ == "__main__":
+    # QT application
+    app = QApplication(sys.argv)
+
+    # test json data
+    test_data = {"index": [{'name': 'Item ' + str(i), 'textValue': 'text ' + str(i), 'intValue': i}
+                           for i in range(500)]}
+
+    # layout for editor pane
+    test_editor_layout = [
+        {
+            'type': 'text',
+            'label': 'text widget',
+            'jsonLocation': 'textValue'
+        },
+        {
+            'type': 'integer',
+            'label': 'integer widget',
+            'jsonLocation': 'intValue'
+        }
+    ]
+
+    # Widget
+    window = ListObjectModelEditorWidget("editor", test_data, "index", test_editor_layout)
+
+    window.resize(800, 600)
+    window.show()
+
+    sys.exit(app.exec())
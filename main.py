@@ -5,9 +5,12 @@
 # external source rather than having to update each text box in OBS which is not
 # super user friendly.
 
+import contextlib
+import functools
 import sys
+from os import path
 
-from PySide6.QtCore import Slot, SIGNAL, QTimer, QSettings, QSize, QPoint
+from PySide6.QtCore import QSettings, QSize, QPoint, Slot
 from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QLabel, \
     QPushButton, QGridLayout
@@ -15,88 +18,296 @@ import pydash
 from pymitter import EventEmitter
 
 import widgetHelpers
-from fileManager import FileManager
+from commandServer import CommandServer, send_commands
+from fileManager import FileManager, catalogue_layout
+from fileWatcher import FileWatcher
+from gameSystems import catalogue_keys, game_system_for
+from jsonEvents import emit_json_changes
+from jsonSerializer import JsonSerializer
 from loadFileWidget import LoadFileWidget
-from aosWidgets import setup_sigmar_windows
-from widgets40k import setup_40k_windows
+from playerDetailsWidget import PlayerDetailsWidget, setup_game_windows
+from pushServer import PushServer
+from saveScheduler import SaveScheduler
+from scoreCommands import CommandError, check_commands, parse_command
+from scoreboard import Scoreboard
+from textFileExporter import TextFileExporter
+from undoStack import UNDO_DEPTH
+from writeBehindWriter import WriteBehindWriter
 
-# Global emitter
-ee = EventEmitter()
+# Seconds a change to the scoreboard waits for more changes before it is written
+SCOREBOARD_WRITE_WINDOW = 0.05
+
+
+# One scoreboard: its file, the widgets editing it and the text files and
+# overlays following it. At an event each streamed table is one of these.
+#
+# Tables share the window's writer, so one save scheduler saves them all.
+# shared_keys (see FileManager) lets a table use another table's catalogues
+# rather than loading its own copy. The widgets are only built the first
+# time the table is shown.
+class ScoreTable:
+    def __init__(self, control, name: str, writer, shared_keys: dict = None, push_server_port: int = 0):
+        self.control = control
+        self.name = name
+        self.ee = EventEmitter()
+        self.game_system = None
+        self.scoreboard = None
+        self.text_exporter = None
+        self.push_server = None
+        self.built = False
+
+        # Load the file data and get it ready to send along. The catalogues
+        # are kept in their own files so score changes only rewrite the small
+        # scoreboard file
+        self.fileManager = FileManager("", catalogue_layout(catalogue_keys()), SCOREBOARD_WRITE_WINDOW,
+                                       control.journal, JsonSerializer(pretty=control.pretty_json), writer, shared_keys)
+        # Changes are passed on to the emitter so widgets can follow the
+        # json locations they depend on
+        self.fileManager.add_listener(functools.partial(emit_json_changes, self.ee))
+        self.json_data = self.fileManager.get_json_data()
+
+        # Edits other tools make to the files while they are open are
+        # brought in rather than written over
+        self.file_watcher = FileWatcher(self.fileManager, parent=control)
+        self.file_watcher.conflicted.connect(self.reload_conflicted)
+
+        self.score_details = ScoreDetailsWidget(self.ee)
+
+        # Overlays can follow the scoreboard over a local event stream when
+        # the PushServer/port setting is set, the operator has to know when
+        # they can't
+        if push_server_port > 0:
+            self.push_server = PushServer(self.fileManager, push_server_port, parent=control)
+            if not self.push_server.start():
+                control.statusBar().showMessage(self.name + ": push server could not listen on port " +
+                                                str(push_server_port))
+
+    def load(self, file_path: str):
+        self.fileManager.set_file_path(file_path)
+        self.json_data = self.fileManager.get_json_data()
+        self.file_watcher.watch()
+        if not self.fileManager.is_valid():
+            return False
+
+        # Totals and text files follow the scoreboard whether or not it is shown
+        self.game_system = game_system_for(self.json_data.get('dataType'))
+        if isinstance(self.score_details.body_widget, PlayerDetailsWidget):
+            self.score_details.body_widget.stop()
+        if isinstance(self.scoreboard, Scoreboard):
+            self.scoreboard.stop()
+        self.scoreboard = None
+        text_exports = []
+        if self.game_system is not None:
+            self.scoreboard = Scoreboard(self.fileManager, self.game_system)
+            text_exports = self.game_system.textExports
+        self.setup_text_exporter(text_exports)
+        self.built = False
+        if isinstance(self.push_server, PushServer):
+            self.push_server.send_snapshot()
+        return True
+
+    # with a valid file manager figure out which screens to load
+    def setup_windows(self, tab_widget, catalogue_tabs: bool = True):
+        if self.built or not self.fileManager.is_valid():
+            return
+        self.built = True
+        if self.scoreboard is not None:
+            setup_game_windows(self.scoreboard, tab_widget, self.score_details, self.ee, self.control.undo_depth,
+                               catalogue_tabs, self.control.single_round_editor, self.control.follow_round)
+        self.ee.emit("json_loaded", self.json_data)
+
+    # Text files for OBS go in the configured folder, or a text folder next to the json file.
+    # Tables at an event each get a folder named after their file in there.
+    def setup_text_exporter(self, text_exports: list):
+        if isinstance(self.text_exporter, TextFileExporter):
+            self.text_exporter.shutdown()
+        file_path = path.abspath(self.fileManager.get_file_path())
+        export_directory = self.control.text_export_directory
+        if not export_directory:
+            export_directory = path.join(path.dirname(file_path), "text")
+        if self.control.tournament_tables:
+            export_directory = path.join(export_directory, path.splitext(path.basename(file_path))[0])
+        self.text_exporter = TextFileExporter(self.fileManager, export_directory, text_exports)
+
+    # Changes made by commands, shown in the widgets if they are built
+    def show_changes(self, changes: list):
+        if isinstance(self.score_details.body_widget, PlayerDetailsWidget):
+            self.score_details.body_widget.show_changes(changes)
+
+    # Shown in the status bar until the next message, the operator has to
+    # know their edit won over another tool's
+    def reload_conflicted(self, file_path: str, json_locations: list):
+        message = self.name + ": kept our changes to " + ", ".join(json_locations) + " over the ones in " + \
+            file_path + ", its copy is in " + path.splitext(file_path)[0] + ".conflict.json"
+        self.control.statusBar().showMessage(message)
+
+    def shutdown(self):
+        self.file_watcher.stop()
+        self.fileManager.compact_journals()
+        if isinstance(self.text_exporter, TextFileExporter):
+            self.text_exporter.shutdown()
+        if isinstance(self.push_server, PushServer):
+            self.push_server.stop()
 
 
 # The guts of the score control. This class will deal with the main state of the
 # system.
 #
+# Normally there is one table, picked with the file loader. With the
+# Tournament/tables setting set to a list of json files every one of them is
+# a table in its own tab, sharing the first table's catalogues.
 class ScoreControl(QMainWindow):
-    fileManager = None
-    json_data = None
-    score_details = None
-    sigmar_battle_traits = None
-    sigmar_grand_strategies = None
+    writer = None
+    save_scheduler = None
+    command_server = None
+    tables = []
+    text_export_directory = ""
+    push_server_port = 0
+    journal = False
+    pretty_json = True
+    undo_depth = UNDO_DEPTH
+    single_round_editor = False
+    follow_round = False
+    tournament_tables = []
 
     # noinspection PyTypeChecker
     def __init__(self):
         QMainWindow.__init__(self)
         self.setWindowTitle("Score Control")
+        self.tables = []
 
         # Setup the window based on saved settings. Load any other
         # settings needed to start such as file locations
         self.read_settings()
 
-        # Try to load a file now. Based on how it loads is what we'll do
-        # with the widget later
-        self.initialize_file_manager()
+        # Saves are started by the changes, a write window after the first
+        # one. Every table's files go through the one writer.
+        self.writer = WriteBehindWriter(SCOREBOARD_WRITE_WINDOW)
+        self.save_scheduler = SaveScheduler(self.writer, parent=self)
 
         # Make the tabs Here
         self.tab_widget = QTabWidget()
+        self.tab_widget.currentChanged.connect(self.tab_shown)
 
-        # Score Details Widget
-        # If we have a valid file, load widget otherwise show file loader
-        self.score_details = ScoreDetailsWidget(ee)
-        if self.fileManager.is_valid():
-            self.setup_windows()
+        if self.tournament_tables:
+            self.setup_tournament()
         else:
+            # Score Details Widget
+            # If we have a valid file, load widget otherwise show file loader
+            table = self.add_table("Score Control")
             load_widget = LoadFileWidget("Load File", self.file_selected)
-            self.score_details.set_body_widget(load_widget)
-        self.tab_widget.addTab(self.score_details, "Score Control")
+            table.score_details.set_body_widget(load_widget)
 
         # Put the tabs into the center widget
         self.setCentralWidget(self.tab_widget)
 
-        # begin auto save
-        self.timer = QTimer(self)
-        self.connect(self.timer, SIGNAL("timeout()"), self.auto_save)
-        self.timer.start(1000)
+        # Stream decks, scripts and later launches send commands here
+        self.command_server = CommandServer(self.run_commands, parent=self)
+        if not self.command_server.start():
+            print("Command server could not listen on " + self.command_server.name)
+
+    def add_table(self, name: str, shared_keys: dict = None):
+        port = 0
+        if self.push_server_port > 0:
+            port = self.push_server_port + len(self.tables)
+        table = ScoreTable(self, name, self.writer, shared_keys, port)
+        self.tables.append(table)
+        self.tab_widget.addTab(table.score_details, name)
+        return table
+
+    # A table for each file, the first one's catalogues are used by all of them
+    def setup_tournament(self):
+        owner = None
+        for index, file_path in enumerate(self.tournament_tables):
+            shared_keys = None
+            if owner is not None:
+                shared_keys = {key: owner.fileManager for key in catalogue_keys()}
+            table = self.add_table("Table " + str(index + 1), shared_keys)
+            if not table.load(file_path):
+                table.score_details.set_body_widget(QLabel("Could not load " + file_path))
+            elif owner is None:
+                owner = table
+
+        # The catalogue tabs come after the tables
+        if owner is not None:
+            owner.setup_windows(self.tab_widget)
+
+    # Tables sharing catalogues are built when first shown, the catalogue
+    # tabs are already there from the table they come from
+    @Slot(int)
+    def tab_shown(self, index: int):
+        for table in self.tables:
+            if self.tab_widget.widget(index) is table.score_details:
+                table.setup_windows(self.tab_widget, catalogue_tabs=False)
+
+    # Commands from the command server, see scoreCommands. 'table <number>'
+    # sends the commands after it to that table, the first by default, and
+    # 'show' brings the window to the front. Every table's commands are checked
+    # before any run, then run in one transaction, if any of them fails none
+    # of them happen.
+    def run_commands(self, lines: list):
+        table_commands = {}
+        table = self.tables[0]
+        try:
+            for line in lines:
+                tokens = parse_command(line)
+                if not tokens:
+                    continue
+                if tokens[0] == "show":
+                    self.show_window()
+                elif tokens[0] == "table":
+                    table = self.table_for(tokens)
+                elif table.scoreboard is None:
+                    raise CommandError(table.name + " has no scoreboard loaded")
+                else:
+                    table_commands.setdefault(table, []).append(tokens)
 
-    # When the window is closed, save out its settings
+            table_commands = {table: check_commands(table.scoreboard, commands)
+                              for table, commands in table_commands.items()}
+            with contextlib.ExitStack() as stack:
+                table_changes = {table: stack.enter_context(table.fileManager.transaction())
+                                 for table in table_commands}
+                for commands in table_commands.values():
+                    for command in commands:
+                        command()
+
+            for table, changes in table_changes.items():
+                table.show_changes(changes)
+        except CommandError as e:
+            return "error: " + str(e)
+        return "ok"
+
+    def table_for(self, tokens: list):
+        if len(tokens) != 2 or not tokens[1].isdigit() or not 1 <= int(tokens[1]) <= len(self.tables):
+            raise CommandError("table takes a number from 1 to " + str(len(self.tables)))
+        return self.tables[int(tokens[1]) - 1]
+
+    def show_window(self):
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    # When the window is closed, save out its settings and anything
+    # still waiting on its save interval
     def closeEvent(self, event: QCloseEvent) -> None:
         self.write_settings()
+        if isinstance(self.command_server, CommandServer):
+            self.command_server.stop()
+        if isinstance(self.save_scheduler, SaveScheduler):
+            self.save_scheduler.stop()
+        for table in self.tables:
+            table.shutdown()
+        if isinstance(self.writer, WriteBehindWriter):
+            self.writer.flush(force=True)
         event.accept()
 
-    # with a valid file manager figure out which screens to load
-    def setup_windows(self):
-        if self.json_data['dataType'] == 'sigmar':
-            setup_sigmar_windows(self.json_data, self.tab_widget, self.score_details, ee)
-        elif self.json_data['dataType'] == '40k':
-            setup_40k_windows(self.json_data, self.tab_widget, self.score_details, ee)
-        ee.emit("json_loaded", self.json_data)
-
     def file_selected(self, filename: str):
-        self.fileManager.set_file_path(filename)
+        table = self.tables[0]
         # If we have a valid file, load default widget
-        if self.fileManager.is_valid():
-            self.json_data = self.fileManager.get_json_data()
-            self.setup_windows()
-
-    @Slot()
-    def auto_save(self):
-        if isinstance(self.fileManager, FileManager):
-            self.fileManager.write_file()
-
-    def initialize_file_manager(self):
-        # Load the file data and get it ready to send along
-        self.fileManager = FileManager("")
-        self.json_data = self.fileManager.get_json_data()
+        if table.load(filename):
+            table.setup_windows(self.tab_widget)
 
     def read_settings(self):
         settings = QSettings()
@@ -105,6 +316,42 @@ class ScoreControl(QMainWindow):
         self.move(settings.value("position", QPoint(200, 200)))
         settings.endGroup()
 
+        settings.beginGroup("TextExport")
+        self.text_export_directory = settings.value("directory", "")
+        settings.endGroup()
+
+        settings.beginGroup("PushServer")
+        self.push_server_port = int(settings.value("port", 0))
+        settings.endGroup()
+
+        settings.beginGroup("Journal")
+        self.journal = str(settings.value("enabled", "false")).lower() == "true"
+        settings.endGroup()
+
+        # Compact json is quicker to write, pretty json is easier to edit by hand
+        settings.beginGroup("Json")
+        self.pretty_json = str(settings.value("pretty", "true")).lower() == "true"
+        settings.endGroup()
+
+        settings.beginGroup("Undo")
+        self.undo_depth = int(settings.value("depth", UNDO_DEPTH))
+        settings.endGroup()
+
+        # One set of round widgets per player rather than a tab for each
+        # round, and whether the rounds shown follow the round number
+        settings.beginGroup("Rounds")
+        self.single_round_editor = str(settings.value("singleEditor", "false")).lower() == "true"
+        self.follow_round = str(settings.value("followRound", "false")).lower() == "true"
+        settings.endGroup()
+
+        # The json files of the tables at an event, one scoreboard each
+        settings.beginGroup("Tournament")
+        tables = settings.value("tables", [])
+        if isinstance(tables, str):
+            tables = [tables]
+        self.tournament_tables = [table for table in tables if table]
+        settings.endGroup()
+
     def write_settings(self):
         settings = QSettings()
         settings.beginGroup("ScoreWindow")
@@ -133,6 +380,18 @@ class ScoreDetailsWidget(QWidget):
 
 
 if __name__ == '__main__':
+    # When it is already running this passes each argument on to it as a
+    # command, or brings it to the front, without starting another one:
+    #
+    #     python main.py "inc left.40kRoundScores[2].primaryScore 5" "set_active left"
+    reply = send_commands(sys.argv[1:] or ["show"])
+    if reply is not None:
+        print(reply)
+        sys.exit(0 if reply == "ok" else 1)
+    if len(sys.argv) > 1:
+        print("Score Control is not running")
+        sys.exit(1)
+
     # QT Application
     app = QApplication(sys.argv)
 
@@ -0,0 +1,110 @@
+import time
+from os import path
+
+from jsonPatch import apply_patch, JsonPatchError
+from jsonSerializer import JsonSerializer
+import writeBehindWriter
+
+# Journal entries written before the document is compacted into a new snapshot
+JOURNAL_COMPACT_ENTRIES = 500
+
+
+# Append-only journal of RFC 6902 patches for a json document, so a change
+# costs a line added to the journal instead of rewriting the whole file.
+#
+# Each line is one entry: {"seq": <n>, "time": <unix time>, "patch": [...]}.
+# The document file is the snapshot, reading back is the snapshot with the
+# journal replayed on top. Compacting writes a new snapshot and moves the
+# journal to the end of the history file, which keeps every change made.
+#
+# Entries are recorded in memory and written when the file manager's writer
+# flushes the journal file, with pending_text and write_pending as its
+# producer and write function.
+#
+# The patches come from changes_to_patch and only set values, so replaying an
+# entry that is already in the snapshot does no harm.
+class PatchJournal:
+    def __init__(self, file_path: str, history_path: str, compact_entries: int = JOURNAL_COMPACT_ENTRIES):
+        self.filePath = file_path
+        self.historyPath = history_path
+        self.compactEntries = compact_entries
+        self.pending = []
+        self.entries = 0
+        self.seq = 0
+        self.serializer = JsonSerializer(pretty=False)
+
+    def record(self, patch: list, now: float = None):
+        if not patch:
+            return
+        if now is None:
+            now = time.time()
+        self.seq += 1
+        self.pending.append(self.serializer.dumps({"seq": self.seq, "time": now, "patch": patch}) + "\n")
+
+    def pending_text(self):
+        return "".join(self.pending)
+
+    def write_pending(self, file_path: str, text: str):
+        writeBehindWriter.append_write(file_path, text)
+        written = text.count("\n")
+        del self.pending[:written]
+        self.entries += written
+
+    def discard_pending(self):
+        self.pending = []
+
+    def needs_compaction(self):
+        return self.entries + len(self.pending) >= self.compactEntries
+
+    def has_entries(self):
+        return self.entries > 0 or len(self.pending) > 0
+
+    # Applies the journal on disk to the snapshot in json_data. A line that
+    # can't be read, like one torn by a crash, is skipped. Returns the number
+    # of entries applied.
+    def replay(self, json_data: dict):
+        self.entries = 0
+        if not path.isfile(self.filePath):
+            return 0
+
+        applied = 0
+        with open(self.filePath, 'r', encoding='utf-8') as read_file:
+            for line in read_file:
+                if not line.strip():
+                    continue
+                self.entries += 1
+                try:
+                    entry = self.serializer.loads(line)
+                    apply_patch(json_data, entry["patch"])
+                except (ValueError, KeyError, TypeError, JsonPatchError):
+                    continue
+                self.seq = max(self.seq, entry.get("seq", 0))
+                applied += 1
+        return applied
+
+    # A snapshot with everything in the journal was written, move the
+    # journal to the history
+    def rotate(self):
+        self.entries = 0
+        if not path.isfile(self.filePath):
+            return
+        with open(self.filePath, 'r', encoding='utf-8') as read_file:
+            text = read_file.read()
+        if not text:
+            return
+        writeBehindWriter.append_write(self.historyPath, text)
+        writeBehindWriter.atomic_write(self.filePath, "")
+
+    # Every entry, from the history and then the journal
+    def history(self):
+        entries = []
+        for file_path in [self.historyPath, self.filePath]:
+            if not path.isfile(file_path):
+                continue
+            with open(file_path, 'r', encoding='utf-8') as read_file:
+                for line in read_file:
+                    try:
+                        entries.append(self.serializer.loads(line))
+                    except ValueError:
+                        continue
+        return entries
@@ -0,0 +1,247 @@
+# Scoreboard widgets for any game system
+#
+# Builds the player columns, round tabs and catalogue editors for a Scoreboard
+
+import functools
+
+from PySide6.QtCore import Slot
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QGridLayout, QTabBar
+
+import widgetHelpers
+
+from PySide6.QtCore import Qt
+
+from gameSystems import SIDES
+from catalogueListModel import catalogues_changed
+from comboBoxWidget import ComboBoxWidget
+from integerWidget import IntegerWidget
+from jsonEvents import change_event
+from listObjectModelEditorWidget import ListObjectModelEditorWidget
+from scoreTotals import score_value
+from undoStack import UndoStack, UNDO_DEPTH
+
+
+# Static function to setup all the widgets used in editing a game. Tables
+# sharing another table's catalogues leave out catalogue_tabs. See
+# PlayerDetailsWidget for the round options.
+def setup_game_windows(scoreboard, tab_widget, score_details, ee, undo_depth: int = UNDO_DEPTH,
+                       catalogue_tabs: bool = True, single_round_editor: bool = False, follow_round: bool = False):
+    player_widget = PlayerDetailsWidget(scoreboard, ee, undo_depth, single_round_editor, follow_round)
+    score_details.set_body_widget(player_widget)
+    if not catalogue_tabs:
+        return
+
+    for catalogue in scoreboard.gameSystem.catalogues:
+        editor = ListObjectModelEditorWidget(catalogue["title"], scoreboard.json_data(), catalogue["jsonLocation"],
+                                             catalogue["layout"], scoreboard.fileManager)
+        tab_widget.addTab(editor, catalogue["tabTitle"])
+
+
+# Class to handle scoring for a game system, the widgets for a Scoreboard
+#
+# Each player has a tab of widgets per round. With single_round_editor each
+# player has one set of round widgets under a round selector instead, and
+# picking a round points them at that round (see rebind_json_widgets). With
+# follow_round the rounds shown follow the round number.
+#
+# stop() lets go of the file manager and emitter, for when the widget is
+# replaced.
+class PlayerDetailsWidget(QWidget):
+    def __init__(self, scoreboard, ee, undo_depth: int = UNDO_DEPTH, single_round_editor: bool = False,
+                 follow_round: bool = False):
+        QWidget.__init__(self)
+
+        self.scoreboard = scoreboard
+        self.game_system = scoreboard.gameSystem
+        self.widget_list = []
+        self.round_selectors = []
+        self.json_data = scoreboard.json_data()
+        self.file_manager = scoreboard.fileManager
+        self.ee = ee
+        self.follow_round = follow_round
+        json_data = self.json_data
+        file_manager = self.file_manager
+
+        # Setup all the widgets in the layout
+        layout = QGridLayout()
+        layout.setAlignment(Qt.AlignTop)
+
+        # Reset button
+        reset_button = QPushButton("Reset Scoreboard")
+        reset_button.clicked.connect(self.reset_scores)
+        layout.addWidget(reset_button, 0, 0, 1, 2)
+
+        # Turn Number Widget, in the widget list so undos, resets and reloads
+        # of the round show in it
+        round_widget = IntegerWidget("Round Number", json_data, "roundNum",
+                                     reset_value="1", file_manager=file_manager)
+        layout.addWidget(round_widget, 1, 0, 1, 2)
+        self.widget_list.append(round_widget)
+
+        # No Active Player button
+        no_active_player = QPushButton("No active player")
+        no_active_player.clicked.connect(self.no_player_active)
+        layout.addWidget(no_active_player, 2, 0, 1, 2)
+
+        # Top / Bottom Buttons
+        turn_top_button = QPushButton("Set Round to TOP")
+        turn_top_button.clicked.connect(self.set_top_round)
+        layout.addWidget(turn_top_button, 3, 0, 1, 1)
+
+        turn_bot_button = QPushButton("Set Round to BOT")
+        turn_bot_button.clicked.connect(self.set_bot_round)
+        layout.addWidget(turn_bot_button, 3, 1, 1, 1)
+
+        # Undo / Redo Buttons
+        self.undo_button = QPushButton("Undo")
+        self.undo_button.clicked.connect(self.undo)
+        layout.addWidget(self.undo_button, 4, 0, 1, 1)
+
+        self.redo_button = QPushButton("Redo")
+        self.redo_button.clicked.connect(self.redo)
+        layout.addWidget(self.redo_button, 4, 1, 1, 1)
+
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+
+        # A column for each player
+        active_slots = {"left": self.left_player_active, "right": self.right_player_active}
+        for column_index, (side, label) in enumerate(SIDES):
+            column = QVBoxLayout()
+            column.setAlignment(Qt.AlignTop)
+
+            # Player active button at the top
+            active_button = QPushButton("Set " + label + " Player Active")
+            active_button.clicked.connect(active_slots[side])
+            column.addWidget(active_button)
+
+            # Main player widgets
+            widgetHelpers.create_json_widgets(column, json_data, scoreboard.playerLayouts[side], self.widget_list,
+                                              file_manager, ee)
+
+            # Round widgets, each tab is only built when it is first shown
+            side_rounds = [(i, round_data) for round_side, i, round_data in scoreboard.roundLayouts
+                           if round_side == side]
+            if single_round_editor:
+                column.addWidget(self.build_round_editor(side_rounds))
+            else:
+                tabs = widgetHelpers.LazyTabWidget()
+                for i, round_data in side_rounds:
+                    tabs.add_lazy_tab("Round " + str(i + 1) + " Scoring",
+                                      functools.partial(self.build_round_tab, round_data))
+                self.round_selectors.append(tabs)
+                column.addWidget(tabs)
+
+            layout.addLayout(column, 5, column_index)
+
+        self.setLayout(layout)
+
+        # Only what happens after the widgets are set up can be undone
+        self.undo_stack = UndoStack(file_manager, undo_depth)
+        file_manager.add_listener(self.update_undo_buttons)
+        file_manager.add_listener(self.json_reloaded)
+        self.update_undo_buttons()
+
+        if follow_round:
+            ee.on(change_event("roundNum"), self.round_num_changed)
+            self.show_round(file_manager.get("roundNum"))
+
+    def stop(self):
+        self.undo_stack.stop()
+        self.file_manager.remove_listener(self.update_undo_buttons)
+        self.file_manager.remove_listener(self.json_reloaded)
+        if self.follow_round:
+            self.ee.off(change_event("roundNum"), self.round_num_changed)
+        for widget in self.widget_list:
+            if isinstance(widget, ComboBoxWidget):
+                widget.unsubscribe()
+
+    def build_round_tab(self, round_data: list, tab_layout):
+        widgetHelpers.create_json_widgets(tab_layout, self.json_data, round_data, self.widget_list, self.file_manager,
+                                          self.ee)
+
+    # One set of round widgets for a player, the selector picks the round
+    # they edit
+    def build_round_editor(self, side_rounds: list):
+        editor = QWidget()
+        editor_layout = QVBoxLayout(editor)
+        editor_layout.setContentsMargins(0, 0, 0, 0)
+        selector = QTabBar()
+        editor_layout.addWidget(selector)
+
+        round_widgets = []
+        widgetHelpers.create_json_widgets(editor_layout, self.json_data, side_rounds[0][1], round_widgets,
+                                          self.file_manager, self.ee)
+        self.widget_list.extend(round_widgets)
+        for i, round_data in side_rounds:
+            selector.addTab("Round " + str(i + 1) + " Scoring")
+        selector.currentChanged.connect(functools.partial(self.round_selected, round_widgets,
+                                                          [round_data for i, round_data in side_rounds]))
+        self.round_selectors.append(selector)
+        return editor
+
+    def round_selected(self, round_widgets: list, round_layouts: list, index: int):
+        if 0 <= index < len(round_layouts):
+            widgetHelpers.rebind_json_widgets(round_widgets, round_layouts[index])
+
+    def round_num_changed(self, json_location, old_value, new_value):
+        self.show_round(new_value)
+
+    # Show each player's round for a round number, counting from 1
+    def show_round(self, round_num):
+        for selector in self.round_selectors:
+            selector.setCurrentIndex(min(max(score_value(round_num), 1), selector.count()) - 1)
+
+    # The scoreboard resets in one go, then the widgets show the values
+    # that changed
+    @Slot()
+    def reset_scores(self):
+        self.show_changes(self.scoreboard.reset())
+
+    # Changes made other than through the widgets, only the widgets showing
+    # what changed are updated
+    def show_changes(self, changes: list):
+        widgetHelpers.refresh_widgets(self.widget_list, [change[0] for change in changes])
+        self.update_undo_buttons()
+
+    # Another tool changed the file, catalogue lists were changed in place
+    # so the combos picking from them start over
+    def json_reloaded(self, changes: list):
+        if self.file_manager.reloading:
+            catalogues_changed(self.scoreboard.json_data(), [change[0] for change in changes])
+            self.show_changes(changes)
+
+    def update_undo_buttons(self, changes: list = None):
+        self.undo_button.setEnabled(self.undo_stack.can_undo())
+        self.redo_button.setEnabled(self.undo_stack.can_redo())
+
+    @Slot()
+    def undo(self):
+        widgetHelpers.refresh_widgets(self.widget_list, self.undo_stack.undo())
+        self.update_undo_buttons()
+
+    @Slot()
+    def redo(self):
+        widgetHelpers.refresh_widgets(self.widget_list, self.undo_stack.redo())
+        self.update_undo_buttons()
+
+    @Slot()
+    def set_top_round(self):
+        self.scoreboard.set_round_order("TOP")
+
+    @Slot()
+    def set_bot_round(self):
+        self.scoreboard.set_round_order("BOT")
+
+    @Slot()
+    def left_player_active(self):
+        self.scoreboard.set_active_player("left")
+
+    @Slot()
+    def right_player_active(self):
+        self.scoreboard.set_active_player("right")
+
+    @Slot()
+    def no_player_active(self):
+        self.scoreboard.set_active_player(None)
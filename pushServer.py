@@ -0,0 +1,191 @@
+from PySide6.QtCore import QObject, QTimer, Slot
+from PySide6.QtNetwork import QHostAddress, QTcpServer
+
+from jsonPatch import changes_to_patch
+from jsonSerializer import JsonSerializer
+
+# Port overlays connect to when the server is turned on in the settings
+PUSH_SERVER_PORT = 8765
+
+# Largest request we will wait on before giving up on a client
+MAX_REQUEST_SIZE = 8192
+
+EVENT_STREAM_HEADERS = (
+    "HTTP/1.1 200 OK\r\n"
+    "Content-Type: text/event-stream\r\n"
+    "Cache-Control: no-cache\r\n"
+    "Connection: keep-alive\r\n"
+    "Access-Control-Allow-Origin: *\r\n"
+    "\r\n"
+)
+
+
+_serializer = JsonSerializer(pretty=False)
+
+
+def encode_json(value):
+    return _serializer.dumps(value)
+
+
+def http_response(status: str, content_type: str, body: str):
+    body = body.encode("utf-8")
+    head = ("HTTP/1.1 " + status + "\r\n"
+            "Content-Type: " + content_type + "\r\n"
+            "Content-Length: " + str(len(body)) + "\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Connection: close\r\n"
+            "\r\n")
+    return head.encode("utf-8") + body
+
+
+# Pushes changes to the scoreboard to overlays (OBS browser sources) over
+# Server-Sent Events on localhost, so they don't have to poll the json file.
+#
+# GET /events is an event stream. It starts with a 'snapshot' event holding
+# the scoreboard, followed by a 'patch' event for each batch of changes with
+# an RFC 6902 patch to apply to it:
+#
+#     const source = new EventSource("http://localhost:8765/events");
+#     source.addEventListener("snapshot", e => { state = JSON.parse(e.data); });
+#     source.addEventListener("patch", e => { state = applyPatch(state, JSON.parse(e.data)); });
+#
+# GET /state returns the scoreboard once.
+#
+# Changes come from the file manager's listeners, the same ones the widgets
+# and text files follow. They are collected and sent once per turn of the
+# event loop, every client shares the same patch. Catalogues are not sent.
+class PushServer(QObject):
+    def __init__(self, file_manager, port: int = PUSH_SERVER_PORT, host=QHostAddress.LocalHost, parent=None):
+        super().__init__(parent)
+        self.fileManager = file_manager
+        self.port = port
+        self.host = QHostAddress(host)
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self.new_connection)
+        self.requests = {}
+        self.streams = []
+        self.changes = []
+        self.flushScheduled = False
+        self.eventId = 0
+
+        self.fileManager.add_listener(self.json_changed)
+
+    # Start listening, returns False if the port could not be opened
+    def start(self):
+        if self.server.isListening():
+            return True
+        return self.server.listen(self.host, self.port)
+
+    def server_port(self):
+        return self.server.serverPort()
+
+    def stop(self):
+        self.fileManager.remove_listener(self.json_changed)
+        self.server.close()
+        for socket in list(self.requests.keys()) + self.streams:
+            socket.disconnected.disconnect(self.socket_closed)
+            socket.abort()
+            socket.deleteLater()
+        self.requests = {}
+        self.streams = []
+
+    # The part of the json data overlays see, the scoreboard without catalogues
+    def scoreboard(self):
+        if not self.fileManager.is_valid():
+            return {}
+        return self.fileManager.document_data(self.fileManager.documents[0])
+
+    def is_scoreboard_change(self, change):
+        return self.fileManager.document_for(change[0]) is self.fileManager.documents[0]
+
+    @Slot()
+    def new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.requests[socket] = b""
+            socket.readyRead.connect(self.socket_ready)
+            socket.disconnected.connect(self.socket_closed)
+
+    @Slot()
+    def socket_ready(self):
+        self.read_request(self.sender())
+
+    @Slot()
+    def socket_closed(self):
+        socket = self.sender()
+        self.requests.pop(socket, None)
+        if socket in self.streams:
+            self.streams.remove(socket)
+        socket.deleteLater()
+
+    def read_request(self, socket):
+        if socket not in self.requests:
+            # Clients on the stream have nothing more to say
+            socket.readAll()
+            return
+
+        data = self.requests[socket] + bytes(socket.readAll().data())
+        if b"\r\n\r\n" not in data:
+            if len(data) > MAX_REQUEST_SIZE:
+                del self.requests[socket]
+                socket.disconnectFromHost()
+            else:
+                self.requests[socket] = data
+            return
+        del self.requests[socket]
+
+        request_line = data.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+        method = request_line[0]
+        request_path = request_line[1].split("?", 1)[0] if len(request_line) > 1 else ""
+        if method != "GET":
+            socket.write(http_response("405 Method Not Allowed", "text/plain", "Only GET is supported"))
+            socket.disconnectFromHost()
+        elif request_path == "/events":
+            socket.write(EVENT_STREAM_HEADERS.encode("utf-8"))
+            socket.write(self.stream_event("snapshot", self.scoreboard()))
+            self.streams.append(socket)
+        elif request_path == "/state":
+            socket.write(http_response("200 OK", "application/json", encode_json(self.scoreboard())))
+            socket.disconnectFromHost()
+        else:
+            socket.write(http_response("404 Not Found", "text/plain", "Not found"))
+            socket.disconnectFromHost()
+
+    def stream_event(self, name: str, value):
+        self.eventId += 1
+        text = "id: " + str(self.eventId) + "\nevent: " + name + "\ndata: " + encode_json(value) + "\n\n"
+        return text.encode("utf-8")
+
+    def json_changed(self, changes: list):
+        if not self.streams:
+            return
+        scoreboard_changes = [change for change in changes if self.is_scoreboard_change(change)]
+        if not scoreboard_changes:
+            return
+        # Turn the changes into a patch now, while the values are the ones
+        # that were set
+        self.changes.extend(changes_to_patch(self.fileManager.get_json_data(), scoreboard_changes))
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flushScheduled:
+            return
+        self.flushScheduled = True
+        QTimer.singleShot(0, self.flush)
+
+    @Slot()
+    def flush(self):
+        self.flushScheduled = False
+        if not self.changes:
+            return
+        message = self.stream_event("patch", self.changes)
+        self.changes = []
+        for socket in self.streams:
+            socket.write(message)
+
+    # Send every client the whole scoreboard again, such as after a new file is loaded
+    def send_snapshot(self):
+        self.changes = []
+        message = self.stream_event("snapshot", self.scoreboard())
+        for socket in self.streams:
+            socket.write(message)
@@ -0,0 +1,75 @@
+import math
+
+from PySide6.QtCore import QObject, QTimer, Qt, Slot
+
+# Milliseconds between checks for writes that are still waiting, such as one
+# that failed. Only a safety net, saves are started by the changes themselves.
+SAVE_HEARTBEAT_INTERVAL = 10000
+
+# Milliseconds to wait before trying a failed write again
+SAVE_RETRY_INTERVAL = 1000
+
+
+# Saves documents when they change rather than polling.
+#
+# writer is the WriteBehindWriter of the file managers to save, one scheduler
+# saves every file manager sharing it. The writer tells us when a document
+# starts waiting to be written and a single shot timer is set for when its
+# write window ends, so a change is on disk a window after it was made (see
+# SCOREBOARD_WRITE_WINDOW in main.py) and nothing runs while nothing changes.
+class SaveScheduler(QObject):
+    def __init__(self, writer, heartbeat_interval: int = SAVE_HEARTBEAT_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.writer = writer
+        self.saves = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.save)
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.timeout.connect(self.heartbeat_save)
+        if heartbeat_interval > 0:
+            self.heartbeat.start(heartbeat_interval)
+
+        self.writer.add_listener(self.write_submitted)
+        self.schedule()
+
+    def write_submitted(self, file_path: str):
+        self.schedule()
+
+    # Set the timer for the next write that is due, unless it is already set
+    # to go off sooner
+    def schedule(self, retry: bool = False):
+        due = self.writer.next_due()
+        if due is None:
+            self.timer.stop()
+            return
+
+        interval = math.ceil(due * 1000)
+        if retry:
+            interval = max(interval, SAVE_RETRY_INTERVAL)
+        if self.timer.isActive() and self.timer.remainingTime() <= interval:
+            return
+        self.timer.start(interval)
+
+    @Slot()
+    def save(self):
+        self.timer.stop()
+        self.writer.flush()
+        self.saves += 1
+
+        # Anything overdue after writing failed to write, don't spin on it
+        self.schedule(retry=self.writer.next_due() == 0.0)
+
+    @Slot()
+    def heartbeat_save(self):
+        if self.writer.has_pending() and not self.timer.isActive():
+            self.save()
+
+    # Stop saving, anything waiting is left for a forced write
+    def stop(self):
+        self.writer.remove_listener(self.write_submitted)
+        self.timer.stop()
+        self.heartbeat.stop()
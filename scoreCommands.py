@@ -0,0 +1,185 @@
+# Text commands for a Scoreboard, for stream deck buttons and scripts (see
+# CommandServer).
+#
+# One command per line, arguments split like a shell would so text with
+# spaces can be quoted:
+#
+#     inc <json location> [amount]      add to a number, 1 by default
+#     dec <json location> [amount]      take away from a number
+#     set <json location> <value>       value is read as json, or else text,
+#                                       so '"5"' is the text 5. It has to be
+#                                       a number for number fields and text
+#                                       for text fields
+#     set_active left|right|none        the active player
+#     round <number>                    the round number
+#     order TOP|BOT                     the round order
+#     reset                             reset the scoreboard
+#
+# Commands do what the player widget buttons do, through the same
+# Scoreboard methods, and take what the widgets would: inc, dec and set only
+# reach fields a widget edits, and numbers stay in an integer widget's range.
+# Commands are checked before any of them run, so a bad line in a batch
+# changes nothing.
+
+import json
+import shlex
+
+from jsonPath import compile_json_path, json_location as location_of
+from scoreboard import INTEGER_MAX, INTEGER_MIN, ROUND_ORDERS
+from scoreTotals import score_value
+
+
+class CommandError(ValueError):
+    pass
+
+
+def parse_command(line: str):
+    try:
+        return shlex.split(line)
+    except ValueError as e:
+        raise CommandError("Can't read " + repr(line) + ", " + str(e))
+
+
+def _integer(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        raise CommandError("Expected a number, got " + repr(text))
+
+
+def _value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _arguments(tokens: list, least: int, most: int):
+    if not least <= len(tokens) - 1 <= most:
+        raise CommandError(tokens[0] + " takes " + str(least) +
+                           ("" if least == most else " to " + str(most)) + " arguments")
+    return tokens[1:]
+
+
+_TYPE_NAMES = {int: "a number", str: "text"}
+
+
+def _in_range(name: str, value: int):
+    if not INTEGER_MIN <= value <= INTEGER_MAX:
+        raise CommandError(name + " has to be " + str(INTEGER_MIN) + " to " + str(INTEGER_MAX) + ", got " + str(value))
+    return value
+
+
+# The type of a field a widget edits. Anything else, or a location holding
+# or inside something other than a single value, is turned away.
+def _field_type(scoreboard, json_location: str):
+    value_type = scoreboard.value_type(json_location)
+    if value_type is None:
+        raise CommandError(json_location + " isn't a scoreboard field")
+
+    tokens = compile_json_path(json_location).tokens
+    for i in range(1, len(tokens)):
+        parent = scoreboard.fileManager.get(location_of(tokens[:i]))
+        if parent is None:
+            return value_type
+        if not isinstance(parent, (dict, list)):
+            raise CommandError(json_location + " is inside a value that isn't a list or dict")
+    if isinstance(scoreboard.fileManager.get(json_location), (dict, list)):
+        raise CommandError(json_location + " holds more than one value")
+    return value_type
+
+
+# Each command checks its arguments and returns a function that makes the
+# change
+
+def _inc(scoreboard, tokens: list):
+    arguments = _arguments(tokens, 1, 2)
+    json_location = arguments[0]
+    amount = _integer(arguments[1]) if len(arguments) > 1 else 1
+    if _field_type(scoreboard, json_location) is not int or \
+            type(scoreboard.fileManager.get(json_location, 0)) is not int:
+        raise CommandError(tokens[0] + " needs a number at " + json_location)
+    amount = amount if tokens[0] == "inc" else -amount
+
+    # An earlier command in the batch can change the value, so the result is
+    # checked when it's made
+    def apply():
+        _in_range(json_location, score_value(scoreboard.fileManager.get(json_location)) + amount)
+        scoreboard.add(json_location, amount)
+    return apply
+
+
+# The value has to be the type the widgets showing it expect
+def _set(scoreboard, tokens: list):
+    json_location, text = _arguments(tokens, 2, 2)
+    value = _value(text)
+    value_type = _field_type(scoreboard, json_location)
+    if type(value) is not value_type:
+        raise CommandError(json_location + " takes " + _TYPE_NAMES[value_type] + ", got " + text)
+    if value_type is int:
+        _in_range(json_location, value)
+    return lambda: scoreboard.fileManager.set(json_location, value)
+
+
+def _set_active(scoreboard, tokens: list):
+    side = _arguments(tokens, 1, 1)[0].lower()
+    if side not in scoreboard.sides + ["none"]:
+        raise CommandError("set_active takes " + ", ".join(scoreboard.sides) + " or none")
+    return lambda: scoreboard.set_active_player(None if side == "none" else side)
+
+
+def _round(scoreboard, tokens: list):
+    round_num = _in_range("round", _integer(_arguments(tokens, 1, 1)[0]))
+    return lambda: scoreboard.set_round(round_num)
+
+
+def _order(scoreboard, tokens: list):
+    order = _arguments(tokens, 1, 1)[0].upper()
+    if order not in ROUND_ORDERS:
+        raise CommandError("order takes " + " or ".join(ROUND_ORDERS))
+    return lambda: scoreboard.set_round_order(order)
+
+
+def _reset(scoreboard, tokens: list):
+    _arguments(tokens, 0, 0)
+    return scoreboard.reset
+
+
+COMMANDS = {
+    "inc": _inc,
+    "dec": _inc,
+    "set": _set,
+    "set_active": _set_active,
+    "round": _round,
+    "order": _order,
+    "reset": _reset,
+}
+
+
+# Checks a parsed command, returning a function that runs it on the scoreboard
+def check_command(scoreboard, tokens: list):
+    if tokens[0] not in COMMANDS:
+        raise CommandError("Unknown command " + repr(tokens[0]))
+    return COMMANDS[tokens[0]](scoreboard, tokens)
+
+
+# Runs a parsed command on a scoreboard
+def run_command(scoreboard, tokens: list):
+    check_command(scoreboard, tokens)()
+
+
+# Checks parsed commands, skipping blank lines, before any of them run.
+# Returns the functions that run them.
+def check_commands(scoreboard, commands: list):
+    return [check_command(scoreboard, tokens) for tokens in commands if tokens]
+
+
+# Runs lines of commands in one transaction, so they are one save, one
+# update for overlays and one undo. If any of them fails none of them
+# happen. Returns the changes made.
+def run_commands(scoreboard, lines: list):
+    commands = check_commands(scoreboard, [parse_command(line) for line in lines])
+    with scoreboard.fileManager.transaction() as changes:
+        for command in commands:
+            command()
+    return changes
@@ -0,0 +1,115 @@
+from jsonPath import compile_json_path
+
+
+# Derived fields kept up to date by ScoreTotals
+ROUND_TOTAL_FIELD = "roundTotal"
+TOTAL_FIELD = "totalScore"
+LEAD_MARGIN_FIELD = "leadMargin"
+
+
+def score_value(value):
+    if type(value) is int:
+        return value
+    return 0
+
+
+# Keeps score totals in the json data so overlays can read them instead of
+# adding up the rounds themselves. For each player:
+#
+#     <side>.<rounds key>[n].roundTotal   the round's score fields added up
+#     <side>.totalScore                   every round plus the extra score fields
+#     <side>.leadMargin                   totalScore less the other player's
+#
+# The fields are set through the file manager, so they are saved with the
+# scores and reach the same listeners. A change to a single score field
+# moves its round total, the player's total and both margins by the
+# difference. Anything bigger, like a whole player or list of rounds being
+# replaced, adds that player up again.
+#
+# sides are the json keys of the two players, such as ["left", "right"].
+class ScoreTotals:
+    def __init__(self, file_manager, game_system, sides: list):
+        self.fileManager = file_manager
+        self.sides = sides
+        self.roundsKey = game_system.roundsKey
+        self.roundScoreFields = game_system.roundScoreFields
+        self.extraScoreFields = game_system.extraScoreFields
+
+        self.recompute()
+        self.fileManager.add_listener(self.json_changed)
+
+    def stop(self):
+        self.fileManager.remove_listener(self.json_changed)
+
+    def rounds_location(self, side: str):
+        return side + "." + self.roundsKey
+
+    def set_if_changed(self, json_location: str, value: int):
+        if self.fileManager.get(json_location) != value:
+            self.fileManager.set(json_location, value)
+
+    # Add every player up from scratch, such as when a file is loaded
+    def recompute(self):
+        if not self.fileManager.is_valid():
+            return
+        with self.fileManager.transaction():
+            for side in self.sides:
+                self.recompute_side(side)
+            self.update_margins()
+
+    def recompute_side(self, side: str):
+        json_data = self.fileManager.get_json_data()
+        total = 0
+        rounds = compile_json_path(self.rounds_location(side)).get(json_data)
+        if isinstance(rounds, list):
+            for index, round_data in enumerate(rounds):
+                if not isinstance(round_data, dict):
+                    continue
+                round_total = sum(score_value(round_data.get(field)) for field in self.roundScoreFields)
+                self.set_if_changed(self.rounds_location(side) + "[" + str(index) + "]." + ROUND_TOTAL_FIELD,
+                                    round_total)
+                total += round_total
+        for field in self.extraScoreFields:
+            total += score_value(self.fileManager.get(side + "." + field))
+        self.set_if_changed(side + "." + TOTAL_FIELD, total)
+
+    def update_margins(self):
+        totals = [score_value(self.fileManager.get(side + "." + TOTAL_FIELD)) for side in self.sides]
+        for index, side in enumerate(self.sides):
+            self.set_if_changed(side + "." + LEAD_MARGIN_FIELD, totals[index] - totals[1 - index])
+
+    def add_to(self, json_location: str, delta: int):
+        self.set_if_changed(json_location, score_value(self.fileManager.get(json_location)) + delta)
+
+    def json_changed(self, changes: list):
+        # The totals that follow are passed on as one change
+        with self.fileManager.transaction():
+            self.update_totals(changes)
+
+    def update_totals(self, changes: list):
+        totals_changed = False
+        for json_location, old_value, new_value in changes:
+            tokens = compile_json_path(json_location).tokens
+            side = tokens[0]
+            if side not in self.sides:
+                continue
+            fields = tokens[1:]
+
+            delta = score_value(new_value) - score_value(old_value)
+            if len(fields) == 3 and fields[0] == self.roundsKey and type(fields[1]) is int \
+                    and fields[2] in self.roundScoreFields:
+                # One score in a round
+                round_location = self.rounds_location(side) + "[" + str(fields[1]) + "]." + ROUND_TOTAL_FIELD
+                self.add_to(round_location, delta)
+                self.add_to(side + "." + TOTAL_FIELD, delta)
+            elif len(fields) == 1 and fields[0] in self.extraScoreFields:
+                self.add_to(side + "." + TOTAL_FIELD, delta)
+            elif not fields or (fields[0] == self.roundsKey and len(fields) < 3):
+                # A whole player, list of rounds or round was replaced
+                self.recompute_side(side)
+            else:
+                continue
+            totals_changed = True
+
+        if totals_changed:
+            self.update_margins()
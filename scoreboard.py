@@ -0,0 +1,168 @@
+# The scoreboard without Qt
+#
+# Everything the player widgets do to the json, so scripts and tests can run
+# a game without a QApplication. The widgets wrap a Scoreboard.
+
+from catalogueIndex import FieldFilter
+from gameSystems import SIDES
+from jsonPath import compile_json_path
+from scoreTotals import ScoreTotals, TOTAL_FIELD, score_value
+
+ACTIVE_STATUS = "ACTIVE"
+ROUND_ORDERS = ["TOP", "BOT"]
+
+# The type of value each kind of widget in a layout edits
+WIDGET_VALUE_TYPES = {"integer": int, "text": str, "combo": str}
+
+# The numbers an integer widget's text box takes
+INTEGER_MIN = 0
+INTEGER_MAX = 100
+
+
+# Creates a filter to allow for combo box based on data in json. Items pass
+# when their field is empty or matches the value at dict_json_location.
+def build_field_test(item_json_location: str, json_blob: dict, dict_json_location: str):
+    dict_json_path = compile_json_path(dict_json_location)
+    return FieldFilter(item_json_location, lambda: [None, "", "None", dict_json_path.get(json_blob)],
+                       include_missing=True, depends_on=[dict_json_location])
+
+
+def write_json_value(json_data: dict, json_location: str, value, file_manager=None):
+    if file_manager is None:
+        compile_json_path(json_location).set(json_data, value)
+    else:
+        file_manager.set(json_location, value)
+
+
+# Does to the json what creating the widgets in data would, without making
+# them. Integer widgets fill in a 0 when there is no value yet.
+def init_json_values(json_data: dict, data: list, file_manager=None):
+    for widget_data in data:
+        if widget_data["type"] != "integer":
+            continue
+        if compile_json_path(widget_data["jsonLocation"]).get(json_data) is None:
+            write_json_value(json_data, widget_data["jsonLocation"], 0, file_manager)
+
+
+# Does to the json what reset_data on the widgets in data would, without
+# making them. Combos only reset to an item they would be showing.
+def reset_json_values(json_data: dict, data: list, file_manager=None):
+    for widget_data in data:
+        reset_value = widget_data.get("resetValue")
+        if reset_value is None:
+            continue
+
+        if widget_data["type"] == "integer":
+            value = int(reset_value)
+        elif widget_data["type"] == "text":
+            assert (type(reset_value) is str)
+            value = reset_value
+        elif widget_data["type"] == "combo":
+            filter_func = widget_data.get("filterFunc")
+            items = json_data.get(widget_data["itemsLocation"]) or []
+            if not any(item['name'] == reset_value and (filter_func is None or filter_func(item)) for item in items):
+                continue
+            value = reset_value
+        else:
+            continue
+
+        write_json_value(json_data, widget_data["jsonLocation"], value, file_manager)
+
+
+# A side's layout with the armyFilter of its combos turned into a filter on
+# that player's army. The layout passed in is left as it is.
+def build_side_layout(layout: list, json_data: dict, side: str):
+    built = []
+    for widget_data in layout:
+        if "armyFilter" in widget_data:
+            army_filter = widget_data["armyFilter"]
+            widget_data = {key: value for key, value in widget_data.items() if key != "armyFilter"}
+            widget_data["filterFunc"] = build_field_test(army_filter, json_data, side + ".armyName")
+        built.append(widget_data)
+    return built
+
+
+# A game of a game system in a file manager's json data.
+#
+# playerLayouts holds each side's main layout and roundLayouts a
+# (side, round index, layout) for every round, with the army filters filled
+# in, ready for create_json_widgets. Creating a Scoreboard fills in the
+# values the layouts need, such as a 0 for every round score, and starts
+# keeping the totals (see ScoreTotals).
+class Scoreboard:
+    def __init__(self, file_manager, game_system):
+        self.fileManager = file_manager
+        self.gameSystem = game_system
+        self.sides = [side for side, label in SIDES]
+
+        json_data = self.fileManager.get_json_data()
+        self.playerLayouts = {}
+        self.roundLayouts = []
+        for side, label in SIDES:
+            self.playerLayouts[side] = build_side_layout(game_system.player_layout(side, label), json_data, side)
+            for i in range(game_system.roundCount):
+                round_layout = build_side_layout(game_system.round_layout(side, label, i), json_data, side)
+                self.roundLayouts.append((side, i, round_layout))
+
+        # The value type of every location a widget edits, by path tokens
+        self.valueTypes = {compile_json_path("roundNum").tokens: int}
+        for layout in self.layouts():
+            for widget_data in layout:
+                if widget_data["type"] in WIDGET_VALUE_TYPES:
+                    self.valueTypes[compile_json_path(widget_data["jsonLocation"]).tokens] = \
+                        WIDGET_VALUE_TYPES[widget_data["type"]]
+
+        with self.fileManager.transaction():
+            for layout in self.layouts():
+                init_json_values(json_data, layout, self.fileManager)
+        self.totals = ScoreTotals(self.fileManager, game_system, self.sides)
+
+    def stop(self):
+        self.totals.stop()
+
+    def layouts(self):
+        return list(self.playerLayouts.values()) + [layout for side, index, layout in self.roundLayouts]
+
+    def json_data(self):
+        return self.fileManager.get_json_data()
+
+    # The type of value the widgets expect at a location, int or str, or
+    # None when no widget edits it
+    def value_type(self, json_location: str):
+        return self.valueTypes.get(compile_json_path(json_location).tokens)
+
+    # Every value goes back to its default in one transaction, so a reset is
+    # one save, one update for overlays and one undo. Returns the changes.
+    def reset(self):
+        with self.fileManager.transaction() as changes:
+            for layout in self.layouts():
+                reset_json_values(self.json_data(), layout, self.fileManager)
+        return changes
+
+    # side is left or right, or None for no active player
+    def set_active_player(self, side: str = None):
+        with self.fileManager.transaction():
+            for player in self.sides:
+                self.fileManager.set(player + ".playerStatus", ACTIVE_STATUS if player == side else "")
+
+    def active_player(self):
+        for side in self.sides:
+            if self.fileManager.get(side + ".playerStatus") == ACTIVE_STATUS:
+                return side
+        return None
+
+    def set_round_order(self, order: str):
+        assert order in ROUND_ORDERS
+        self.fileManager.set("roundOrder", order)
+
+    def set_round(self, round_num: int):
+        self.fileManager.set("roundNum", round_num)
+
+    # Adds to an integer, such as a round's primary score
+    def add(self, json_location: str, amount: int):
+        value = score_value(self.fileManager.get(json_location)) + amount
+        self.fileManager.set(json_location, value)
+        return value
+
+    def total(self, side: str):
+        return score_value(self.fileManager.get(side + "." + TOTAL_FIELD))
@@ -0,0 +1,42 @@
+import json
+
+from benchmarks import run_benchmarks, compare_reports, BENCHMARKS
+from PySide6.QtWidgets import QApplication
+
+
+class TestBenchmarks:
+    app = None
+
+    @classmethod
+    def setup_class(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    @classmethod
+    def teardown_class(cls):
+        del cls.app
+
+    def test_report(self):
+        report = run_benchmarks(sizes=[3], repeat=1)
+
+        # The report is plain json
+        report = json.loads(json.dumps(report))
+        assert report["sizes"] == [3]
+        names = {result["name"] for result in report["results"]}
+        assert "FileManager.write_file" in names
+        assert "ComboBoxWidget.reset_items" in names
+        for result in report["results"]:
+            assert result["params"]["catalogueSize"] == 3
+            assert result["min"] <= result["median"]
+
+        lines = compare_reports(report, report)
+        assert len(lines) == len(report["results"])
+        assert all(line.endswith("1.00x") for line in lines)
+
+    def test_only(self):
+        report = run_benchmarks(sizes=[3], repeat=1, names=["comboBox"])
+        assert {result["name"] for result in report["results"]} == {"ComboBoxWidget.reset_items",
+                                                                   "ComboBoxWidget.reset_items army changed"}
+        assert "comboBox" in BENCHMARKS
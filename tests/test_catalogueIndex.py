@@ -0,0 +1,70 @@
+import gc
+import unittest
+
+from catalogueIndex import CatalogueIndex, FieldFilter, catalogue_index, find_catalogue_index
+
+
+class CatalogueIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.items = [
+            {'name': '------'},
+            {'name': 'Orks 1', 'armyType': 'Orks'},
+            {'name': 'Any', 'armyType': ''},
+            {'name': 'Elves 1', 'armyType': 'Elves'},
+            {'name': 'Orks 2', 'armyType': 'Orks'},
+        ]
+        self.army = 'Orks'
+        self.army_filter = FieldFilter('armyType', lambda: [None, "", "None", self.army], include_missing=True)
+
+    def names(self, items):
+        return [item['name'] for item in items]
+
+    def test_query_matches_filter(self):
+        index = CatalogueIndex(self.items)
+        expected = [item for item in self.items if self.army_filter(item)]
+        self.assertEqual(expected, index.query(self.army_filter))
+        self.assertEqual(['------', 'Orks 1', 'Any', 'Orks 2'], self.names(index.query(self.army_filter)))
+
+        self.army = 'Elves'
+        self.assertEqual(['------', 'Any', 'Elves 1'], self.names(index.query(self.army_filter)))
+
+    def test_incremental_updates(self):
+        index = CatalogueIndex(self.items)
+        index.query(self.army_filter)
+
+        new_item = {'name': 'Orks 3', 'armyType': 'Orks'}
+        self.items.append(new_item)
+        index.add(new_item)
+        self.assertEqual(['------', 'Orks 1', 'Any', 'Orks 2', 'Orks 3'], self.names(index.query(self.army_filter)))
+
+        removed = self.items.pop(1)
+        index.remove(removed)
+        self.assertEqual(['------', 'Any', 'Orks 2', 'Orks 3'], self.names(index.query(self.army_filter)))
+
+        new_item['armyType'] = 'Elves'
+        index.update(new_item)
+        self.assertEqual(['------', 'Any', 'Orks 2'], self.names(index.query(self.army_filter)))
+
+    def test_list_changed_without_index(self):
+        index = CatalogueIndex(self.items)
+        index.query(self.army_filter)
+        self.items.append({'name': 'Orks 3', 'armyType': 'Orks'})
+        self.assertIn('Orks 3', self.names(index.query(self.army_filter)))
+
+    def test_shared_index(self):
+        self.assertIsNone(find_catalogue_index(self.items))
+        index = catalogue_index(self.items)
+        self.assertIs(index, catalogue_index(self.items))
+        self.assertIs(index, find_catalogue_index(self.items))
+
+        type_filter = FieldFilter('type', lambda: ['A'])
+        self.assertEqual([], index.query(type_filter))
+
+        # It goes once nothing uses it
+        del index
+        gc.collect()
+        self.assertIsNone(find_catalogue_index(self.items))
+
+
+if __name__ == '__main__':
+    unittest.main()
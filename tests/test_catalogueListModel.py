@@ -0,0 +1,106 @@
+import gc
+
+from catalogueIndex import FieldFilter, catalogue_index, find_catalogue_index
+from catalogueListModel import CatalogueFilterModel, catalogue_model, catalogues_changed, find_catalogue_model
+from PySide6.QtWidgets import QApplication
+
+
+class TestCatalogueListModel:
+    app = None
+
+    @classmethod
+    def setup_class(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    @classmethod
+    def teardown_class(cls):
+        del cls.app
+
+    @staticmethod
+    def names(model):
+        return [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+    def make_data(self):
+        return {'items': [{'name': 'Item 1', 'army': 'A'}, {'name': 'Item 2', 'army': 'B'}, {'name': 'Item 3'}]}
+
+    def test_shared_model(self):
+        data = self.make_data()
+        assert find_catalogue_model(data, 'items') is None
+        model = catalogue_model(data, 'items')
+        assert catalogue_model(data, 'items') is model
+        assert find_catalogue_model(data, 'items') is model
+
+        # Another table linking the same list gets the same model
+        assert catalogue_model({'items': data['items']}, 'items') is model
+
+        # A list put in its place gets a model of its own
+        data['items'] = []
+        assert find_catalogue_model(data, 'items') is None
+        assert catalogue_model(data, 'items') is not model
+
+        # Models go once nothing shows them
+        data = self.make_data()
+        catalogue_model(data, 'items')
+        gc.collect()
+        assert find_catalogue_model(data, 'items') is None
+
+        # Missing lists are made
+        data = {}
+        assert catalogue_model(data, 'items').rowCount() == 0
+        assert data == {'items': []}
+
+    def test_filter(self):
+        data = self.make_data()
+        model = catalogue_model(data, 'items')
+        army = ['A']
+        proxy = CatalogueFilterModel(model, FieldFilter('army', lambda: army, include_missing=True))
+        assert self.names(proxy) == ['Item 1', 'Item 3']
+
+        # The index the filter queries is kept while it is in use
+        gc.collect()
+        assert proxy.item_index is not None
+        assert find_catalogue_index(data['items']) is proxy.item_index
+
+        # The values are read again when asked
+        army[0] = 'B'
+        assert self.names(proxy) == ['Item 1', 'Item 3']
+        proxy.invalidate_filter()
+        assert self.names(proxy) == ['Item 2', 'Item 3']
+
+        # Edits to the catalogue only filter what changed
+        inserted = []
+        proxy.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.append_object({'name': 'Item 4', 'army': 'A'})
+        assert inserted == []
+        data['items'][0]['army'] = 'B'
+        model.object_changed(data['items'][0])
+        assert inserted == [(0, 0)]
+        assert self.names(proxy) == ['Item 1', 'Item 2', 'Item 3']
+
+        # Any function works as a filter
+        proxy.set_filter_function(lambda item: item['name'].endswith('4'))
+        assert self.names(proxy) == ['Item 4']
+        proxy.set_filter_function(None)
+        assert self.names(proxy) == ['Item 1', 'Item 2', 'Item 3', 'Item 4']
+
+    def test_catalogues_changed(self):
+        data = self.make_data()
+        data['other'] = [{'name': 'Other'}]
+        model = catalogue_model(data, 'items')
+        other = catalogue_model(data, 'other')
+        index = catalogue_index(data['items'])
+        assert index.query(FieldFilter('army', lambda: ['A'])) == data['items'][:1]
+        resets = []
+        model.modelReset.connect(lambda: resets.append('items'))
+        other.modelReset.connect(lambda: resets.append('other'))
+
+        # Changed in place, as a reload does
+        data['items'][1]['army'] = 'A'
+        data['items'].append({'name': 'Item 4', 'army': 'B'})
+        catalogues_changed(data, ['items[1].army', 'items[3]', 'roundNum'])
+        assert resets == ['items']
+        assert model.rowCount() == 4
+        assert index.query(FieldFilter('army', lambda: ['A'])) == data['items'][:2]
@@ -1,5 +1,9 @@
+from catalogueListModel import catalogue_model
 from comboBoxWidget import ComboBoxWidget
+from jsonEvents import emit_json_changes
 from PySide6.QtWidgets import QApplication
+from pymitter import EventEmitter
+from scoreboard import build_field_test
 
 
 class TestComboBoxWidget:
@@ -100,3 +104,76 @@ class TestComboBoxWidget:
 
         assert widget.current_item == 'Item 1'
         assert widget.comboBox.currentText() == 'Item 1'
+
+    def test_dependency_changed(self):
+        ee = EventEmitter()
+        json_data = {
+            'left': {'armyName': 'A', 'secondary': 'Item 1'},
+            'right': {'armyName': 'A', 'secondary': 'Item 1'},
+            'inputs': [{'name': 'Item 1', 'armyType': 'A'}, {'name': 'Item 2', 'armyType': 'B'},
+                       {'name': 'Item 3'}],
+        }
+        left = ComboBoxWidget("left", json_data, 'left.secondary', json_data, 'inputs',
+                              build_field_test('armyType', json_data, 'left.armyName'))
+        right = ComboBoxWidget("right", json_data, 'right.secondary', json_data, 'inputs',
+                               build_field_test('armyType', json_data, 'right.armyName'))
+        left.subscribe(ee)
+        right.subscribe(ee)
+        assert left.comboBox.count() == 2
+
+        # Only the combo filtering on the changed army picks it up
+        json_data['left']['armyName'] = 'B'
+        emit_json_changes(ee, [('left.armyName', 'A', 'B')])
+        assert [left.comboBox.itemText(i) for i in range(left.comboBox.count())] == ['Item 2', 'Item 3']
+        assert right.comboBox.count() == 2
+
+        # Nothing is emitted for a value that didn't change
+        json_data['right']['armyName'] = 'B'
+        emit_json_changes(ee, [('right.armyName', 'B', 'B')])
+        assert right.comboBox.count() == 2
+
+        left.unsubscribe()
+        json_data['left']['armyName'] = 'A'
+        emit_json_changes(ee, [('left.armyName', 'B', 'A')])
+        assert left.comboBox.count() == 2
+        assert left.comboBox.itemText(0) == 'Item 2'
+
+    def test_shared_catalogue(self):
+        json_data = {
+            'left': {'armyName': 'A', 'secondary': 'Item 1'},
+            'right': {'armyName': 'B', 'secondary': 'Item 2'},
+            'inputs': [{'name': 'Item 1', 'armyType': 'A'}, {'name': 'Item 2', 'armyType': 'B'},
+                       {'name': 'Item 3'}],
+        }
+        left = ComboBoxWidget("left", json_data, 'left.secondary', json_data, 'inputs',
+                              build_field_test('armyType', json_data, 'left.armyName'))
+        right = ComboBoxWidget("right", json_data, 'right.secondary', json_data, 'inputs',
+                               build_field_test('armyType', json_data, 'right.armyName'))
+
+        # Both combos show the one model of the catalogue
+        model = catalogue_model(json_data, 'inputs')
+        assert left.comboBox.model().source_model is model
+        assert right.comboBox.model().source_model is model
+
+        # Edits to the catalogue show in every combo they pass the filter of
+        model.append_object({'name': 'Item 4', 'armyType': 'B'})
+        assert [left.comboBox.itemText(i) for i in range(left.comboBox.count())] == ['Item 1', 'Item 3']
+        assert [right.comboBox.itemText(i) for i in range(right.comboBox.count())] == ['Item 2', 'Item 3', 'Item 4']
+        json_data['inputs'][2]['armyType'] = 'B'
+        model.object_changed(json_data['inputs'][2])
+        assert left.comboBox.count() == 1
+        assert right.comboBox.count() == 3
+
+        # The selection stays when other rows come and go
+        assert right.comboBox.currentText() == 'Item 2'
+        model.remove_row(0)
+        assert right.comboBox.currentText() == 'Item 2'
+        assert right.current_item == 'Item 2'
+
+        # and the first item is picked when it is gone
+        assert left.comboBox.count() == 0
+        model.append_object({'name': 'Item 5'})
+        assert left.comboBox.currentText() == 'Item 5'
+        model.remove_row(0)
+        assert right.comboBox.currentText() == 'Item 3'
+        assert right.current_item == 'Item 3'
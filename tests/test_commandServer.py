@@ -0,0 +1,76 @@
+import subprocess
+import sys
+import time
+import unittest
+import uuid
+from os import path
+
+from commandServer import CommandServer, send_commands
+from PySide6.QtNetwork import QLocalSocket
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+
+class CommandServerTest(unittest.TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self) -> None:
+        self.batches = []
+        self.name = "score-control-test-" + uuid.uuid4().hex[:8]
+        self.server = CommandServer(self.handle, self.name)
+        self.assertTrue(self.server.start())
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def handle(self, lines: list):
+        self.batches.append(lines)
+        return "error: no" if lines[0] == "fail" else "ok"
+
+    @staticmethod
+    def wait_for(condition, timeout: float = 2.0):
+        end = time.monotonic() + timeout
+        while not condition() and time.monotonic() < end:
+            QTest.qWait(10)
+
+    def test_batches(self):
+        socket = QLocalSocket()
+        socket.connectToServer(self.name)
+        self.assertTrue(socket.waitForConnected(1000))
+        socket.write(b"inc left.commandPoints 1\r\nset_active left\n\nfail\n\n")
+        replies = []
+        self.wait_for(lambda: replies.append(bytes(socket.readAll().data())) or b"".join(replies).count(b"\n") == 2)
+        self.assertEqual(b"ok\nerror: no\n", b"".join(replies))
+        self.assertEqual([["inc left.commandPoints 1", "set_active left"], ["fail"]], self.batches)
+
+        # What is left when the client goes is run too
+        socket.write(b"reset\n")
+        socket.flush()
+        socket.disconnectFromServer()
+        self.wait_for(lambda: len(self.batches) == 3)
+        self.assertEqual(["reset"], self.batches[-1])
+
+    def test_second_launch(self):
+        # Another process hands its commands over and gets the reply
+        code = ("import sys; from commandServer import send_commands; "
+                "print(send_commands(sys.argv[1:], " + repr(self.name) + "))")
+        process = subprocess.Popen([sys.executable, "-c", code, "round 2", "order TOP"], stdout=subprocess.PIPE,
+                                   text=True, cwd=path.dirname(path.dirname(path.abspath(__file__))))
+        self.wait_for(lambda: process.poll() is not None, 10.0)
+        self.assertEqual("ok", process.stdout.read().strip())
+        self.assertEqual([["round 2", "order TOP"]], self.batches)
+
+    def test_not_running(self):
+        self.assertIsNone(send_commands(["reset"], self.name + "-missing", 100))
+
+    def test_one_instance(self):
+        other = CommandServer(self.handle, self.name)
+        self.assertFalse(other.start())
+        other.stop()
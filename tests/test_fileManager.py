@@ -1,6 +1,10 @@
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open, Mock, MagicMock
 from fileManager import FileManager
+from writeBehindWriter import WriteBehindWriter
 import pydash
 
 
@@ -25,20 +29,41 @@ class FileManagerTest(unittest.TestCase):
         open_mock = mock_open(
             read_data=testData
         )
-        with patch("fileManager.open", open_mock, create=True):
+        with patch("fileManager.open", open_mock, create=True), \
+                patch("writeBehindWriter.atomic_write") as write_mock:
             # create a file manager, update the data, write it out
             fileMan = FileManager('test-file.json')
-            data = fileMan.get_json_data()
-            pydash.set_(data, 'left.armyName', 'elf')
+            fileMan.set('left.armyName', 'elf')
+            self.assertTrue(fileMan.is_dirty())
             fileMan.write_file()
 
         # Check with the mock that all was correct
-        open_mock.assert_called_with('test-file.json', 'w')
         self.assertNotEqual(fileMan.jsonData, testDataObj)
         self.assertEqual(fileMan.jsonData, updateDataObj)
-        handle = open_mock()
-        handle.write.assert_called_once()
-        handle.write.assert_called_with(updateData)
+        write_mock.assert_called_once_with('test-file.json', updateData)
+        self.assertFalse(fileMan.is_dirty())
+
+    @patch('fileManager.path.isfile')
+    def test_cleanFileNotWritten(self, mock_isfile_call):
+        mock_isfile_call.return_value = MagicMock(True)
+        open_mock = mock_open(
+            read_data='{"left": {"playerName": "Dru" }}'
+        )
+        with patch("fileManager.open", open_mock, create=True), \
+                patch("writeBehindWriter.atomic_write") as write_mock:
+            fileMan = FileManager('test-file.json')
+            self.assertFalse(fileMan.is_dirty())
+            fileMan.write_file()
+
+            # editing in place is only saved once flagged
+            pydash.set_(fileMan.get_json_data(), 'left.armyName', 'elf')
+            fileMan.write_file()
+            write_mock.assert_not_called()
+
+            fileMan.mark_dirty()
+            fileMan.write_file()
+        write_mock.assert_called_once()
+        self.assertEqual('elf', fileMan.get('left.armyName'))
 
     def test_missingFile(self):
         m = Mock()
@@ -57,7 +82,8 @@ class FileManagerTest(unittest.TestCase):
         open_mock = mock_open(
             read_data=fileData
         )
-        with patch("fileManager.open", open_mock, create=True):
+        with patch("fileManager.open", open_mock, create=True), \
+                patch("writeBehindWriter.atomic_write") as write_mock:
             fileMan = FileManager('test-file.txt')
             data = fileMan.get_json_data()
             if isinstance(data, dict):
@@ -65,8 +91,368 @@ class FileManagerTest(unittest.TestCase):
             fileMan.write_file()
 
         self.assertEqual(fileMan.is_valid(), False)
-        handle = open_mock()
-        handle.write.assert_not_called()
+        write_mock.assert_not_called()
+
+
+class SplitFileManagerTest(unittest.TestCase):
+    layout = [{"name": "factions", "keys": ["factions"], "saveInterval": 60.0}]
+
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'score.json')
+        self.factionsPath = os.path.join(self.tempDir.name, 'score.factions.json')
+        with open(self.filePath, 'w') as f:
+            json.dump({'left': {'playerName': 'Dru'}, 'factions': [{'name': 'elf'}]}, f)
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def read(self, file_path):
+        with open(file_path) as f:
+            return json.load(f)
+
+    def test_splitOldFile(self):
+        fileMan = FileManager(self.filePath, self.layout)
+        self.assertTrue(fileMan.is_dirty())
+        self.assertEqual([{'name': 'elf'}], fileMan.get('factions'))
+
+        # first save moves the catalogue out of the main file
+        fileMan.write_file(force=True)
+        self.assertEqual({'left': {'playerName': 'Dru'}}, self.read(self.filePath))
+        self.assertEqual({'factions': [{'name': 'elf'}]}, self.read(self.factionsPath))
+
+        # and reading it back puts it together again
+        fileMan = FileManager(self.filePath, self.layout)
+        self.assertFalse(fileMan.is_dirty())
+        self.assertEqual([{'name': 'elf'}], fileMan.get('factions'))
+
+    def test_separateDirtyFlags(self):
+        fileMan = FileManager(self.filePath, self.layout)
+        fileMan.write_file(force=True)
+        main_doc, factions_doc = fileMan.documents
+
+        fileMan.set('left.armyName', 'elf')
+        self.assertTrue(fileMan.is_dirty(main_doc))
+        self.assertFalse(fileMan.is_dirty(factions_doc))
+
+        # the catalogue waits for its save interval unless forced
+        fileMan.get_json_data()['factions'].append({'name': 'dwarf'})
+        fileMan.mark_dirty('factions')
+        fileMan.write_file()
+        self.assertFalse(fileMan.is_dirty(main_doc))
+        self.assertTrue(fileMan.is_dirty(factions_doc))
+        self.assertEqual('elf', self.read(self.filePath)['left']['armyName'])
+        self.assertEqual(1, len(self.read(self.factionsPath)['factions']))
+
+        fileMan.write_file(force=True)
+        self.assertFalse(fileMan.is_dirty())
+        self.assertEqual(2, len(self.read(self.factionsPath)['factions']))
+
+    def test_coalescedWrites(self):
+        fileMan = FileManager(self.filePath, write_window=60.0)
+
+        # a burst of changes inside the window is one write
+        for score in range(5):
+            fileMan.set('left.score', score)
+        fileMan.write_file()
+        self.assertEqual(0, fileMan.writer.writesIssued)
+        self.assertEqual(4, fileMan.writer.writesCoalesced)
+
+        fileMan.write_file(force=True)
+        self.assertEqual(1, fileMan.writer.writesIssued)
+        self.assertEqual(4, self.read(self.filePath)['left']['score'])
+
+    def test_transaction(self):
+        fileMan = FileManager(self.filePath, self.layout)
+        fileMan.write_file(force=True)
+        writes = fileMan.writer.writesIssued
+        notified = []
+        fileMan.add_listener(notified.append)
+
+        with fileMan.transaction() as changes:
+            fileMan.set('left.score', 1)
+            with fileMan.transaction():
+                fileMan.set('left.score', 2)
+                fileMan.set('left.playerName', 'Dru')
+            # values are there straight away, but not saved or passed on
+            self.assertEqual(2, fileMan.get('left.score'))
+            self.assertFalse(fileMan.is_dirty())
+            self.assertEqual([], notified)
+        self.assertEqual([('left.score', None, 2)], changes)
+        self.assertEqual([changes], notified)
+
+        # one save of the one file that changed
+        self.assertEqual(0, fileMan.writer.writesCoalesced)
+        fileMan.write_file()
+        self.assertEqual(writes + 1, fileMan.writer.writesIssued)
+        self.assertEqual(2, self.read(self.filePath)['left']['score'])
+
+    def test_transactionRollBack(self):
+        fileMan = FileManager(self.filePath, self.layout)
+        fileMan.write_file(force=True)
+        notified = []
+        fileMan.add_listener(notified.append)
+
+        with self.assertRaises(RuntimeError):
+            with fileMan.transaction():
+                fileMan.set('left.playerName', 'Sam')
+                fileMan.set('left.playerName', 'Max')
+                raise RuntimeError()
+        self.assertEqual('Dru', fileMan.get('left.playerName'))
+        self.assertFalse(fileMan.is_dirty())
+        self.assertEqual([], notified)
+
+    # A listener that raises doesn't stop the others or undo the change
+    @patch('fileManager.sys.excepthook')
+    def test_transactionListenerRaises(self, excepthook):
+        fileMan = FileManager(self.filePath, self.layout)
+        fileMan.write_file(force=True)
+        notified = []
+
+        def broken(changes):
+            raise RuntimeError()
+        fileMan.add_listener(broken)
+        fileMan.add_listener(notified.append)
+
+        with fileMan.transaction() as changes:
+            fileMan.set('left.playerName', 'Sam')
+        self.assertEqual([('left.playerName', 'Dru', 'Sam')], changes)
+        self.assertEqual([changes], notified)
+        self.assertIs(RuntimeError, excepthook.call_args[0][0])
+        self.assertEqual(0, fileMan.notifying)
+
+        fileMan.write_file()
+        self.assertEqual('Sam', self.read(self.filePath)['left']['playerName'])
+
+
+class SharedFileManagerTest(unittest.TestCase):
+    layout = [{"name": "factions", "keys": ["factions"]}]
+
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePaths = []
+        for name in ['table1', 'table2']:
+            file_path = os.path.join(self.tempDir.name, name + '.json')
+            with open(file_path, 'w') as f:
+                json.dump({'left': {'playerName': name}, 'factions': [{'name': name}]}, f)
+            self.filePaths.append(file_path)
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def read(self, file_path):
+        with open(file_path) as f:
+            return json.load(f)
+
+    def test_sharedKeys(self):
+        writer = WriteBehindWriter()
+        owner = FileManager(self.filePaths[0], self.layout, writer=writer)
+        table = FileManager(self.filePaths[1], self.layout, writer=writer, shared_keys={'factions': owner})
+        writer.flush(force=True)
+
+        # one copy of the catalogue, changed through the owner
+        self.assertIs(owner.get('factions'), table.get('factions'))
+        table.set('factions[0].name', 'elf')
+        self.assertEqual('elf', owner.get('factions[0].name'))
+        self.assertTrue(owner.is_dirty())
+        self.assertFalse(table.is_dirty())
+
+        table.set('left.armyName', 'dwarf')
+        self.assertTrue(table.is_dirty())
+        self.assertIsNone(owner.get('left.armyName'))
+
+        # one writer saves both
+        self.assertEqual(2, len(writer.flush()))
+        factions_path = os.path.join(self.tempDir.name, 'table1.factions.json')
+        self.assertEqual('elf', self.read(factions_path)['factions'][0]['name'])
+        self.assertEqual('dwarf', self.read(self.filePaths[1])['left']['armyName'])
+
+
+class ExternalChangeFileManagerTest(unittest.TestCase):
+    layout = [{"name": "factions", "keys": ["factions"]}]
+
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'score.json')
+        self.conflictPath = os.path.join(self.tempDir.name, 'score.conflict.json')
+        self.write({'left': {'playerName': 'Dru', 'score': 1}, 'roundNum': 1})
+        self.fileManager = FileManager(self.filePath, self.layout)
+        self.notified = []
+        self.fileManager.add_listener(lambda changes: self.notified.append((self.fileManager.reloading, changes)))
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    # Another tool replacing the file
+    def write(self, json_data):
+        with open(self.filePath + '.tmp', 'w') as f:
+            json.dump(json_data, f)
+        os.replace(self.filePath + '.tmp', self.filePath)
+
+    def read(self, file_path):
+        with open(file_path) as f:
+            return json.load(f)
+
+    def test_merge(self):
+        self.assertEqual([], self.fileManager.changed_documents())
+        self.write({'left': {'playerName': 'Dru', 'score': 4}, 'roundNum': 1, 'roundOrder': 'TOP'})
+        doc = self.fileManager.documents[0]
+        self.assertEqual([doc], self.fileManager.changed_documents())
+
+        self.assertEqual([], self.fileManager.merge_document(doc, *self.fileManager.read_document(doc)))
+        self.assertEqual(4, self.fileManager.get('left.score'))
+        self.assertEqual('TOP', self.fileManager.get('roundOrder'))
+        # Only what differs is passed on, and it is already on disk
+        self.assertEqual([(True, [('left.score', 1, 4), ('roundOrder', None, 'TOP')])], self.notified)
+        self.assertEqual([], self.fileManager.changed_documents())
+        self.assertFalse(self.fileManager.is_dirty())
+
+        # A key removed by the other tool goes
+        self.write({'left': {'playerName': 'Dru', 'score': 4}, 'roundNum': 1})
+        self.fileManager.merge_document(doc, *self.fileManager.read_document(doc))
+        self.assertNotIn('roundOrder', self.fileManager.get_json_data())
+
+    def test_conflict(self):
+        self.fileManager.set('left.score', 2)
+        self.fileManager.set('roundNum', 3)
+        self.write({'left': {'playerName': 'Bob', 'score': 7}, 'roundNum': 1})
+        doc = self.fileManager.documents[0]
+
+        conflicts = self.fileManager.merge_document(doc, *self.fileManager.read_document(doc))
+        # Our unsaved change is kept, the rest comes in
+        self.assertEqual(['left.score'], conflicts)
+        self.assertEqual(2, self.fileManager.get('left.score'))
+        self.assertEqual('Bob', self.fileManager.get('left.playerName'))
+        self.assertEqual(3, self.fileManager.get('roundNum'))
+        self.assertEqual(7, self.read(self.conflictPath)['left']['score'])
+
+        self.fileManager.write_file(force=True)
+        self.assertEqual({'left': {'playerName': 'Bob', 'score': 2}, 'roundNum': 3}, self.read(self.filePath))
+
+    def test_conflictEscapedKey(self):
+        # json_diff writes a bracket in a key escaped, the widgets don't
+        location = 'left.40kRoundScores[{roundIndex}].secondaryName0'
+        self.write({'left': {'playerName': 'Dru', 'score': 1, '40kRoundScores[{roundIndex}]': {}}, 'roundNum': 1})
+        doc = self.fileManager.documents[0]
+        self.fileManager.merge_document(doc, *self.fileManager.read_document(doc))
+        self.fileManager.set(location, 'Secondary 1')
+        self.write({'left': {'playerName': 'Dru', 'score': 1,
+                             '40kRoundScores[{roundIndex}]': {'secondaryName0': 'Secondary 4'}}, 'roundNum': 1})
+
+        conflicts = self.fileManager.merge_document(doc, *self.fileManager.read_document(doc))
+        self.assertEqual(1, len(conflicts))
+        self.assertEqual('Secondary 1', self.fileManager.get(location))
+        self.assertEqual('Secondary 4', self.read(self.conflictPath)['left']['40kRoundScores[{roundIndex}]']
+                         ['secondaryName0'])
+
+    def test_writeMergesFirst(self):
+        # A save never writes over a change it hasn't seen
+        self.fileManager.set('roundNum', 2)
+        self.write({'left': {'playerName': 'Bob', 'score': 1}, 'roundNum': 1})
+        self.fileManager.write_file(force=True)
+        self.assertEqual({'left': {'playerName': 'Bob', 'score': 1}, 'roundNum': 2}, self.read(self.filePath))
+        self.assertEqual([], self.fileManager.changed_documents())
+
+    def test_notJson(self):
+        with open(self.filePath, 'w') as f:
+            f.write('{"left": ')
+        self.fileManager.set('roundNum', 2)
+        self.fileManager.write_file(force=True)
+        with open(self.conflictPath) as f:
+            self.assertEqual('{"left": ', f.read())
+        self.assertEqual(2, self.read(self.filePath)['roundNum'])
+
+    def test_listsChangeInPlace(self):
+        factions = self.fileManager.get('factions')
+        self.assertIsNone(factions)
+        self.fileManager.set('factions', [{'name': 'elf'}])
+        self.fileManager.write_file(force=True)
+        factions = self.fileManager.get('factions')
+
+        factions_path = os.path.join(self.tempDir.name, 'score.factions.json')
+        with open(factions_path, 'w') as f:
+            json.dump({'factions': [{'name': 'elf'}, {'name': 'dwarf'}]}, f)
+        doc = self.fileManager.documents[1]
+        self.fileManager.merge_document(doc, *self.fileManager.read_document(doc))
+        self.assertIs(factions, self.fileManager.get('factions'))
+        self.assertEqual(2, len(factions))
+        self.assertEqual(('factions', [{'name': 'elf'}], factions), self.notified[-1][1][0])
+
+
+class JournalFileManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'score.json')
+        self.journalPath = os.path.join(self.tempDir.name, 'score.journal.jsonl')
+        self.historyPath = os.path.join(self.tempDir.name, 'score.history.jsonl')
+        with open(self.filePath, 'w') as f:
+            json.dump({'left': {'playerName': 'Dru'}}, f)
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def read(self, file_path):
+        with open(file_path) as f:
+            return f.read()
+
+    def test_changesAreAppended(self):
+        fileMan = FileManager(self.filePath, journal=True)
+        snapshot = self.read(self.filePath)
+        fileMan.set('left.playerName', 'Bob')
+        fileMan.set('left.rounds[1].score', 3)
+        fileMan.write_file(force=True)
+
+        # the snapshot is left alone and each change is a line in the journal
+        self.assertEqual(snapshot, self.read(self.filePath))
+        self.assertEqual(2, len(self.read(self.journalPath).splitlines()))
+
+        fileMan.set('left.rounds[1].score', 4)
+        fileMan.write_file(force=True)
+        self.assertEqual(3, len(self.read(self.journalPath).splitlines()))
+
+        # reading back replays the journal over the snapshot
+        fileMan = FileManager(self.filePath, journal=True)
+        self.assertEqual({'left': {'playerName': 'Bob', 'rounds': [None, {'score': 4}]}}, fileMan.get_json_data())
+
+    def test_tornLineIsSkipped(self):
+        fileMan = FileManager(self.filePath, journal=True)
+        fileMan.set('left.playerName', 'Bob')
+        fileMan.write_file(force=True)
+        with open(self.journalPath, 'a') as f:
+            f.write('{"seq": 2, "patch": [{"op": "repl')
+
+        fileMan = FileManager(self.filePath, journal=True)
+        self.assertEqual('Bob', fileMan.get('left.playerName'))
+
+    def test_compaction(self):
+        fileMan = FileManager(self.filePath, journal=True)
+        fileMan.documents[0].journal.compactEntries = 3
+        for score in range(4):
+            fileMan.set('left.score', score)
+            fileMan.write_file(force=True)
+
+        # the third entry compacted the journal into the snapshot and history
+        self.assertEqual(2, json.loads(self.read(self.filePath))['left']['score'])
+        self.assertEqual(1, len(self.read(self.journalPath).splitlines()))
+        history = fileMan.documents[0].journal.history()
+        self.assertEqual([1, 2, 3, 4], [entry['seq'] for entry in history])
+
+        fileMan.compact_journals()
+        fileMan.write_file(force=True)
+        self.assertEqual('', self.read(self.journalPath))
+        self.assertEqual(3, FileManager(self.filePath, journal=True).get('left.score'))
+        self.assertEqual(4, len(self.read(self.historyPath).splitlines()))
+
+    def test_replayedJournalIsCompacted(self):
+        fileMan = FileManager(self.filePath, journal=True)
+        fileMan.set('left.playerName', 'Bob')
+        fileMan.write_file(force=True)
+
+        fileMan = FileManager(self.filePath, journal=True)
+        self.assertTrue(fileMan.is_dirty())
+        fileMan.write_file(force=True)
+        self.assertEqual('Bob', json.loads(self.read(self.filePath))['left']['playerName'])
+        self.assertEqual('', self.read(self.journalPath))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from fileManager import FileManager
+from fileWatcher import FileWatcher
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+
+class FileWatcherTest(unittest.TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'scoreboard.json')
+        self.write({'left': {'score': 1}, 'roundNum': 1})
+        self.fileManager = FileManager(self.filePath)
+        self.watcher = FileWatcher(self.fileManager, delay=10)
+        self.conflicts = []
+        self.watcher.conflicted.connect(lambda file_path, locations: self.conflicts.append(locations))
+
+    def tearDown(self) -> None:
+        self.watcher.stop()
+        self.tempDir.cleanup()
+
+    @staticmethod
+    def wait_for(condition, timeout: float = 2.0):
+        end = time.monotonic() + timeout
+        while not condition() and time.monotonic() < end:
+            QTest.qWait(10)
+
+    def write(self, json_data):
+        with open(self.filePath + '.tmp', 'w') as f:
+            json.dump(json_data, f)
+        os.replace(self.filePath + '.tmp', self.filePath)
+
+    def test_reload(self):
+        self.write({'left': {'score': 5}, 'roundNum': 1})
+        self.wait_for(lambda: self.fileManager.get('left.score') == 5)
+        self.assertEqual(5, self.fileManager.get('left.score'))
+        self.assertFalse(self.fileManager.is_dirty())
+
+        # Our own saves are left alone, and the file is still followed after them
+        self.fileManager.set('roundNum', 2)
+        self.fileManager.write_file(force=True)
+        QTest.qWait(50)
+        self.assertEqual([], self.fileManager.changed_documents())
+        self.write({'left': {'score': 6}, 'roundNum': 2})
+        self.wait_for(lambda: self.fileManager.get('left.score') == 6)
+        self.assertEqual(6, self.fileManager.get('left.score'))
+
+        # Editors that write the file in place
+        with open(self.filePath, 'w') as f:
+            json.dump({'left': {'score': 7}, 'roundNum': 2}, f)
+        self.wait_for(lambda: self.fileManager.get('left.score') == 7)
+        self.assertEqual(7, self.fileManager.get('left.score'))
+
+    def test_conflict(self):
+        self.fileManager.set('left.score', 2)
+        self.write({'left': {'score': 3}, 'roundNum': 1})
+        self.wait_for(lambda: len(self.conflicts) > 0)
+        self.assertEqual([['left.score']], self.conflicts)
+        self.assertEqual(2, self.fileManager.get('left.score'))
@@ -0,0 +1,272 @@
+import functools
+import json
+import os
+import tempfile
+import unittest
+
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+from pymitter import EventEmitter
+
+import gameSystems
+from fileManager import FileManager
+from gameSystems import catalogue_keys, game_system_for, register_game_system
+from jsonEvents import emit_json_changes
+from playerDetailsWidget import PlayerDetailsWidget
+from scoreboard import Scoreboard, build_side_layout
+from scoreCommands import run_commands
+
+
+class GameSystemsTest(unittest.TestCase):
+    def test_known_types(self):
+        self.assertEqual("40k", game_system_for("40k").dataType)
+        self.assertEqual("sigmar", game_system_for("sigmar").dataType)
+        self.assertIsNone(game_system_for("chess"))
+        self.assertIsNone(game_system_for(None))
+
+    def test_register(self):
+        register_game_system("test40k", "game40k")
+        self.addCleanup(gameSystems.GAME_SYSTEM_MODULES.pop, "test40k")
+        self.assertIs(game_system_for("40k"), game_system_for("test40k"))
+
+    def test_catalogue_keys(self):
+        register_game_system("test40k", "game40k")
+        self.addCleanup(gameSystems.GAME_SYSTEM_MODULES.pop, "test40k")
+        self.assertEqual(["40kPrimaryObjectives", "40kSecondaryObjectives", "40kFactions", "sigmarGrandStrategies",
+                          "sigmarBattleTraits", "sigmarFactions"], catalogue_keys())
+
+    def test_side_layouts(self):
+        game_system = game_system_for("sigmar")
+        player_layout = game_system.player_layout("right", "Right")
+        self.assertEqual("Right Player", player_layout[0]["label"])
+        self.assertEqual("right.grandStrategyName", player_layout[3]["jsonLocation"])
+
+        round_layout = game_system.round_layout("left", "Left", 2)
+        self.assertEqual("Round 3 Primary", round_layout[0]["label"])
+        self.assertEqual("left.aosRoundScores[2].primaryScore", round_layout[0]["jsonLocation"])
+
+        # The game system's own layout is left alone
+        self.assertEqual("{side}.playerName", game_system.playerLayout[0]["jsonLocation"])
+
+    def test_army_filter(self):
+        json_data = {'left': {'armyName': 'Orks'}}
+        side_layout = game_system_for("sigmar").player_layout("left", "Left")
+        layout = build_side_layout(side_layout, json_data, "left")
+        filter_func = layout[3]["filterFunc"]
+        self.assertNotIn("armyFilter", layout[3])
+        # Building the filters doesn't change the layout they came from
+        self.assertEqual("armyType", side_layout[3]["armyFilter"])
+        self.assertNotIn("filterFunc", side_layout[3])
+        self.assertTrue(filter_func({'name': 'Any', 'armyType': ''}))
+        self.assertTrue(filter_func({'name': 'Waagh', 'armyType': 'Orks'}))
+        self.assertFalse(filter_func({'name': 'Other', 'armyType': 'Eldar'}))
+
+    def test_text_exports(self):
+        exports = game_system_for("sigmar").textExports
+        files = [export["file"] for export in exports]
+        self.assertIn("LeftGrandStrategy.txt", files)
+        self.assertIn("RightTotalScore.txt", files)
+        self.assertNotIn("LeftGrandStrategy.txt", [export["file"] for export in game_system_for("40k").textExports])
+
+        total = [export for export in exports if export["file"] == "LeftTotalScore.txt"][0]
+        self.assertEqual("left.totalScore", total["jsonLocation"])
+
+
+class PlayerDetailsWidgetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super(PlayerDetailsWidgetTest, self).setUp()
+        if isinstance(QApplication.instance(), type(None)):
+            self.app = QApplication()
+        else:
+            self.app = QApplication.instance()
+
+    def tearDown(self) -> None:
+        del self.app
+        return super(PlayerDetailsWidgetTest, self).tearDown()
+
+    def test_build(self):
+        file_manager = FileManager("")
+        file_manager.jsonData = {'dataType': '40k', 'left': {}, 'right': {}, '40kFactions': [],
+                                 '40kSecondaryObjectives': [{'name': '------'}]}
+        widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("40k")), EventEmitter())
+        self.assertEqual([5, 5], [selector.count() for selector in widget.round_selectors])
+        # Rounds are set up before their tabs are built
+        self.assertEqual(0, file_manager.get("right.40kRoundScores[4].secondaryScore2"))
+
+        widget.right_player_active()
+        self.assertEqual("ACTIVE", file_manager.get("right.playerStatus"))
+        self.assertEqual("", file_manager.get("left.playerStatus"))
+
+    def test_single_round_editor(self):
+        file_manager = FileManager("")
+        file_manager.jsonData = {'dataType': '40k', 'roundNum': 2, 'left': {}, 'right': {}, '40kFactions': [],
+                                 '40kSecondaryObjectives': [{'name': '------'}]}
+        widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("40k")), EventEmitter(),
+                                     single_round_editor=True)
+        # One set of round widgets per player, with a round picked for each,
+        # and the round number
+        self.assertEqual(2 * (6 + 4) + 1, len(widget.widget_list))
+        self.assertEqual([5, 5], [selector.count() for selector in widget.round_selectors])
+        primary = [w for w in widget.widget_list
+                   if getattr(w, "jsonLocation", None) == "left.40kRoundScores[0].primaryScore"][0]
+        count = len(widget.findChildren(QObject))
+
+        widget.round_selectors[0].setCurrentIndex(3)
+        self.assertEqual("left.40kRoundScores[3].primaryScore", primary.jsonLocation)
+        self.assertEqual("Round 4 Primary", primary.label.text())
+        primary.add_five_pressed()
+        self.assertEqual(5, file_manager.get("left.40kRoundScores[3].primaryScore"))
+        self.assertEqual(0, file_manager.get("left.40kRoundScores[0].primaryScore"))
+        # Nothing new was made
+        self.assertEqual(count, len(widget.findChildren(QObject)))
+
+        # Resets and undos show in the round being edited
+        widget.reset_scores()
+        self.assertEqual("0", primary.textBox.text())
+        widget.undo()
+        self.assertEqual("5", primary.textBox.text())
+
+    def test_follow_round(self):
+        for single_round_editor in [False, True]:
+            file_manager = FileManager("")
+            file_manager.jsonData = {'dataType': '40k', 'roundNum': 2, 'left': {}, 'right': {}, '40kFactions': [],
+                                     '40kSecondaryObjectives': [{'name': '------'}]}
+            ee = EventEmitter()
+            file_manager.add_listener(functools.partial(emit_json_changes, ee))
+            widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("40k")), ee,
+                                         single_round_editor=single_round_editor, follow_round=True)
+            self.assertEqual([1, 1], [selector.currentIndex() for selector in widget.round_selectors])
+            file_manager.set("roundNum", 4)
+            self.assertEqual([3, 3], [selector.currentIndex() for selector in widget.round_selectors])
+            file_manager.set("roundNum", 9)
+            self.assertEqual([4, 4], [selector.currentIndex() for selector in widget.round_selectors])
+
+            # A stopped widget doesn't follow the file manager any more
+            widget.stop()
+            for listener in [widget.update_undo_buttons, widget.json_reloaded, widget.undo_stack.json_changed]:
+                self.assertNotIn(listener, file_manager.listeners)
+            file_manager.set("roundNum", 1)
+            self.assertEqual([4, 4], [selector.currentIndex() for selector in widget.round_selectors])
+
+    def test_undo_reset(self):
+        file_manager = FileManager("")
+        file_manager.jsonData = {'dataType': 'sigmar', 'left': {'playerName': 'Dru'}, 'right': {},
+                                 'sigmarFactions': [], 'sigmarGrandStrategies': [],
+                                 'sigmarBattleTraits': [{'name': '------'}]}
+        widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("sigmar")), EventEmitter())
+        self.assertFalse(widget.undo_button.isEnabled())
+        command_points = [w for w in widget.widget_list if getattr(w, "jsonLocation", None) == "left.commandPoints"][0]
+        command_points.add_five_pressed()
+        file_manager.set("left.aosRoundScores[2].bonusScore", 3)
+
+        # The totals follow on from the reset in a notification of their own
+        notified = []
+        file_manager.add_listener(lambda changes: notified.append(changes) if file_manager.notifying == 1 else None)
+        widget.reset_scores()
+        self.assertEqual(0, file_manager.get("left.commandPoints"))
+        self.assertEqual("0", command_points.textBox.text())
+        # All of the reset is passed on at once
+        self.assertEqual(1, len(notified))
+        self.assertEqual(0, file_manager.get("left.aosRoundScores[2].bonusScore"))
+
+        # The whole reset comes back in one undo, and the widgets show it
+        notified.clear()
+        widget.undo()
+        self.assertEqual(1, len(notified))
+        self.assertEqual(5, file_manager.get("left.commandPoints"))
+        self.assertEqual("5", command_points.textBox.text())
+        self.assertEqual(3, file_manager.get("left.aosRoundScores[2].bonusScore"))
+        self.assertTrue(widget.redo_button.isEnabled())
+
+        widget.undo()
+        self.assertEqual(0, file_manager.get("left.aosRoundScores[2].bonusScore"))
+        widget.undo()
+        self.assertEqual("0", command_points.textBox.text())
+        self.assertFalse(widget.undo_button.isEnabled())
+
+    def test_undo_round(self):
+        file_manager = FileManager("")
+        file_manager.jsonData = {'dataType': 'sigmar', 'roundNum': 1, 'left': {}, 'right': {},
+                                 'sigmarFactions': [], 'sigmarGrandStrategies': [],
+                                 'sigmarBattleTraits': [{'name': '------'}]}
+        widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("sigmar")), EventEmitter())
+        round_num = [w for w in widget.widget_list if getattr(w, "jsonLocation", None) == "roundNum"][0]
+        round_num.add_one_pressed()
+        self.assertEqual("2", round_num.textBox.text())
+
+        # The round box follows an undo, so the next press starts from it
+        widget.undo()
+        self.assertEqual(1, file_manager.get("roundNum"))
+        self.assertEqual("1", round_num.textBox.text())
+        round_num.add_one_pressed()
+        self.assertEqual(2, file_manager.get("roundNum"))
+
+        # and changes made other than through it
+        widget.show_changes(run_commands(widget.scoreboard, ["round 4"]))
+        self.assertEqual("4", round_num.textBox.text())
+
+    def test_reload(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "sigmar.json")
+            json_data = {'dataType': 'sigmar', 'left': {'playerName': 'Dru'}, 'right': {}, 'sigmarFactions': [],
+                         'sigmarGrandStrategies': [], 'sigmarBattleTraits': [{'name': '------'}]}
+            with open(file_path, "w") as f:
+                json.dump(json_data, f)
+            file_manager = FileManager(file_path)
+            widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("sigmar")), EventEmitter())
+            file_manager.write_file(force=True)
+            command_points = [w for w in widget.widget_list
+                              if getattr(w, "jsonLocation", None) == "left.commandPoints"][0]
+
+            # Another tool changes the file, the widgets and totals follow and
+            # it isn't something to undo
+            with open(file_path) as f:
+                json_data = json.load(f)
+            json_data["left"]["commandPoints"] = 3
+            json_data["left"]["aosRoundScores"][0]["primaryScore"] = 4
+            with open(file_path, "w") as f:
+                json.dump(json_data, f)
+            doc = file_manager.documents[0]
+            file_manager.merge_document(doc, *file_manager.read_document(doc))
+            self.assertEqual("3", command_points.textBox.text())
+            self.assertEqual(4, file_manager.get("left.totalScore"))
+            self.assertFalse(widget.undo_button.isEnabled())
+
+            # New catalogue items show up in the combos picking from them
+            strategy = [w for w in widget.widget_list
+                        if getattr(w, "out_json_location", None) == "left.grandStrategyName"][0]
+            self.assertEqual(0, strategy.comboBox.count())
+            json_data["sigmarGrandStrategies"].append({"name": "Take and Hold"})
+            with open(file_path, "w") as f:
+                json.dump(json_data, f)
+            file_manager.merge_document(doc, *file_manager.read_document(doc))
+            self.assertEqual("Take and Hold", strategy.comboBox.currentText())
+
+    def test_reload_escaped_key(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "40k.json")
+            json_data = {'dataType': '40k', 'left': {'40kRoundScores[{roundIndex}]': {'secondaryName0': 'Secondary 0'}},
+                         'right': {}, '40kFactions': [],
+                         '40kSecondaryObjectives': [{'name': 'Secondary 0'}, {'name': 'Secondary 4'}]}
+            with open(file_path, "w") as f:
+                json.dump(json_data, f)
+            file_manager = FileManager(file_path)
+            widget = PlayerDetailsWidget(Scoreboard(file_manager, game_system_for("40k")), EventEmitter())
+            file_manager.write_file(force=True)
+            # The main column's secondaries have a bracket in their key
+            location = "left.40kRoundScores[{roundIndex}].secondaryName0"
+            secondary = [w for w in widget.widget_list if getattr(w, "out_json_location", None) == location][0]
+            self.assertEqual("Secondary 0", secondary.comboBox.currentText())
+
+            with open(file_path) as f:
+                json_data = json.load(f)
+            json_data["left"]["40kRoundScores[{roundIndex}]"]["secondaryName0"] = "Secondary 4"
+            with open(file_path, "w") as f:
+                json.dump(json_data, f)
+            doc = file_manager.documents[0]
+            file_manager.merge_document(doc, *file_manager.read_document(doc))
+            self.assertEqual("Secondary 4", secondary.comboBox.currentText())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from integerWidget import IntegerWidget
+from fileManager import FileManager
 from PySide6.QtTest import QTest
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
@@ -107,6 +108,15 @@ class IntegerWidgetTestCase(unittest.TestCase):
         self.assertEqual("0", widget.textBox.text())
         self.assertEqual(0, widget.jsonBlob["index"])
 
+    def test_file_manager_writes(self):
+        file_manager = FileManager("")
+        file_manager.jsonData = {"index": 10}
+        widget = IntegerWidget("integer", file_manager.get_json_data(), "index", file_manager=file_manager)
+        self.assertFalse(file_manager.is_dirty())
+
+        QTest.mouseClick(widget.addOneBtn, Qt.LeftButton)
+        self.assertEqual(11, file_manager.get("index"))
+        self.assertTrue(file_manager.is_dirty())
 
 
 if __name__ == '__main__':
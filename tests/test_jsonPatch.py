@@ -0,0 +1,71 @@
+import unittest
+
+from jsonPatch import apply_patch, changes_to_patch, json_diff, json_pointer, JsonPatchError
+
+
+class JsonPatchTest(unittest.TestCase):
+    def test_pointer(self):
+        self.assertEqual('/left/40kRoundScores/3/primaryScore', json_pointer(['left', '40kRoundScores', 3,
+                                                                              'primaryScore']))
+        self.assertEqual('/a~1b/c~0d', json_pointer(['a/b', 'c~d']))
+
+    def test_patch(self):
+        json_data = {'left': {'playerName': 'B', 'rounds': [None, {'score': 1}]}}
+        patch = changes_to_patch(json_data, [('left.playerName', 'A', 'B'), ('left.rounds[1].score', None, 1)])
+        self.assertEqual([
+            {'op': 'replace', 'path': '/left/playerName', 'value': 'B'},
+            {'op': 'add', 'path': '/left', 'value': json_data['left']},
+        ], patch)
+
+        # The value is copied when the patch is made
+        json_data['left']['playerName'] = 'C'
+        self.assertEqual('B', patch[1]['value']['playerName'])
+
+    def test_apply(self):
+        json_data = {'a': {'b': 1}, 'list': [1, 2]}
+        apply_patch(json_data, [
+            {'op': 'replace', 'path': '/a/b', 'value': 2},
+            {'op': 'add', 'path': '/list/1', 'value': 5},
+            {'op': 'add', 'path': '/list/-', 'value': 9},
+            {'op': 'remove', 'path': '/list/0'},
+            {'op': 'copy', 'from': '/a', 'path': '/c'},
+            {'op': 'move', 'from': '/c/b', 'path': '/d'},
+            {'op': 'test', 'path': '/d', 'value': 2},
+        ])
+        self.assertEqual({'a': {'b': 2}, 'list': [5, 2, 9], 'c': {}, 'd': 2}, json_data)
+
+        with self.assertRaises(JsonPatchError):
+            apply_patch(json_data, [{'op': 'test', 'path': '/d', 'value': 3}])
+        with self.assertRaises(JsonPatchError):
+            apply_patch(json_data, [{'op': 'replace', 'path': '/missing/x', 'value': 3}])
+
+    def test_changes_replay(self):
+        # Patches made from changes take a copy of the old data to the new
+        before = {'left': {'playerName': 'A'}}
+        after = {'left': {'playerName': 'B', 'rounds': [None, None, {'score': 3}]}, 'roundNum': 2}
+        patch = changes_to_patch(after, [('left.playerName', 'A', 'B'), ('left.rounds[2].score', None, 3),
+                                         ('roundNum', None, 2)])
+        self.assertEqual(after, apply_patch(before, patch))
+
+        # and applying them again changes nothing
+        self.assertEqual(after, apply_patch(before, patch))
+
+    def test_diff(self):
+        old = {'left': {'playerName': 'A', 'rounds': [{'score': 1}, {'score': 2}]}, 'roundNum': 1, 'gone': 1}
+        new = {'left': {'playerName': 'A', 'rounds': [{'score': 1}, {'score': 5}], 'armyName': 'elf'},
+               'roundNum': True, 'a.b': [1]}
+        self.assertEqual([
+            ('left', old['left'], new['left']),
+            ('roundNum', 1, True),
+            ('gone', 1, None),
+            ('a\\.b', None, [1]),
+        ], json_diff(old, new))
+
+        # Only the deepest locations that changed
+        del new['left']['armyName']
+        self.assertEqual([('left.rounds[1].score', 2, 5)], json_diff(old, new)[:1])
+        self.assertEqual([], json_diff(old, old))
+
+
+if __name__ == '__main__':
+    unittest.main()
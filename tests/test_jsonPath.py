@@ -0,0 +1,77 @@
+import copy
+import unittest
+
+import pydash
+
+from jsonPath import compile_json_path, json_location, json_location_holds, parse_json_path
+
+
+class JsonPathTest(unittest.TestCase):
+    paths = [
+        'left.playerName',
+        'left.40kRoundScores[3].secondaryScore1',
+        'left.40kRoundScores[0].primaryScore',
+        'roundNum',
+        'a[0][1]',
+        'a\\.b.c',
+        'missing.deeper[2]',
+        'left.40kRoundScores[{roundIndex}].secondaryName0',
+        'x["k"]',
+    ]
+    data = {
+        'roundNum': 2,
+        'left': {
+            'playerName': 'Dru',
+            '40kRoundScores': [{'primaryScore': 5}, {}],
+        },
+        'a': [[1, 2]],
+        'a.b': {'c': 'dot'},
+    }
+
+    def test_parse(self):
+        for path in self.paths:
+            self.assertEqual(pydash.utilities.to_path(path), parse_json_path(path), path)
+
+    def test_get_matches_pydash(self):
+        for path in self.paths:
+            self.assertEqual(pydash.get(self.data, path), compile_json_path(path).get(self.data), path)
+        self.assertEqual('default', compile_json_path('missing.deeper').get(self.data, 'default'))
+        self.assertEqual(0, compile_json_path('zero').get({'zero': 0}, 'default'))
+
+    def test_set_matches_pydash(self):
+        for path in self.paths:
+            expected = copy.deepcopy(self.data)
+            pydash.set_(expected, path, 'value')
+            actual = copy.deepcopy(self.data)
+            compile_json_path(path).set(actual, 'value')
+            self.assertEqual(expected, actual, path)
+
+    def test_set_creates_containers(self):
+        data = {}
+        compile_json_path('left.40kRoundScores[2].primaryScore').set(data, 4)
+        self.assertEqual({'left': {'40kRoundScores': [None, None, {'primaryScore': 4}]}}, data)
+
+        with self.assertRaises(TypeError):
+            compile_json_path('left.40kRoundScores[2].primaryScore.x').set(data, 4)
+
+    def test_location_holds(self):
+        self.assertTrue(json_location_holds('left', 'left.playerName'))
+        self.assertTrue(json_location_holds('left.40kRoundScores', 'left.40kRoundScores[3].primaryScore'))
+        self.assertTrue(json_location_holds('left.playerName', 'left.playerName'))
+        self.assertTrue(json_location_holds('', 'roundNum'))
+        self.assertFalse(json_location_holds('left.playerName', 'left'))
+        self.assertFalse(json_location_holds('left.player', 'left.playerName'))
+
+        # The same location written with its bracket escaped, as json_location does
+        location = 'left.40kRoundScores[{roundIndex}].secondaryName0'
+        escaped = json_location(parse_json_path(location))
+        self.assertNotEqual(location, escaped)
+        self.assertTrue(json_location_holds(escaped, location))
+        self.assertTrue(json_location_holds('left.40kRoundScores\\[{roundIndex}]', location))
+
+    def test_cached(self):
+        self.assertIs(compile_json_path('left.playerName'), compile_json_path('left.playerName'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import jsonSerializer
+from jsonSerializer import JsonSerializer, JSON_BACKEND, ORJSON_BACKEND
+
+
+class JsonSerializerTest(unittest.TestCase):
+    values = [
+        {'left': {'playerName': 'Dru', 'armyName': 'elf', '40kRoundScores': [None, {'primaryScore': 5}]}},
+        {'b': [], 'a': {}, 'c': [1, [2, {}]], 'd': True, 'e': None, 'f': -3},
+        {'name': 'Café \U0001F600 \x7f \x1f   "quoted" \\ back\nslash'},
+        {'floats': [1e-07, 1.5, 1e22, 0.1, -0.0, 1e-05, 2.5e16, 123456789.0]},
+        {'text': 'version 1.5e3 of the rules'},
+        {'big': 2 ** 70},
+        {1: 'not a string key'},
+        [],
+        'just text',
+    ]
+
+    def test_prettyMatchesJsonModule(self):
+        for backend in [JSON_BACKEND, ORJSON_BACKEND]:
+            serializer = JsonSerializer(backend)
+            for value in self.values:
+                self.assertEqual(json.dumps(value, sort_keys=True, indent=4), serializer.dumps(value),
+                                 backend + " " + repr(value))
+
+    def test_compact(self):
+        for backend in [JSON_BACKEND, ORJSON_BACKEND]:
+            serializer = JsonSerializer(backend, pretty=False)
+            text = serializer.dumps(self.values[0])
+            self.assertNotIn(" ", text.replace("Dru", ""))
+            self.assertEqual(self.values[0], serializer.loads(text))
+
+    def test_loads(self):
+        for backend in [JSON_BACKEND, ORJSON_BACKEND]:
+            serializer = JsonSerializer(backend)
+            self.assertEqual({'a': [1, 2.5]}, serializer.loads('{"a": [1, 2.5]}'))
+            self.assertTrue(serializer.loads('[NaN]')[0] != serializer.loads('[NaN]')[0])
+            with self.assertRaises(json.decoder.JSONDecodeError):
+                serializer.loads('{"a": ')
+
+    def test_fallback(self):
+        with patch('jsonSerializer.orjson', None):
+            serializer = JsonSerializer(ORJSON_BACKEND)
+            self.assertEqual(JSON_BACKEND, serializer.backend)
+            self.assertEqual(json.dumps(self.values[0], sort_keys=True, indent=4), serializer.dumps(self.values[0]))
+
+    def test_default_backend(self):
+        expected = ORJSON_BACKEND if jsonSerializer.orjson is not None else JSON_BACKEND
+        self.assertEqual(expected, JsonSerializer().backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
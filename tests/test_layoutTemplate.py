@@ -0,0 +1,43 @@
+import unittest
+
+from layoutTemplate import LayoutTemplate
+
+
+class LayoutTemplateTest(unittest.TestCase):
+    layout = [
+        {"type": "integer", "label": "{Side} Round {roundNum}", "jsonLocation": "{side}.rounds[{roundIndex}].score",
+         "resetValue": 0},
+        {"type": "text", "label": "Notes {not a field}", "jsonLocation": "{side}.notes[{other}]"},
+    ]
+
+    def test_instantiate(self):
+        template = LayoutTemplate(self.layout, ["side", "Side", "roundNum", "roundIndex"])
+        layout = template.instantiate(side="left", Side="Left", roundNum=3, roundIndex=2)
+        self.assertEqual([
+            {"type": "integer", "label": "Left Round 3", "jsonLocation": "left.rounds[2].score", "resetValue": 0},
+            # Only the named fields are filled in
+            {"type": "text", "label": "Notes {not a field}", "jsonLocation": "left.notes[{other}]"},
+        ], layout)
+
+        # Copies are the caller's to change, the template and layout it came
+        # from are left alone
+        layout[0]["label"] = "Changed"
+        layout[1]["filterFunc"] = len
+        self.assertEqual("Right Round 1", template.instantiate(side="right", Side="Right", roundNum=1,
+                                                              roundIndex=0)[0]["label"])
+        self.assertNotIn("filterFunc", template.instantiate(side="right", Side="Right", roundNum=1,
+                                                            roundIndex=0)[1])
+        self.assertEqual("{Side} Round {roundNum}", self.layout[0]["label"])
+
+        self.layout[0]["resetValue"] = 5
+        try:
+            layout = template.instantiate(side="left", Side="Left", roundNum=1, roundIndex=0)
+            self.assertEqual(0, layout[0]["resetValue"])
+        finally:
+            self.layout[0]["resetValue"] = 0
+
+    def test_missing_field(self):
+        template = LayoutTemplate(self.layout, ["side", "Side"])
+        with self.assertRaises(KeyError):
+            template.instantiate(side="left")
+        self.assertEqual(2, len(template))
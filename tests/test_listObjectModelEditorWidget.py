@@ -0,0 +1,74 @@
+from listObjectModelEditorWidget import ListObjectModelEditorWidget
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
+
+
+class TestListObjectModelEditorWidget:
+    app = None
+    editor_layout = [
+        {'type': 'text', 'label': 'text widget', 'jsonLocation': 'textValue'},
+        {'type': 'integer', 'label': 'integer widget', 'jsonLocation': 'intValue'}
+    ]
+    location = "key"
+
+    @classmethod
+    def setup_class(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    @classmethod
+    def teardown_class(cls):
+        del cls.app
+
+    def make_data(self, count):
+        return {"key": [{"name": "Item Name " + str(i), 'textValue': 'TEXT', 'intValue': i} for i in range(count)]}
+
+    def test_init(self):
+        data = {}
+        widget = ListObjectModelEditorWidget("title", data, self.location, [])
+        assert widget.data_list_label.text() == "title"
+        assert data == {"key": []}
+        assert widget.model.rowCount() == 0
+
+        # 2 in our layout, 1 in the default layout, none enabled until an object is picked
+        widget = ListObjectModelEditorWidget("title", self.make_data(300), self.location, self.editor_layout)
+        assert len(widget.edit_widgets) == 3
+        assert widget.model.rowCount() == 300
+        assert not widget.edit_widgets[0].isEnabled()
+
+    def test_edit_object(self):
+        data = self.make_data(3)
+        widget = ListObjectModelEditorWidget("title", data, self.location, self.editor_layout)
+        changed_rows = []
+        widget.model.dataChanged.connect(lambda top, bottom: changed_rows.append(top.row()))
+
+        widget.edit_index(widget.model.index(1))
+        assert widget.active_object is data["key"][1]
+
+        # typing a new name only updates that row
+        QTest.keyClicks(widget.edit_widgets[0].textBox, "!")
+        assert data["key"][1]["name"] == "Item Name 1!"
+        assert widget.model.data(widget.model.index(1)) == "Item Name 1!"
+        assert set(changed_rows) == {1}
+
+    def test_add_and_delete(self):
+        data = self.make_data(3)
+        widget = ListObjectModelEditorWidget("title", data, self.location, self.editor_layout)
+        inserted = []
+        removed = []
+        widget.model.rowsInserted.connect(lambda parent, first, last: inserted.append(first))
+        widget.model.rowsRemoved.connect(lambda parent, first, last: removed.append(first))
+
+        QTest.mouseClick(widget.add_object_button, Qt.LeftButton)
+        assert inserted == [3]
+        assert data["key"][3]["name"] == "New Object"
+        assert widget.active_object is data["key"][3]
+
+        widget.confirm_delete(3)
+        assert removed == [3]
+        assert len(data["key"]) == 3
+        assert widget.active_object is None
+        assert not widget.edit_widgets[0].isEnabled()
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fileManager import FileManager, catalogue_layout
+from gameSystems import catalogue_keys
+from pushServer import PushServer
+from PySide6.QtNetwork import QHostAddress, QTcpSocket
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+
+class PushServerTest(unittest.TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        file_path = os.path.join(self.tempDir.name, 'scoreboard.json')
+        with open(file_path, 'w') as f:
+            json.dump({'roundNum': 1, 'left': {'playerName': 'A'}, '40kFactions': [{'name': 'Orks'}]}, f)
+        self.fileManager = FileManager(file_path, catalogue_layout(catalogue_keys()))
+        self.server = PushServer(self.fileManager, 0)
+        self.assertTrue(self.server.start())
+        self.sockets = []
+
+    def tearDown(self) -> None:
+        self.server.stop()
+        for socket in self.sockets:
+            socket.abort()
+        self.tempDir.cleanup()
+
+    def request(self, request_path: str):
+        socket = QTcpSocket()
+        self.sockets.append(socket)
+        socket.connectToHost(QHostAddress(QHostAddress.LocalHost), self.server.server_port())
+        self.assertTrue(socket.waitForConnected(1000))
+        socket.write(("GET " + request_path + " HTTP/1.1\r\nHost: localhost\r\n\r\n").encode())
+        return socket
+
+    def read_until(self, socket, text: bytes, received: bytes = b""):
+        for i in range(200):
+            received += bytes(socket.readAll().data())
+            if text in received:
+                break
+            QTest.qWait(5)
+        return received
+
+    @staticmethod
+    def events(received: bytes):
+        events = []
+        for block in received.decode().split("\r\n\r\n", 1)[1].split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.split("\n") if line)
+            if fields:
+                events.append((fields['event'], json.loads(fields['data'])))
+        return events
+
+    def test_state(self):
+        received = self.read_until(self.request('/state'), b'}}')
+        self.assertTrue(received.startswith(b'HTTP/1.1 200 OK'))
+        # Catalogues stay out of it
+        self.assertEqual({'roundNum': 1, 'left': {'playerName': 'A'}}, json.loads(received.split(b'\r\n\r\n')[1]))
+
+    def test_not_found(self):
+        received = self.read_until(self.request('/other'), b'Not found')
+        self.assertTrue(received.startswith(b'HTTP/1.1 404'))
+
+    def test_stream(self):
+        socket = self.request('/events')
+        received = self.read_until(socket, b'event: snapshot')
+        received = self.read_until(socket, b'\n\n', received)
+        self.assertEqual([('snapshot', {'roundNum': 1, 'left': {'playerName': 'A'}})], self.events(received))
+
+        # One patch for the changes made in one go, catalogue edits aren't sent
+        self.fileManager.set('roundNum', 2)
+        self.fileManager.set('left.playerName', 'B')
+        self.fileManager.set('40kFactions[0].name', 'Eldar')
+        received = self.read_until(socket, b'event: patch', received)
+        received = self.read_until(socket, b']\n\n', received)
+        self.assertEqual(('patch', [
+            {'op': 'replace', 'path': '/roundNum', 'value': 2},
+            {'op': 'replace', 'path': '/left/playerName', 'value': 'B'},
+        ]), self.events(received)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
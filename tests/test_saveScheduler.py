@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from fileManager import FileManager
+from saveScheduler import SaveScheduler
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+
+def failing_producer():
+    raise OSError("file in use")
+
+
+class SaveSchedulerTest(unittest.TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'scoreboard.json')
+        with open(self.filePath, 'w') as f:
+            json.dump({'roundNum': 1}, f)
+        self.fileManager = FileManager(self.filePath, write_window=0.05)
+        self.scheduler = SaveScheduler(self.fileManager.writer)
+
+    def tearDown(self) -> None:
+        self.scheduler.stop()
+        self.tempDir.cleanup()
+
+    def read(self):
+        with open(self.filePath) as f:
+            return json.load(f)
+
+    def test_idle(self):
+        # Nothing changed, nothing to wake up for
+        self.assertFalse(self.scheduler.timer.isActive())
+        QTest.qWait(100)
+        self.assertEqual(0, self.scheduler.saves)
+
+    def test_change_saves_after_window(self):
+        start = time.monotonic()
+        self.fileManager.set('roundNum', 2)
+        self.fileManager.set('roundNum', 3)
+        self.assertTrue(self.scheduler.timer.isActive())
+        self.assertLessEqual(self.scheduler.timer.remainingTime(), 50)
+
+        for i in range(100):
+            if not self.fileManager.is_dirty():
+                break
+            QTest.qWait(10)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual({'roundNum': 3}, self.read())
+        self.assertEqual(1, self.fileManager.writer.writesIssued)
+        self.assertFalse(self.scheduler.timer.isActive())
+
+    def test_failed_write_is_retried_later(self):
+        self.fileManager.set('roundNum', 2)
+        self.fileManager.writer.discard(self.filePath)
+        self.fileManager.writer.submit(self.filePath, failing_producer, 0.0, now=0.0)
+        self.scheduler.save()
+        self.assertTrue(self.fileManager.is_dirty())
+        self.assertGreaterEqual(self.scheduler.timer.remainingTime(), 500)
+
+    def test_stop(self):
+        self.scheduler.stop()
+        self.fileManager.set('roundNum', 2)
+        self.assertFalse(self.scheduler.timer.isActive())
+        self.assertTrue(self.fileManager.is_dirty())
+
+
+if __name__ == '__main__':
+    unittest.main()
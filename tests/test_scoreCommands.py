@@ -0,0 +1,97 @@
+import unittest
+
+from fileManager import FileManager
+from gameSystems import game_system_for
+from scoreboard import Scoreboard
+from scoreCommands import CommandError, run_commands
+
+
+class ScoreCommandsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super(ScoreCommandsTest, self).setUp()
+        self.fileManager = FileManager("")
+        self.fileManager.jsonData = {'dataType': '40k', 'left': {}, 'right': {}, '40kFactions': [],
+                                     '40kSecondaryObjectives': [{'name': '------'}]}
+        self.scoreboard = Scoreboard(self.fileManager, game_system_for("40k"))
+        self.notified = []
+        self.fileManager.add_listener(
+            lambda changes: self.notified.append(changes) if self.fileManager.notifying == 1 else None)
+
+    def tearDown(self) -> None:
+        self.scoreboard.stop()
+        return super(ScoreCommandsTest, self).tearDown()
+
+    def test_batch(self):
+        changes = run_commands(self.scoreboard, [
+            "inc left.40kRoundScores[2].primaryScore 5",
+            "inc left.40kRoundScores[2].primaryScore",
+            "inc right.commandPoints 3",
+            "dec right.commandPoints 2",
+            "set left.playerName 'Dru the Elf'",
+            "set_active right",
+            "round 3",
+            "order bot",
+        ])
+        self.assertEqual(6, self.fileManager.get("left.40kRoundScores[2].primaryScore"))
+        self.assertEqual(1, self.fileManager.get("right.commandPoints"))
+        self.assertEqual("Dru the Elf", self.fileManager.get("left.playerName"))
+        self.assertEqual("ACTIVE", self.fileManager.get("right.playerStatus"))
+        self.assertEqual(3, self.fileManager.get("roundNum"))
+        self.assertEqual("BOT", self.fileManager.get("roundOrder"))
+        self.assertEqual(6, self.scoreboard.total("left"))
+
+        # The batch is passed on as one change
+        self.assertEqual([changes], self.notified)
+
+    def test_values(self):
+        run_commands(self.scoreboard, ["set left.commandPoints 4", "set left.armyName '4 elves'",
+                                       'set left.playerName \'"5"\''])
+        self.assertEqual(4, self.fileManager.get("left.commandPoints"))
+        self.assertEqual("4 elves", self.fileManager.get("left.armyName"))
+        self.assertEqual("5", self.fileManager.get("left.playerName"))
+
+    def test_reset(self):
+        run_commands(self.scoreboard, ["inc left.commandPoints 3"])
+        run_commands(self.scoreboard, ["reset"])
+        self.assertEqual(0, self.fileManager.get("left.commandPoints"))
+
+    def test_errors(self):
+        for lines in [["jump left"], ["inc left.commandPoints lots"], ["set_active middle"], ["order SIDEWAYS"],
+                      ["reset now"], ["set left.playerName"], ["set left.playerName 'unclosed"]]:
+            with self.assertRaises(CommandError):
+                run_commands(self.scoreboard, lines)
+
+        # Values have to be what the widgets at the location expect
+        self.fileManager.set("left.playerName", "Dru")
+        for lines in [["set left.40kRoundScores[0].primaryScore abc"], ["set left.commandPoints 2.5"],
+                      ["set left.playerName '[1, 2]'"], ["set left.playerName 5"], ["set roundNum '\"2\"'"],
+                      ["set left.40kRoundScores[{roundIndex}].secondaryName0 1"], ["inc left.playerName"],
+                      ["dec left.armyName 2"]]:
+            with self.assertRaises(CommandError):
+                run_commands(self.scoreboard, lines)
+        self.assertEqual("Dru", self.fileManager.get("left.playerName"))
+
+        # Only fields a widget edits can be changed, and numbers stay in the
+        # integer widget's range
+        for lines in [["set left 5"], ["set 40kFactions 3"], ["inc nothing.here 2"], ["set left.secondary 5"],
+                      ["round -3"], ["round 101"], ["set left.commandPoints 101"], ["dec left.commandPoints"],
+                      ["inc left.commandPoints 60", "inc left.commandPoints 60"]]:
+            with self.assertRaises(CommandError):
+                run_commands(self.scoreboard, lines)
+        self.assertEqual(0, self.fileManager.get("left.commandPoints"))
+
+        # Nor can a field holding a list or dict, or inside a value that isn't
+        self.fileManager.set("left.armyName", ["Elves"])
+        self.scoreboard.valueTypes[("left", "playerName", "first")] = str
+        for lines in [["set left.armyName Elves"], ["set left.playerName.first Dru"]]:
+            with self.assertRaises(CommandError):
+                run_commands(self.scoreboard, lines)
+        self.assertEqual(["Elves"], self.fileManager.get("left.armyName"))
+        self.assertEqual(0, self.fileManager.get("left.40kRoundScores[0].primaryScore"))
+        self.notified.clear()
+
+        # Nothing in a failed batch happens
+        with self.assertRaises(CommandError):
+            run_commands(self.scoreboard, ["inc left.commandPoints 3", "round many"])
+        self.assertEqual(0, self.fileManager.get("left.commandPoints"))
+        self.assertEqual([], self.notified)
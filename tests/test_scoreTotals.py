@@ -0,0 +1,66 @@
+import unittest
+
+from fileManager import FileManager
+from gameSystems import game_system_for
+from scoreTotals import ScoreTotals
+
+
+class ScoreTotalsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super(ScoreTotalsTest, self).setUp()
+        self.fileManager = FileManager("")
+        self.fileManager.jsonData = {
+            'left': {'grandStrategyScore': 2,
+                     'aosRoundScores': [{'primaryScore': 3, 'secondaryScore': 1}, {'primaryScore': 4}]},
+            'right': {'aosRoundScores': [{'primaryScore': 1, 'bonusScore': 'x'}]},
+        }
+        self.totals = ScoreTotals(self.fileManager, game_system_for("sigmar"), ["left", "right"])
+
+    def assertTotals(self, left_total, right_total):
+        self.assertEqual(left_total, self.fileManager.get("left.totalScore"))
+        self.assertEqual(right_total, self.fileManager.get("right.totalScore"))
+        self.assertEqual(left_total - right_total, self.fileManager.get("left.leadMargin"))
+        self.assertEqual(right_total - left_total, self.fileManager.get("right.leadMargin"))
+
+    def test_recompute(self):
+        self.assertEqual(4, self.fileManager.get("left.aosRoundScores[0].roundTotal"))
+        self.assertEqual(4, self.fileManager.get("left.aosRoundScores[1].roundTotal"))
+        self.assertEqual(1, self.fileManager.get("right.aosRoundScores[0].roundTotal"))
+        self.assertTotals(10, 1)
+
+    def test_score_change(self):
+        changes = []
+        self.fileManager.add_listener(changes.extend)
+        self.fileManager.set("left.aosRoundScores[1].bonusScore", 5)
+        self.assertEqual(9, self.fileManager.get("left.aosRoundScores[1].roundTotal"))
+        self.assertTotals(15, 1)
+        self.assertIn(("left.totalScore", 10, 15), changes)
+
+        self.fileManager.set("right.aosRoundScores[3].primaryScore", 6)
+        self.assertEqual(6, self.fileManager.get("right.aosRoundScores[3].roundTotal"))
+        self.assertTotals(15, 7)
+
+        self.fileManager.set("left.grandStrategyScore", 0)
+        self.assertTotals(13, 7)
+
+    def test_other_changes(self):
+        self.fileManager.set("left.playerName", "Dru")
+        self.fileManager.set("left.aosRoundScores[0].secondaryName", "Trait")
+        self.assertTotals(10, 1)
+
+    def test_replaced(self):
+        self.fileManager.set("left.aosRoundScores", [{'primaryScore': 1}])
+        self.assertEqual(1, self.fileManager.get("left.aosRoundScores[0].roundTotal"))
+        self.assertTotals(3, 1)
+
+        self.fileManager.set("right", {'grandStrategyScore': 4})
+        self.assertTotals(3, 4)
+
+    def test_stop(self):
+        self.totals.stop()
+        self.fileManager.set("left.grandStrategyScore", 0)
+        self.assertTotals(10, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import subprocess
+import sys
+import unittest
+from os import path
+
+from fileManager import FileManager
+from gameSystems import game_system_for
+from scoreboard import Scoreboard
+
+
+class ScoreboardTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super(ScoreboardTest, self).setUp()
+        self.fileManager = FileManager("")
+        self.fileManager.jsonData = {'dataType': 'sigmar', 'left': {'armyName': 'Orks'}, 'right': {},
+                                     'sigmarFactions': [], 'sigmarGrandStrategies': [],
+                                     'sigmarBattleTraits': [{'name': '------'}, {'name': 'Waaagh', 'armyType': 'Orks'},
+                                                            {'name': 'Glade', 'armyType': 'Sylvaneth'}]}
+        self.scoreboard = Scoreboard(self.fileManager, game_system_for("sigmar"))
+
+    def tearDown(self) -> None:
+        self.scoreboard.stop()
+        return super(ScoreboardTest, self).tearDown()
+
+    def test_layouts(self):
+        self.assertEqual(["left", "right"], list(self.scoreboard.playerLayouts.keys()))
+        self.assertEqual(10, len(self.scoreboard.roundLayouts))
+        # Every round score is there before any widget is made
+        self.assertEqual(0, self.fileManager.get("right.aosRoundScores[4].primaryScore"))
+
+        # Combos only offer the player's army
+        side, index, round_layout = self.scoreboard.roundLayouts[0]
+        combo = [widget_data for widget_data in round_layout
+                 if widget_data.get("itemsLocation") == "sigmarBattleTraits"][0]
+        items = self.fileManager.get("sigmarBattleTraits")
+        self.assertEqual(["------", "Waaagh"], [item["name"] for item in items if combo["filterFunc"](item)])
+
+    def test_add_and_total(self):
+        self.assertEqual(3, self.scoreboard.add("left.aosRoundScores[0].primaryScore", 3))
+        self.scoreboard.add("left.aosRoundScores[1].primaryScore", 2)
+        self.scoreboard.add("right.aosRoundScores[0].primaryScore", 1)
+        self.assertEqual(5, self.scoreboard.total("left"))
+        self.assertEqual(1, self.scoreboard.total("right"))
+
+    def test_active_player(self):
+        self.assertIsNone(self.scoreboard.active_player())
+        self.scoreboard.set_active_player("right")
+        self.assertEqual("right", self.scoreboard.active_player())
+        self.assertEqual("", self.fileManager.get("left.playerStatus"))
+        self.scoreboard.set_active_player(None)
+        self.assertIsNone(self.scoreboard.active_player())
+
+    def test_rounds(self):
+        self.scoreboard.set_round(3)
+        self.scoreboard.set_round_order("BOT")
+        self.assertEqual(3, self.fileManager.get("roundNum"))
+        self.assertEqual("BOT", self.fileManager.get("roundOrder"))
+        with self.assertRaises(AssertionError):
+            self.scoreboard.set_round_order("MIDDLE")
+
+    def test_reset(self):
+        self.scoreboard.add("left.commandPoints", 4)
+        self.scoreboard.add("left.aosRoundScores[2].bonusScore", 2)
+        notified = []
+        self.fileManager.add_listener(notified.append)
+        changes = self.scoreboard.reset()
+        self.assertIn(("left.commandPoints", 4, 0), changes)
+        self.assertEqual(0, self.fileManager.get("left.aosRoundScores[2].bonusScore"))
+        self.assertEqual(0, self.scoreboard.total("left"))
+        # The whole reset is passed on at once, the totals follow in their own
+        self.assertIn(changes, notified)
+        self.assertEqual(2, len(notified))
+
+    def test_no_qt(self):
+        # The core can be used where Qt is not installed
+        code = ("import sys, scoreboard, fileManager, gameSystems, game40k, gameSigmar\n"
+                "assert not [name for name in sys.modules if name.startswith('PySide6')]")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=path.dirname(path.dirname(path.abspath(__file__))))
+        self.assertEqual(0, result.returncode, result.stderr)
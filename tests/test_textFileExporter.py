@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+import writeBehindWriter
+from fileManager import FileManager
+from textFileExporter import TextFileExporter
+
+
+class TextFileExporterTest(unittest.TestCase):
+    exports = [
+        {'file': 'LeftPlayerName.txt', 'jsonLocation': 'left.playerName'},
+        {'file': 'LeftArmyName.txt', 'jsonLocation': 'left.armyName'},
+        {'file': 'LeftPrimary.txt',
+         'compute': lambda json_data: sum(round_data.get('primary', 0) for round_data in json_data['left']['rounds'])},
+    ]
+
+    def setUp(self) -> None:
+        super(TextFileExporterTest, self).setUp()
+        if isinstance(QApplication.instance(), type(None)):
+            self.app = QApplication()
+        else:
+            self.app = QApplication.instance()
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.fileManager = FileManager("")
+        self.fileManager.jsonData = {
+            'left': {'playerName': 'Dru', 'bonus': 1, 'rounds': [{'primary': 5, 'secondary': 3}, {'primary': 2}]}
+        }
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+        del self.app
+        return super(TextFileExporterTest, self).tearDown()
+
+    def read(self, file_name):
+        with open(os.path.join(self.tempDir.name, file_name)) as f:
+            return f.read()
+
+    def test_export_files(self):
+        exporter = TextFileExporter(self.fileManager, self.tempDir.name, self.exports)
+        exporter.flush().result()
+
+        self.assertEqual("Dru", self.read('LeftPlayerName.txt'))
+        self.assertEqual("", self.read('LeftArmyName.txt'))
+        self.assertEqual("7", self.read('LeftPrimary.txt'))
+        exporter.shutdown()
+
+    def test_only_changed_files_written(self):
+        exporter = TextFileExporter(self.fileManager, self.tempDir.name, self.exports)
+        exporter.flush().result()
+
+        with patch('textFileExporter.atomic_write', wraps=writeBehindWriter.atomic_write) as write_mock:
+            self.fileManager.set('left.armyName', 'elf')
+            self.fileManager.set('left.armyName', 'dwarf')
+            exporter.flush().result()
+
+            write_mock.assert_called_once_with(os.path.join(self.tempDir.name, 'LeftArmyName.txt'), 'dwarf')
+            self.assertEqual("dwarf", self.read('LeftArmyName.txt'))
+
+            # same value again writes nothing
+            self.fileManager.set('left.armyName', 'dwarf')
+            self.assertEqual([], exporter.flush().result())
+        exporter.shutdown()
+
+    def test_batched_per_event_loop(self):
+        exporter = TextFileExporter(self.fileManager, self.tempDir.name, [])
+        exporter.flush().result()
+
+        with patch.object(exporter, 'flush', wraps=exporter.flush) as flush_mock:
+            for text in ["a", "ab", "abc"]:
+                exporter.write_text('Typed.txt', text)
+            self.assertTrue(exporter.flushScheduled)
+            self.app.processEvents()
+            flush_mock.assert_called_once()
+
+        exporter.shutdown()
+        self.assertEqual("abc", self.read('Typed.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from fileManager import FileManager
+from undoStack import UndoStack
+
+
+class UndoStackTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super(UndoStackTest, self).setUp()
+        self.fileManager = FileManager("")
+        self.fileManager.jsonData = {'left': {'score': 1, 'playerName': 'Dru'}}
+        self.undoStack = UndoStack(self.fileManager, depth=3)
+
+    def test_undo_redo(self):
+        self.fileManager.set("left.score", 6)
+        self.fileManager.set("left.playerName", "Sam")
+        self.assertEqual(["left.playerName"], self.undoStack.undo())
+        self.assertEqual("Dru", self.fileManager.get("left.playerName"))
+        self.assertEqual(["left.score"], self.undoStack.undo())
+        self.assertEqual(1, self.fileManager.get("left.score"))
+        self.assertFalse(self.undoStack.can_undo())
+        self.assertEqual([], self.undoStack.undo())
+
+        self.assertEqual(["left.score"], self.undoStack.redo())
+        self.assertEqual(6, self.fileManager.get("left.score"))
+
+        # A new change forgets the redo
+        self.fileManager.set("left.score", 7)
+        self.assertFalse(self.undoStack.can_redo())
+        self.undoStack.undo()
+        self.assertEqual(6, self.fileManager.get("left.score"))
+
+    def test_transaction(self):
+        with self.undoStack.transaction():
+            self.fileManager.set("left.score", 0)
+            self.fileManager.set("left.score", 5)
+            self.fileManager.set("left.playerName", "Dru")
+            self.fileManager.set("right.score", 0)
+        self.assertEqual([[("left.score", 1, 5), ("right.score", None, 0)]], list(self.undoStack.undoEntries))
+
+        # and is undone as one change
+        notified = []
+        self.fileManager.add_listener(notified.append)
+        self.undoStack.undo()
+        self.assertEqual(1, self.fileManager.get("left.score"))
+        self.assertIsNone(self.fileManager.get("right.score"))
+        self.assertEqual(1, len(notified))
+        self.assertEqual({"left.score", "right.score"}, {change[0] for change in notified[0]})
+
+    def test_depth(self):
+        for score in range(2, 7):
+            self.fileManager.set("left.score", score)
+        self.assertEqual(3, len(self.undoStack.undoEntries))
+        while self.undoStack.can_undo():
+            self.undoStack.undo()
+        self.assertEqual(3, self.fileManager.get("left.score"))
+
+    def test_listener_changes(self):
+        def total(changes):
+            if changes[0][0] == "left.score":
+                self.fileManager.set("left.total", changes[0][2] * 2)
+        self.fileManager.add_listener(total)
+
+        self.fileManager.set("left.score", 4)
+        self.assertEqual(1, len(self.undoStack.undoEntries))
+        self.undoStack.undo()
+        self.assertEqual(1, self.fileManager.get("left.score"))
+        self.assertEqual(2, self.fileManager.get("left.total"))
+
+    def test_stop(self):
+        self.undoStack.stop()
+        self.fileManager.set("left.score", 6)
+        self.assertFalse(self.undoStack.can_undo())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import widgetHelpers
+from PySide6.QtWidgets import QApplication, QVBoxLayout
+from scoreboard import init_json_values, reset_json_values
+
+
+class TestWidgetHelpers:
+    app = None
+    round_data = [
+        {"type": "integer", "label": "Primary", "jsonLocation": "rounds[1].primary", "resetValue": 0},
+        {"type": "text", "label": "Note", "jsonLocation": "rounds[1].note", "resetValue": ""},
+        {"type": "combo", "label": "Secondary", "jsonLocation": "rounds[1].secondary", "itemsLocation": "items",
+         "resetValue": "------"},
+    ]
+
+    @classmethod
+    def setup_class(cls):
+        if isinstance(QApplication.instance(), type(None)):
+            cls.app = QApplication()
+        else:
+            cls.app = QApplication.instance()
+
+    @classmethod
+    def teardown_class(cls):
+        del cls.app
+
+    def test_lazy_tabs(self):
+        built = []
+        tabs = widgetHelpers.LazyTabWidget()
+        for i in range(3):
+            tabs.add_lazy_tab("Tab " + str(i), lambda layout, i=i: built.append(i))
+
+        # only the current tab is made up front
+        assert built == [0]
+        assert tabs.is_built(0)
+        assert not tabs.is_built(2)
+
+        tabs.setCurrentIndex(2)
+        tabs.setCurrentIndex(0)
+        tabs.setCurrentIndex(2)
+        assert built == [0, 2]
+        assert tabs.is_built(2)
+
+    def test_init_json_values(self):
+        data = {"rounds": [None, {"primary": 4}]}
+        init_json_values(data, self.round_data)
+        assert data["rounds"][1] == {"primary": 4}
+
+        data = {}
+        init_json_values(data, self.round_data)
+        assert data == {"rounds": [None, {"primary": 0}]}
+
+    def test_reset_json_values(self):
+        data = {"rounds": [None, {"primary": 4, "note": "hi", "secondary": "Item"}],
+                "items": [{"name": "Item"}]}
+
+        # the combo has no reset item to pick so it keeps its value
+        reset_json_values(data, self.round_data)
+        assert data["rounds"][1] == {"primary": 0, "note": "", "secondary": "Item"}
+
+        data["items"].append({"name": "------"})
+        reset_json_values(data, self.round_data)
+        assert data["rounds"][1]["secondary"] == "------"
+
+    def test_rebind(self):
+        data = {"rounds": [{"primary": 1, "note": "first", "secondary": "A"},
+                           {"primary": 2, "note": "second", "secondary": "B"}],
+                "items": [{"name": "A"}, {"name": "B"}]}
+        layout = QVBoxLayout()
+        widgets = []
+        first_round = [dict(widget_data, jsonLocation=widget_data["jsonLocation"].replace("[1]", "[0]"))
+                       for widget_data in self.round_data]
+        widgetHelpers.create_json_widgets(layout, data, first_round, widgets)
+        integer, text, combo = widgets
+        assert integer.textBox.text() == "1"
+
+        # The same widgets show and edit the other round
+        widgetHelpers.rebind_json_widgets(widgets, self.round_data)
+        assert layout.count() == 3
+        assert integer.textBox.text() == "2"
+        assert integer.label.text() == "Primary"
+        assert text.textBox.text() == "second"
+        assert combo.comboBox.currentText() == "B"
+
+        integer.add_one_pressed()
+        text.text_changed("changed")
+        assert data["rounds"][1]["primary"] == 3
+        assert data["rounds"][1]["note"] == "changed"
+        assert data["rounds"][0] == {"primary": 1, "note": "first", "secondary": "A"}
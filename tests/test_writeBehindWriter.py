@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from writeBehindWriter import WriteBehindWriter, atomic_write
+
+
+class WriteBehindWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.tempDir.name, 'out.json')
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def read(self):
+        with open(self.filePath) as f:
+            return f.read()
+
+    def test_atomicWrite(self):
+        atomic_write(self.filePath, "first")
+        atomic_write(self.filePath, "second")
+        self.assertEqual("second", self.read())
+
+        # no temp files left behind
+        self.assertEqual(['out.json'], os.listdir(self.tempDir.name))
+
+    def test_atomicWriteFailure(self):
+        atomic_write(self.filePath, "first")
+        with patch('writeBehindWriter.os.replace', side_effect=OSError("file in use")):
+            with self.assertRaises(OSError):
+                atomic_write(self.filePath, "second")
+        self.assertEqual("first", self.read())
+        self.assertEqual(['out.json'], os.listdir(self.tempDir.name))
+
+    def test_window(self):
+        writer = WriteBehindWriter(window=1.0)
+        writer.submit(self.filePath, lambda: "one", now=10.0)
+        writer.submit(self.filePath, lambda: "two", now=10.5)
+        self.assertEqual(0.5, writer.next_due(now=10.5))
+
+        # still inside the window of the first change
+        self.assertEqual([], writer.flush(now=10.9))
+        self.assertTrue(writer.is_pending(self.filePath))
+
+        self.assertEqual([self.filePath], writer.flush(now=11.0))
+        self.assertEqual("two", self.read())
+        self.assertEqual(1, writer.writesIssued)
+        self.assertEqual(1, writer.writesCoalesced)
+        self.assertFalse(writer.has_pending())
+        self.assertIsNone(writer.next_due())
+
+    def test_producerCalledOnWrite(self):
+        calls = []
+
+        def producer():
+            calls.append(1)
+            return "text"
+
+        writer = WriteBehindWriter()
+        for i in range(10):
+            writer.submit(self.filePath, producer)
+        writer.flush()
+        self.assertEqual(1, len(calls))
+        self.assertEqual(9, writer.writesCoalesced)
+
+    def test_failedWriteStaysPending(self):
+        writer = WriteBehindWriter()
+        writer.submit(self.filePath, lambda: "text")
+        with patch('writeBehindWriter.atomic_write', side_effect=PermissionError("file in use")):
+            self.assertEqual([], writer.flush())
+        self.assertEqual(1, writer.writeFailures)
+        self.assertTrue(writer.has_pending())
+
+        writer.flush()
+        self.assertEqual("text", self.read())
+        self.assertEqual(1, writer.writesIssued)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import path, makedirs
+
+from PySide6.QtCore import QObject, QTimer, Slot
+
+from jsonPath import compile_json_path
+from writeBehindWriter import atomic_write
+
+
+# Exports values from the json data to individual text files for OBS text
+# sources, which is far cheaper for OBS than reading the whole json file.
+#
+# exports describes which files to write
+# Example:
+# [
+#     {'file': <file name>, 'jsonLocation': <where the value lives>},
+#     {'file': <file name>, 'compute': <function taking the json data>},
+# ]
+#
+# Changes are collected and written once per turn of the event loop, only
+# files whose text actually changed are written, and the writing happens on
+# a worker thread so the GUI never waits on the disk.
+class TextFileExporter(QObject):
+    def __init__(self, file_manager, export_directory: str, exports: list):
+        super().__init__()
+        self.fileManager = file_manager
+        self.exportDirectory = export_directory
+        self.exports = exports
+        self.lastText = {}
+        self.queuedText = {}
+        self.jsonChanged = True
+        self.flushScheduled = False
+        self.failedFiles = []
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        if not isinstance(self.fileManager, type(None)):
+            self.fileManager.add_listener(self.json_changed)
+        self.schedule_flush()
+
+    def file_path(self, file_name: str):
+        return path.join(self.exportDirectory, file_name)
+
+    def json_changed(self, changes: list):
+        self.jsonChanged = True
+        self.schedule_flush()
+
+    # Write text straight to a file, such as from a TextToFileWidget
+    def write_text(self, file_name: str, text: str):
+        self.queuedText[self.file_path(file_name)] = text
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flushScheduled:
+            return
+        self.flushScheduled = True
+        QTimer.singleShot(0, self.flush)
+
+    # Work out which files changed and hand them to the worker thread.
+    # Returns a future for the batch of writes.
+    @Slot()
+    def flush(self):
+        self.flushScheduled = False
+
+        # Forget what we think is in files that failed to write so they are tried again
+        while self.failedFiles:
+            failed = self.failedFiles.pop()
+            self.lastText.pop(failed, None)
+            self.jsonChanged = True
+
+        texts = self.queuedText
+        self.queuedText = {}
+        if self.jsonChanged:
+            self.jsonChanged = False
+            json_data = None
+            if not isinstance(self.fileManager, type(None)):
+                json_data = self.fileManager.get_json_data()
+            if isinstance(json_data, dict):
+                for export in self.exports:
+                    texts[self.file_path(export['file'])] = self.export_text(export, json_data)
+
+        changed = {}
+        for file_path, text in texts.items():
+            if self.lastText.get(file_path) != text:
+                self.lastText[file_path] = text
+                changed[file_path] = text
+
+        if not changed:
+            future = Future()
+            future.set_result([])
+            return future
+        return self.executor.submit(self.write_files, changed)
+
+    @staticmethod
+    def export_text(export: dict, json_data: dict):
+        if 'compute' in export:
+            value = export['compute'](json_data)
+        else:
+            value = compile_json_path(export['jsonLocation']).get(json_data)
+
+        if value is None:
+            return ""
+        return str(value)
+
+    # Runs on the worker thread
+    def write_files(self, changed: dict):
+        written = []
+        for file_path, text in changed.items():
+            try:
+                directory = path.dirname(file_path)
+                if directory:
+                    makedirs(directory, exist_ok=True)
+                atomic_write(file_path, text)
+            except OSError:
+                self.failedFiles.append(file_path)
+                continue
+            written.append(file_path)
+        return written
+
+    # Stop listening and wait for any writes still on the worker thread
+    def shutdown(self):
+        if not isinstance(self.fileManager, type(None)):
+            self.fileManager.remove_listener(self.json_changed)
+        self.flush()
+        self.executor.shutdown(wait=True)
@@ -4,12 +4,17 @@ from PySide6.QtCore import Slot
 from pathlib import Path
 
 
+# Widget that writes its text straight to a file for OBS.
+#
+# When given a TextFileExporter the writes are handed to it, so typing only
+# rewrites the file once per event loop turn and off the GUI thread.
 class TextToFileWidget(QWidget):
-    def __init__(self, file, label):
+    def __init__(self, file, label, exporter=None):
         QWidget.__init__(self)
 
         self.fileName = file
         self.text = ""
+        self.exporter = exporter
 
         layout = QVBoxLayout()
         layout.addWidget(QLabel(label))
@@ -31,8 +36,12 @@ class TextToFileWidget(QWidget):
 
     @Slot()
     def text_changed(self, text):
+        self.text = text
+        if not isinstance(self.exporter, type(None)):
+            self.exporter.write_text(self.fileName, self.text)
+            return
+
         with open(self.fileName, "w") as f:
-            self.text = text
             f.write(self.text)
 
 
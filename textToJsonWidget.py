@@ -1,18 +1,26 @@
 import json
 import sys
 
-import pydash
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, Signal
 from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QLabel, QApplication
 
+from jsonPath import compile_json_path
+from scoreboard import write_json_value
+
 
 class TextToJsonWidget(QWidget):
-    def __init__(self, label: str, json_blob: dict, json_location: str, data_type=str, reset_value=None):
+    # Emitted after the widget writes a new value into the json
+    valueChanged = Signal()
+
+    def __init__(self, label: str, json_blob: dict, json_location: str, data_type=str, reset_value=None,
+                 file_manager=None):
         QWidget.__init__(self)
 
         self.jsonLocation = json_location
+        self.jsonPath = compile_json_path(json_location)
         self.jsonBlob = json_blob
+        self.fileManager = file_manager
         self.text = ""
         self.dataType = data_type
         self.reset_value = reset_value
@@ -41,7 +49,7 @@ class TextToJsonWidget(QWidget):
         else:
             self.setEnabled(True)
 
-        val = pydash.get(self.jsonBlob, self.jsonLocation)
+        val = self.jsonPath.get(self.jsonBlob)
 
         # No matter the dataType we get input, output as a string
         # We will error if it is not int, string, or empty though
@@ -61,6 +69,18 @@ class TextToJsonWidget(QWidget):
         self.jsonBlob = json_data
         self.read_blob_contents()
 
+    # Show the value in the json again after something else changed it
+    def refresh(self):
+        self.read_blob_contents()
+
+    # Edit another location with the same widget
+    def rebind(self, json_location: str, label: str = None):
+        self.jsonLocation = json_location
+        self.jsonPath = compile_json_path(json_location)
+        if label is not None:
+            self.labelWidget.setText(label)
+        self.read_blob_contents()
+
     def reset_data(self):
         if self.reset_value is None:
             return
@@ -80,7 +100,8 @@ class TextToJsonWidget(QWidget):
         if self.dataType == int:
             val = int(self.text)
 
-        pydash.set_(self.jsonBlob, self.jsonLocation, val)
+        write_json_value(self.jsonBlob, self.jsonLocation, val, self.fileManager)
+        self.valueChanged.emit()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+import contextlib
+import copy
+from collections import deque
+
+# Changes that can be undone before the oldest are forgotten
+UNDO_DEPTH = 100
+
+
+# Undo and redo for changes made through a file manager's set().
+#
+# An entry is the list of (json_location, old_value, new_value) changes it
+# made. Undoing sets each location back to its old value, last change first,
+# and redoing sets the new values again. A file manager transaction, such as
+# a reset, arrives as one change and is one entry. Changes made inside a
+# transaction() here are one entry too. Either way each location is kept once
+# and the ones that didn't change are left out.
+#
+# Only changes made directly are recorded. Ones listeners make in response,
+# like score totals, follow the undone changes on their own. Changes another
+# tool made to the file aren't ours to undo.
+#
+# At most depth entries are kept, the oldest are dropped first. A new change
+# forgets anything that could have been redone.
+class UndoStack:
+    def __init__(self, file_manager, depth: int = UNDO_DEPTH):
+        self.fileManager = file_manager
+        self.undoEntries = deque(maxlen=depth)
+        self.redoEntries = deque(maxlen=depth)
+        self.transactionDepth = 0
+        self.transactionChanges = []
+        self.applying = False
+
+        self.fileManager.add_listener(self.json_changed)
+
+    def stop(self):
+        self.fileManager.remove_listener(self.json_changed)
+
+    def can_undo(self):
+        return len(self.undoEntries) > 0
+
+    def can_redo(self):
+        return len(self.redoEntries) > 0
+
+    def json_changed(self, changes: list):
+        if self.applying or self.fileManager.notifying > 1 or self.fileManager.reloading:
+            return
+        recorded = [(json_location, copy.deepcopy(old_value), copy.deepcopy(new_value))
+                    for json_location, old_value, new_value in changes]
+        if self.transactionDepth > 0:
+            self.transactionChanges.extend(recorded)
+        else:
+            self.push(recorded)
+
+    # Keeps the first old value and last new value of each location
+    @staticmethod
+    def compact(changes: list):
+        merged = {}
+        for json_location, old_value, new_value in changes:
+            if json_location in merged:
+                old_value = merged[json_location][1]
+            merged[json_location] = (json_location, old_value, new_value)
+        return [change for change in merged.values() if change[1] != change[2]]
+
+    def push(self, changes: list):
+        changes = self.compact(changes)
+        if not changes:
+            return
+        self.undoEntries.append(changes)
+        self.redoEntries.clear()
+
+    def begin_transaction(self):
+        self.transactionDepth += 1
+
+    def end_transaction(self):
+        self.transactionDepth -= 1
+        if self.transactionDepth == 0:
+            changes = self.transactionChanges
+            self.transactionChanges = []
+            self.push(changes)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.begin_transaction()
+        try:
+            yield self
+        finally:
+            self.end_transaction()
+
+    # Sets the values in one transaction, so an undo or redo is one change
+    # and one save like the change it reverses
+    def apply(self, changes: list):
+        self.applying = True
+        try:
+            with self.fileManager.transaction():
+                for json_location, value in changes:
+                    self.fileManager.set(json_location, copy.deepcopy(value))
+        finally:
+            self.applying = False
+        return [json_location for json_location, value in changes]
+
+    # Returns the json locations that were set back, empty when there was
+    # nothing to undo
+    def undo(self):
+        if not self.can_undo():
+            return []
+        entry = self.undoEntries.pop()
+        self.redoEntries.append(entry)
+        return self.apply([(json_location, old_value) for json_location, old_value, new_value in reversed(entry)])
+
+    def redo(self):
+        if not self.can_redo():
+            return []
+        entry = self.redoEntries.pop()
+        self.undoEntries.append(entry)
+        return self.apply([(json_location, new_value) for json_location, old_value, new_value in entry])
@@ -1,15 +1,9 @@
 from textToJsonWidget import TextToJsonWidget
 from integerWidget import IntegerWidget
 from comboBoxWidget import ComboBoxWidget
-from PySide6.QtWidgets import QFrame, QLabel
-from PySide6.QtCore import Qt
-import pydash
-
-
-# Creates a lambda to allow for combo box based on data in json
-def build_field_test(item_json_location: str, json_blob: dict, dict_json_location: str):
-    return lambda item: item_json_location not in item or item[item_json_location] \
-                        in [None, "", "None", pydash.get(json_blob, dict_json_location)]
+from PySide6.QtWidgets import QFrame, QLabel, QTabWidget, QWidget, QVBoxLayout
+from PySide6.QtCore import Qt, Slot
+from jsonPath import json_location_holds
 
 
 # Makes widgets and adds to passed in layout
@@ -25,7 +19,11 @@ def build_field_test(item_json_location: str, json_blob: dict, dict_json_locatio
 #     'itemFilterType', <typeRequired>, -- combo
 #     'resetValue': <value>, -- Optional
 # }
-def create_json_widgets(layout, json_data: dict, data=None, widget_list: list = None):
+#
+# file_manager is optional. When given, the widgets write through it so
+# the document gets flagged for saving. ee is the optional event emitter,
+# combos subscribe to it to filter again when the data they filter on changes.
+def create_json_widgets(layout, json_data: dict, data=None, widget_list: list = None, file_manager=None, ee=None):
     use_list = isinstance(widget_list, list)
     for mainWidgetData in data:
         reset_value = None
@@ -33,14 +31,14 @@ def create_json_widgets(layout, json_data: dict, data=None, widget_list: list =
             reset_value = mainWidgetData["resetValue"]
         if mainWidgetData["type"] == "text":
             text_line_widget = TextToJsonWidget(mainWidgetData["label"], json_data, mainWidgetData["jsonLocation"],
-                                                reset_value=reset_value)
+                                                reset_value=reset_value, file_manager=file_manager)
             layout.addWidget(text_line_widget)
             if use_list:
                 widget_list.append(text_line_widget)
 
         elif mainWidgetData["type"] == "integer":
             int_widget = IntegerWidget(mainWidgetData["label"], json_data, mainWidgetData["jsonLocation"],
-                                       reset_value=reset_value)
+                                       reset_value=reset_value, file_manager=file_manager)
             layout.addWidget(int_widget)
             if use_list:
                 widget_list.append(int_widget)
@@ -54,7 +52,10 @@ def create_json_widgets(layout, json_data: dict, data=None, widget_list: list =
                 filterFunc = mainWidgetData["filterFunc"]
             combo_widget = ComboBoxWidget(mainWidgetData["label"], json_data, mainWidgetData["jsonLocation"],
                                           json_data, mainWidgetData["itemsLocation"], type_filter=type_filter,
-                                          reset_value=reset_value, filter_func=filterFunc)
+                                          reset_value=reset_value, filter_func=filterFunc,
+                                          file_manager=file_manager)
+            if ee is not None:
+                combo_widget.subscribe(ee)
             layout.addWidget(combo_widget)
             if use_list:
                 widget_list.append(combo_widget)
@@ -70,3 +71,58 @@ def create_json_widgets(layout, json_data: dict, data=None, widget_list: list =
             frame.set_data = set_data_func
 
             layout.addWidget(frame)
+
+
+# Refreshes the widgets showing any of the json locations, or a value inside
+# one of them, such as after an undo
+def refresh_widgets(widget_list: list, json_locations: list):
+    for widget in widget_list:
+        widget_location = getattr(widget, 'jsonLocation', None) or getattr(widget, 'out_json_location', None)
+        if widget_location is None:
+            continue
+        for json_location in json_locations:
+            if json_location_holds(json_location, widget_location):
+                widget.refresh()
+                break
+
+
+# Points the widgets create_json_widgets made for one layout at the
+# locations in another with the same widgets, such as another round's, and
+# gives them its labels. No widgets are made.
+def rebind_json_widgets(widget_list: list, data: list):
+    widget_data = [mainWidgetData for mainWidgetData in data if mainWidgetData["type"] != "separator"]
+    assert len(widget_list) == len(widget_data)
+    for widget, mainWidgetData in zip(widget_list, widget_data):
+        widget.rebind(mainWidgetData["jsonLocation"], mainWidgetData["label"])
+
+
+# Tab widget that only builds a tab the first time it is shown.
+#
+# build_func is called with the tab's layout to fill it in.
+class LazyTabWidget(QTabWidget):
+    def __init__(self):
+        super().__init__()
+        self.builders = []
+        self.currentChanged.connect(self.build_tab)
+
+    def add_lazy_tab(self, title: str, build_func):
+        tab = QWidget()
+        tab.setLayout(QVBoxLayout())
+        self.builders.append(build_func)
+        index = self.addTab(tab, title)
+
+        # The first tab added becomes current without a change signal
+        if index == self.currentIndex():
+            self.build_tab(index)
+        return index
+
+    def is_built(self, index: int):
+        return self.builders[index] is None
+
+    @Slot()
+    def build_tab(self, index: int):
+        if index < 0 or index >= len(self.builders) or self.builders[index] is None:
+            return
+        build_func = self.builders[index]
+        self.builders[index] = None
+        build_func(self.widget(index).layout())
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+from os import path
+
+
+# Write text to a file without readers (OBS) ever seeing a half written file.
+# The text goes to a temp file in the same folder which is synced and then
+# renamed over the target.
+def atomic_write(file_path: str, text: str):
+    directory = path.dirname(path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=path.basename(file_path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+            temp_file.write(text)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+
+        # mkstemp makes the file private, keep the permissions of the file we replace
+        if path.isfile(file_path):
+            os.chmod(temp_path, os.stat(file_path).st_mode)
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+# Adds text to the end of a file, synced so it survives a crash. Used for
+# journals, where a torn last line is skipped when reading back.
+def append_write(file_path: str, text: str):
+    with open(file_path, 'a', encoding='utf-8') as append_file:
+        append_file.write(text)
+        append_file.flush()
+        os.fsync(append_file.fileno())
+
+
+# Holds on to file writes and only issues them once the change has had a
+# window of time to collect more changes. Submitting a file that is already
+# waiting replaces what will be written and counts as a coalesced write.
+#
+# The text is only produced when the write is issued, so a burst of changes
+# costs one serialization and one write.
+#
+# Nothing is written until flush is called. Listeners added with add_listener
+# are called with the file path when a file starts waiting, so whoever calls
+# flush knows when there is work to do (see SaveScheduler).
+class WriteBehindWriter:
+    def __init__(self, window: float = 0.0):
+        self.window = window
+        self.pending = {}
+        self.writesIssued = 0
+        self.writesCoalesced = 0
+        self.writeFailures = 0
+        self.listeners = []
+
+    def add_listener(self, listener):
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    # producer is called with no arguments and returns the text to write.
+    # write is called with the path and text to do the writing, by default
+    # the file is replaced with atomic_write.
+    def submit(self, file_path: str, producer, window: float = None, now: float = None, write=None):
+        if now is None:
+            now = time.monotonic()
+        if window is None:
+            window = self.window
+
+        if file_path in self.pending:
+            first_submit, _, pending_window, _ = self.pending[file_path]
+            self.pending[file_path] = (first_submit, producer, pending_window, write)
+            self.writesCoalesced += 1
+        else:
+            self.pending[file_path] = (now, producer, window, write)
+            for listener in self.listeners:
+                listener(file_path)
+
+    def discard(self, file_path: str):
+        self.pending.pop(file_path, None)
+
+    def is_pending(self, file_path: str):
+        return file_path in self.pending
+
+    def has_pending(self):
+        return len(self.pending) > 0
+
+    # Write out everything whose window has passed. Returns the paths written.
+    # A write that fails stays pending and is tried again next flush.
+    def flush(self, now: float = None, force: bool = False):
+        if now is None:
+            now = time.monotonic()
+
+        written = []
+        for file_path, (first_submit, producer, window, write) in list(self.pending.items()):
+            if not force and now - first_submit < window:
+                continue
+            try:
+                if write is None:
+                    atomic_write(file_path, producer())
+                else:
+                    write(file_path, producer())
+            except OSError:
+                self.writeFailures += 1
+                continue
+            del self.pending[file_path]
+            self.writesIssued += 1
+            written.append(file_path)
+        return written
+
+    # Seconds until the next pending write is due, None if nothing is waiting
+    def next_due(self, now: float = None):
+        if not self.pending:
+            return None
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, min(first_submit + window - now for first_submit, _, window, _ in self.pending.values()))